@@ -1,20 +1,42 @@
+
 import streamlit as st
+import gzip, os, sys
+import numpy as np
+import plotly.graph_objects as go
 from datetime import datetime
 
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _ROOT not in sys.path:  # el lanzador re-ejecuta la página en cada rerun
+    sys.path.insert(0, _ROOT)
+from ud1.gas import WEIGHTS, import_file, import_trace, sweep
+
+# Las trazas en disco sólo se leen de la carpeta que fije quien despliega la app
+TRACES_DIR = os.environ.get("UD1_TRACES_DIR", "")
+TRACE_SUFFIXES = (".json", ".jsonl", ".json.gz", ".jsonl.gz")
+MAX_TRACE_MB = 4096         # traza de la carpeta, ya descomprimida
+MAX_UPLOAD_TRACE_MB = 256   # traza subida, ya descomprimida
+
 st.set_page_config(page_title="Comparador de Gas", page_icon="⛽", layout="wide")
 st.title("Comparador de Gas — Estimación didáctica por complejidad")
 
 st.caption("Modelo didáctico: aproximación basada en operaciones abstractas (no sustituye a un estimator real).")
 
-ops_lec = st.number_input("Operaciones de lectura/lectura de estado", 0, 10_000, 300, step=50)
-ops_escr = st.number_input("Operaciones de escritura de estado", 0, 10_000, 120, step=20)
-ops_cript = st.number_input("Operaciones criptográficas/pesadas", 0, 10_000, 40, step=10)
+traza = st.session_state.get("gas_traza")
+
+# Valores iniciales en session_state: «Usar estos recuentos» los sustituye por los de la traza
+for _k, _v in (("gas_lec", 300), ("gas_escr", 120), ("gas_cript", 40)):
+    st.session_state.setdefault(_k, _v)
+ops_lec = st.number_input("Operaciones de lectura/lectura de estado", 0, 1_000_000_000, step=50, key="gas_lec")
+ops_escr = st.number_input("Operaciones de escritura de estado", 0, 1_000_000_000, step=20, key="gas_escr")
+ops_cript = st.number_input("Operaciones criptográficas/pesadas", 0, 1_000_000_000, step=10, key="gas_cript")
 precio_gwei = st.number_input("Precio del gas (Gwei)", 1.0, 5000.0, 20.0, step=1.0)
 eth_eur = st.number_input("Tipo de cambio ETH→EUR", 200.0, 10000.0, 3000.0, step=50.0)
+pesos_reales = st.toggle("Usar los pesos medidos en la traza importada", key="gas_pesos_reales", disabled=traza is None,
+                         help="Gas medio por operación de cada categoría en la traza, en lugar de los pesos didácticos.")
 
-# Pesos didácticos (gas por operación)
-W_READ, W_WRITE, W_CRYPTO = 5, 20, 200
-gas_est = ops_lec*W_READ + ops_escr*W_WRITE + ops_cript*W_CRYPTO
+# Pesos (gas por operación): didácticos o medidos en una traza real
+pesos = traza.pesos() if pesos_reales and traza is not None else dict(WEIGHTS)
+gas_est = round(ops_lec*pesos["lectura"] + ops_escr*pesos["escritura"] + ops_cript*pesos["cripto"])
 
 # 1 Gwei = 1e-9 ETH; Coste(ETH) = gas * precio_gwei * 1e-9
 coste_eth = gas_est * precio_gwei * 1e-9
@@ -24,9 +46,154 @@ c1, c2, c3 = st.columns(3)
 c1.metric("Gas estimado", f"{gas_est:,}")
 c2.metric("Coste estimado (ETH)", f"{coste_eth:.6f}")
 c3.metric("Coste estimado (€)", f"{coste_eur:.4f}")
+st.caption("Pesos: " + " · ".join(f"{k} {v:,.1f} gas" for k, v in pesos.items()))
 
 st.info("Consejo: compara dos versiones de la misma función para ver el impacto de escribir estado o usar operaciones criptográficas.")
 
+# ---------------------------
+# Importar una traza de opcodes (EVM)
+# ---------------------------
+st.divider()
+st.subheader("Importar traza de opcodes")
+st.caption("Salida de `debug_traceTransaction`/`debug_traceBlock*` (structLogs de geth) o JSONL de `evm --json`, "
+           "también `.gz`. Se lee por bloques, así que una traza de varios GB no tiene que caber en memoria.")
+
+
+def _ruta_permitida(nombre: str):
+    """Ruta real de `nombre` si es un fichero regular dentro de `TRACES_DIR` (sin escapar por enlaces)."""
+    base = os.path.realpath(TRACES_DIR)
+    ruta = os.path.realpath(os.path.join(base, nombre))
+    if os.path.commonpath([base, ruta]) != base or not os.path.isfile(ruta):
+        return None
+    return ruta
+
+
+def _trazas_locales() -> list:
+    try:
+        nombres = [e.name for e in os.scandir(TRACES_DIR) if e.name.endswith(TRACE_SUFFIXES)]
+    except OSError:
+        return []
+    return sorted(n for n in nombres if _ruta_permitida(n))
+
+
+ruta = None
+if TRACES_DIR:
+    ruta = st.selectbox(f"Traza de la carpeta del servidor (`{TRACES_DIR}`)", _trazas_locales(), index=None,
+                        key="gas_traza_ruta", placeholder="Elige una traza…")
+subida = st.file_uploader("…o sube una traza pequeña" if TRACES_DIR else "Sube una traza",
+                          type=["json", "jsonl", "gz"], key="gas_traza_subida")
+if st.button("📥 Importar", key="gas_importar", disabled=not (ruta or subida)):
+    barra = st.progress(0.0, text="Leyendo traza…")
+
+    def _avance(hecho, total):
+        texto = f"{hecho / 1e6:,.0f} MB leídos"
+        barra.progress(min(hecho / total, 1.0) if total else 0.0, text=texto)
+
+    try:
+        if ruta:
+            permitida = _ruta_permitida(ruta)
+            if permitida is None:
+                raise ValueError(ruta)
+            st.session_state.gas_traza = import_file(permitida, on_progress=_avance, max_bytes=MAX_TRACE_MB << 20)
+        elif subida.name.endswith(".gz"):
+            with gzip.GzipFile(fileobj=subida) as f:
+                st.session_state.gas_traza = import_trace(f, on_progress=_avance, max_bytes=MAX_UPLOAD_TRACE_MB << 20)
+        else:
+            st.session_state.gas_traza = import_trace(subida, total=subida.size, on_progress=_avance,
+                                                      max_bytes=MAX_UPLOAD_TRACE_MB << 20)
+        st.rerun()
+    except (OSError, EOFError, ValueError):
+        # Mismo mensaje para cualquier fallo: no revela qué ficheros existen en el servidor
+        barra.empty()
+        limite = MAX_TRACE_MB if ruta else MAX_UPLOAD_TRACE_MB
+        st.error(f"No se pudo importar la traza: no es legible, no es una traza válida o supera {limite:,} MB.")
+
+
+def _usar_recuentos():
+    t = st.session_state.gas_traza
+    st.session_state.gas_lec = t.ops["lectura"]
+    st.session_state.gas_escr = t.ops["escritura"]
+    st.session_state.gas_cript = t.ops["cripto"]
+
+
+if traza is not None:
+    if not traza.pasos:
+        st.warning("No se encontró ningún paso (`\"op\"`) en la traza.")
+    else:
+        t1, t2, t3, t4 = st.columns(4)
+        t1.metric("Pasos", f"{traza.pasos:,}", help=f"{traza.bytes / 1e6:,.1f} MB a {traza.mb_s:,.0f} MB/s")
+        t2.metric("Lecturas de estado", f"{traza.ops['lectura']:,}")
+        t3.metric("Escrituras de estado", f"{traza.ops['escritura']:,}")
+        t4.metric("Criptográficas", f"{traza.ops['cripto']:,}", help="KECCAK256 y llamadas a precompilados criptográficos")
+        st.button("Usar estos recuentos en el estimador", key="gas_usar_traza", on_click=_usar_recuentos)
+        top = traza.opcodes.most_common(15)
+        fig_op = go.Figure()
+        fig_op.add_bar(x=[op for op, _ in top], y=[n for _, n in top])
+        fig_op.update_layout(title="Opcodes más frecuentes", yaxis_title="pasos", template="plotly_dark")
+        st.plotly_chart(fig_op, width="stretch")
+
+# ---------------------------
+# Barrido de escenarios (NumPy broadcasting)
+# ---------------------------
+st.divider()
+st.subheader("Barrido de escenarios")
+RANGOS = {
+    "ops_lec": ("Lecturas", 0, 10_000, (0, 2_000)),
+    "ops_escr": ("Escrituras", 0, 5_000, (0, 1_000)),
+    "ops_cript": ("Operaciones cripto", 0, 2_000, (0, 400)),
+    "precio_gwei": ("Precio del gas (Gwei)", 1, 500, (5, 100)),
+    "eth_eur": ("ETH→EUR", 200, 10_000, (1_500, 5_000)),
+}
+actual = {"ops_lec": ops_lec, "ops_escr": ops_escr, "ops_cript": ops_cript, "precio_gwei": precio_gwei, "eth_eur": eth_eur}
+
+
+def etiqueta(k):
+    return RANGOS[k][0]
+
+
+b1, b2, b3 = st.columns(3)
+eje_x = b1.selectbox("Eje X", list(RANGOS), format_func=etiqueta, key="gas_eje_x")
+eje_y = b2.selectbox("Eje Y", [k for k in RANGOS if k != eje_x], format_func=etiqueta, key="gas_eje_y")
+puntos = b3.slider("Puntos por eje", 10, 200, 60, key="gas_puntos")
+r1, r2 = st.columns(2)
+rx = r1.slider(etiqueta(eje_x), RANGOS[eje_x][1], RANGOS[eje_x][2], RANGOS[eje_x][3], key=f"gas_rango_{eje_x}")
+ry = r2.slider(etiqueta(eje_y), RANGOS[eje_y][1], RANGOS[eje_y][2], RANGOS[eje_y][3], key=f"gas_rango_{eje_y}")
+
+params = dict(actual)
+params[eje_x] = np.linspace(*rx, puntos)
+params[eje_y] = np.linspace(*ry, puntos)
+res = sweep(**params, weights=pesos)
+# Los ejes siguen el orden de PARAMS; Plotly espera z[y, x]
+z = res.eur.T if list(res.axes) == [eje_x, eje_y] else res.eur
+fig_s = go.Figure(go.Surface(x=params[eje_x], y=params[eje_y], z=z, colorscale="Viridis", colorbar={"title": "€"}))
+fig_s.add_scatter3d(x=[actual[eje_x]], y=[actual[eje_y]], z=[coste_eur], mode="markers",
+                    marker={"size": 5, "color": "red"}, name="escenario actual")
+fig_s.update_layout(title="Coste (€) según " + etiqueta(eje_x) + " y " + etiqueta(eje_y), template="plotly_dark",
+                    scene={"xaxis_title": etiqueta(eje_x), "yaxis_title": etiqueta(eje_y), "zaxis_title": "€"},
+                    height=600)
+st.plotly_chart(fig_s, width="stretch")
+st.caption("El resto de parámetros se fija en los valores del estimador.")
+
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def _rejilla(n: int, pesos_items: tuple, presupuesto: float) -> dict:
+    ejes = {k: np.linspace(*RANGOS[k][3], n) for k in RANGOS}
+    r = sweep(**ejes, weights=dict(pesos_items))
+    return {**r.summary(), "bajo_presupuesto": float((r.eur <= presupuesto).mean())}
+
+
+with st.expander("Rejilla completa (todos los parámetros a la vez)"):
+    g1, g2 = st.columns(2)
+    n_rejilla = g1.slider("Puntos por parámetro", 5, 20, 12, key="gas_rejilla_n",
+                          help="Se evalúan n⁵ escenarios con los rangos por defecto de cada parámetro.")
+    presupuesto = g2.number_input("Presupuesto (€)", 0.0, 10_000.0, 10.0, step=1.0, key="gas_presupuesto")
+    rej = _rejilla(n_rejilla, tuple(pesos.items()), presupuesto)
+    q1, q2, q3, q4 = st.columns(4)
+    q1.metric("Escenarios", f"{rej['escenarios']:,}")
+    q2.metric("Coste p50", f"{rej['eur_p50']:.2f} €")
+    q3.metric("Coste p95", f"{rej['eur_p95']:.2f} €", help=f"máximo {rej['eur_max']:.2f} €")
+    q4.metric("Dentro del presupuesto", f"{rej['bajo_presupuesto']:.1%}")
+
 st.divider()
 st.subheader("Evidencia y síntesis")
 sintesis = st.text_area("Explica cómo la estimación de gas puede tener valor probatorio (verificación pública en Etherscan/otros).")
@@ -34,9 +201,15 @@ sintesis = st.text_area("Explica cómo la estimación de gas puede tener valor p
 e1 = st.slider("Ético", 0, 10, 7); e2 = st.slider("Epistémico", 0, 10, 8); e3 = st.slider("Económico", 0, 10, 8)
 score = round((e1+e2+e3)/3, 2)
 
+linea_traza = ""
+if traza is not None and traza.pasos:
+    linea_traza = f"- Traza importada: {traza.pasos:,} pasos ({traza.bytes / 1e6:,.1f} MB)"
+
 md = f"""# Comparador de Gas (didáctico)
 - Fecha: {datetime.utcnow().isoformat()}Z
 - Lectura: {ops_lec} · Escritura: {ops_escr} · Cripto: {ops_cript}
+- Pesos ({"medidos en la traza" if pesos_reales and traza is not None else "didácticos"}): {", ".join(f"{k} {v:,.1f}" for k, v in pesos.items())}
+{linea_traza}
 - Gas estimado: {gas_est}
 - Gas price: {precio_gwei} Gwei · ETH/EUR: {eth_eur}
 - Coste: {coste_eth:.6f} ETH ≈ {coste_eur:.4f} €
@@ -1,28 +1,87 @@
 import streamlit as st
-import hashlib
+import os, sys
 from datetime import datetime
 
+import plotly.graph_objects as go
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _ROOT not in sys.path:  # el lanzador re-ejecuta la página en cada rerun
+    sys.path.insert(0, _ROOT)
+from ud1.avalanche import analyze
+from ud1.hashes import available, get_provider
+from views.common import hash_upload
+
 st.set_page_config(page_title="Hash Visual Demo", page_icon="🔐", layout="wide")
 st.title("Hash Visual Demo — Efecto avalancha")
 
+algoritmo = st.selectbox("Algoritmo de hash", available(), help="SHA-256 es el usado en el resto de la app.")
+prov = get_provider(algoritmo)
+
 col1, col2 = st.columns(2)
 with col1:
     texto = st.text_area("Documento (texto)", "Contrato de arrendamiento 2025 ...", height=160)
+    archivo = st.file_uploader("…o sube un fichero como documento A (se hashea por bloques)")
     alterar = st.checkbox("Alterar un carácter final automáticamente")
     if alterar and texto:
         texto_mutado = texto[:-1] + ("X" if texto[-1] != "X" else "Y")
     else:
         texto_mutado = st.text_area("Versión B (alterada manualmente)", texto, height=160)
 with col2:
-    hA = hashlib.sha256((texto or "").encode("utf-8")).hexdigest()
-    hB = hashlib.sha256((texto_mutado or "").encode("utf-8")).hexdigest()
-    st.code(f"SHA-256 A: {hA}")
-    st.code(f"SHA-256 B: {hB}")
+    if archivo is not None:
+        res_a = hash_upload(archivo, algoritmo)  # cacheado por fichero y algoritmo: no se rehashea en cada rerun
+        hA = res_a.hexdigest
+        st.caption(f"A = {archivo.name}: {res_a.bytes/1e6:,.1f} MB · {res_a.mb_s:,.0f} MB/s")
+    else:
+        hA = prov.hex_text(texto or "")
+    hB = prov.hex_text(texto_mutado or "")
+    st.code(f"{algoritmo} A: {hA}")
+    st.code(f"{algoritmo} B: {hB}")
     iguales = (hA == hB)
     st.metric("¿Hashes coinciden?", "Sí" if iguales else "No")
     if not iguales:
         st.info("Un solo cambio en el texto provoca un hash totalmente distinto (efecto avalancha).")
 
+st.divider()
+st.subheader("Análisis de avalancha (miles de mutaciones)")
+st.caption("Se generan variantes del texto con **un** carácter cambiado, se hashean en bloque y se mide cuántos "
+           f"de los {prov.digest_size * 8} bits cambian en cada una. Un buen hash cambia la mitad y cada bit con probabilidad ~0,5.")
+ca, cb, cc = st.columns(3)
+n_mut = ca.number_input("Mutaciones", min_value=1_000, max_value=1_000_000, value=100_000, step=10_000)
+seed = cb.number_input("Semilla", min_value=0, value=42)
+lanzar = cc.button("Analizar", disabled=not texto)
+
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def _avalancha(texto: str, n: int, seed: int, algoritmo: str):
+    return analyze(texto, n, seed, algoritmo)
+
+
+if lanzar:
+    with st.spinner("Hasheando mutaciones…"):
+        st.session_state.avalancha = _avalancha(texto, int(n_mut), int(seed), algoritmo)
+res = st.session_state.get("avalancha")
+if res is not None:
+    m1, m2, m3, m4 = st.columns(4)
+    m1.metric("Distancia media", f"{res.media:.2f} bits", delta=f"{res.media - res.bits / 2:+.2f} vs ideal")
+    m2.metric("Desviación", f"{res.desviacion:.2f}", delta=f"ideal {(res.bits / 4) ** 0.5:.2f}", delta_color="off")
+    m3.metric("Rango", f"{int(res.distancias.min())}–{int(res.distancias.max())}")
+    m4.metric("Mutaciones/s", f"{res.mutaciones_por_s:,.0f}")
+
+    ks = list(range(res.bits + 1))
+    fig_h = go.Figure()
+    fig_h.add_bar(x=ks, y=res.histogram(), name="observado")
+    fig_h.add_scatter(x=ks, y=res.expected(), mode="lines", name=f"Binomial({res.bits}, ½)")
+    fig_h.update_layout(title="Distancia de Hamming al hash original", xaxis_title="bits distintos",
+                        yaxis_title="mutaciones", xaxis_range=[res.bits / 4, 3 * res.bits / 4], template="plotly_dark")
+    st.plotly_chart(fig_h, width="stretch")
+
+    fig_b = go.Figure()
+    fig_b.add_scatter(x=list(range(res.bits)), y=res.prob_bit, mode="markers", name="P(cambio)")
+    fig_b.add_hline(y=0.5, line_dash="dash")
+    fig_b.update_layout(title="Probabilidad de cambio por bit", xaxis_title="bit del digest",
+                        yaxis_title="probabilidad", yaxis_range=[0.4, 0.6], template="plotly_dark")
+    st.plotly_chart(fig_b, width="stretch")
+
 st.divider()
 st.subheader("Síntesis (200–300 palabras)")
 sintesis = st.text_area("¿Qué función jurídica complementa el hash dentro de una blockchain?")
@@ -31,11 +90,17 @@ eee2 = st.slider("Epistémico (0-10)", 0, 10, 8)
 eee3 = st.slider("Económico (0-10)", 0, 10, 7)
 score = round((eee1+eee2+eee3)/3, 2)
 
+linea_avalancha = ""
+if res is not None:
+    linea_avalancha = f"- Avalancha: {res.n:,} mutaciones, distancia media {res.media:.2f} bits (σ {res.desviacion:.2f})"
+
 md = f"""# Hash Visual Demo
 - Fecha: {datetime.utcnow().isoformat()}Z
+- Algoritmo: {algoritmo}
 - Hash A: {hA}
 - Hash B: {hB}
 - Coinciden: {'Sí' if iguales else 'No'}
+{linea_avalancha}
 ## Síntesis
 {sintesis}
 
@@ -1,28 +1,92 @@
 import streamlit as st
-import hashlib, random, time, math
+import os, sys, time
+import plotly.graph_objects as go
 from datetime import datetime
 
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _ROOT not in sys.path:  # el lanzador re-ejecuta la página en cada rerun
+    sys.path.insert(0, _ROOT)
+from ud1.pow import mine
+from ud1.hash_bench import fastest, get_results, load_results
+from ud1.hashes import available
+from ud1.hashrate import get_calibration, hashrate_for, load_calibration, project
+from ud1.difficulty import (CURVES, RULES, downsample, hashrate_curve, min_retarget_every, simulate, work_for_zeros,
+                            zeros_for_work)
+
 st.set_page_config(page_title="Simulador PoW", page_icon="⚡", layout="wide")
 st.title("Simulador de energía y coste — Proof of Work")
 
-dif = st.slider("Dificultad (nº de ceros al inicio)", 1, 6, 3)
-kwh_por_mhash = st.number_input("kWh por 1e6 hashes (estimado)", 0.001, 10.0, 0.25, step=0.01)
+dif = st.slider("Dificultad (nº de ceros al inicio)", 1, 7, 3)
 c_kwh = st.number_input("Coste kWh (€)", 0.01, 2.0, 0.20, step=0.01)
-target = "0" * dif
+n_cpu = os.cpu_count() or 1
+workers = int(st.number_input("Procesos de minado (núcleos)", 1, n_cpu, n_cpu, step=1))
+cabecera = st.text_input("Cabecera del bloque", "UD1|prev=000000|merkle=demo|")
+
+# ---------------------------
+# Algoritmo de hash (benchmark por algoritmo, tamaño e hilos)
+# ---------------------------
+with st.expander("Comparar algoritmos de hash en este equipo"):
+    bench = load_results()
+    if st.button("⏱️ Medir algoritmos"):
+        with st.status("Midiendo algoritmos de hash...") as estado:
+            bench = get_results(refresh=True, sizes=(64, 1024, 1024 * 1024), threads=sorted({1, n_cpu}), on_step=estado.write)
+            estado.update(label="Benchmark guardado", state="complete")
+    if bench:
+        fig_alg = go.Figure()
+        for size in sorted({r["size"] for r in bench["rows"]}):
+            filas = [r for r in bench["rows"] if r["size"] == size and r["threads"] == 1]
+            fig_alg.add_bar(x=[r["algoritmo"] for r in filas], y=[r["mb_s"] for r in filas], name=f"{size:,} B")
+        fig_alg.update_layout(title="Throughput por algoritmo (1 hilo)", yaxis_title="MB/s", barmode="group", template="plotly_dark")
+        st.plotly_chart(fig_alg, width="stretch")
+        st.dataframe(bench["rows"], width="stretch")
+algoritmos = available()
+# Cabecera + nonce son mensajes cortos: se propone el más rápido medido en ese régimen
+sugerido = fastest(bench, size=64) if bench else "sha256"
+algoritmo = st.selectbox("Algoritmo de hash del PoW", algoritmos, index=algoritmos.index(sugerido) if sugerido in algoritmos else 0,
+                         help="Por defecto, el más rápido medido en este equipo para mensajes cortos.")
+
+# ---------------------------
+# Calibración del equipo (benchmark cacheado por huella de máquina)
+# ---------------------------
+st.subheader("Calibración del equipo")
+calib = load_calibration(algorithm=algoritmo)
+if st.button("📏 Calibrar hashrate (benchmark)"):
+    with st.status(f"Midiendo {algoritmo} en este equipo...") as estado:
+        calib = get_calibration(refresh=True, algorithm=algoritmo, max_workers=n_cpu, on_step=estado.write)
+        estado.update(label="Calibración guardada", state="complete")
+
+if calib:
+    st.caption(f"Huella de máquina `{calib['fingerprint']}` · medido el {calib['created']}")
+    cw1, cw2 = st.columns(2)
+    cw1.dataframe(calib["sizes"], width="stretch")
+    cw2.dataframe(calib["workers"], width="stretch")
+    potencia_w = st.number_input("Potencia del equipo bajo carga (W)", 1.0, 5000.0, 65.0, step=5.0)
+    hashrate = hashrate_for(calib, workers)
+    proy = project(dif, hashrate, potencia_w)
+    kwh_por_mhash = proy["kwh_por_mhash"]
+    cp1, cp2, cp3 = st.columns(3)
+    cp1.metric("Hashrate calibrado", f"{hashrate/1e6:.2f} MH/s")
+    cp2.metric("Tiempo proyectado", f"{proy['seconds']:,.1f} s")
+    cp3.metric("kWh por 1e6 hashes", f"{kwh_por_mhash:.2e}")
+else:
+    st.info("Sin calibración para esta máquina: se usa el valor manual de kWh por 1e6 hashes.")
+    kwh_por_mhash = st.number_input("kWh por 1e6 hashes (estimado)", 0.001, 10.0, 0.25, step=0.01)
 
-st.caption("Nota: es una simulación didáctica (no mide hardware real).")
+st.caption(f"Nota: el minado es real ({algoritmo} sobre la cabecera + nonce) y mide el hashrate de esta máquina; el coste sigue siendo una estimación didáctica.")
 
 if st.button("Ejecutar prueba breve"):
-    N = 100_000  # intentos para el muestreo
-    t0 = time.time()
-    found = False
-    for _ in range(N):
-        raw = str(random.random())
-        h = hashlib.sha256(raw.encode()).hexdigest()
-        if h.startswith(target):
-            found = True
-            break
-    t = max(time.time() - t0, 0.001)
+    # Pulsar "Cancelar" provoca un rerun: el motor cierra el pool y descarta los lotes pendientes
+    st.button("⏹️ Cancelar minado")
+    barra = st.progress(0.0, text="Minando...")
+    esperado = 16**dif
+
+    def _progreso(hashes, seg):
+        frac = min(hashes / esperado, 1.0)
+        barra.progress(frac, text=f"{hashes:,} hashes · {hashes/seg/1e6:.2f} MH/s · {seg:.1f} s")
+
+    res = mine(cabecera.encode("utf-8"), dif, workers=workers, on_progress=_progreso, algorithm=algoritmo)
+    barra.progress(1.0, text="Bloque encontrado" if res.found else "Sin resultado")
+    t = max(res.seconds, 0.001)
 
     # Estimación simple: probabilidad de éxito 16^(-dif) ≈ (1/16)**dif
     p = (1/16)**dif
@@ -31,11 +95,75 @@ if st.button("Ejecutar prueba breve"):
     coste = energia_kwh * c_kwh
 
     c1, c2, c3, c4 = st.columns(4)
-    c1.metric("Muestra (s)", f"{t:.2f}")
+    c1.metric("Tiempo medido (s)", f"{t:.2f}")
     c2.metric("Prob. teórica", f"{p:.2e}")
     c3.metric("Hash esperados", f"{hashes_esperados:,.0f}")
     c4.metric("Coste estimado (€)", f"{coste:,.4f}")
 
+    c5, c6, c7, c8 = st.columns(4)
+    c5.metric("Hashrate medido", f"{res.hashrate/1e6:.2f} MH/s")
+    c6.metric("Hashes calculados", f"{res.hashes:,}")
+    c7.metric("Nonce", f"{res.nonce}" if res.found else "—")
+    if calib:
+        # Energía real de la prueba: potencia declarada × tiempo medido
+        c8.metric("Energía de la prueba (Wh)", f"{potencia_w * t / 3600:.4f}")
+    if res.found:
+        st.code(f"{algoritmo}(cabecera + nonce) = {res.digest_hex}")
+
+st.divider()
+st.subheader("Simulación Monte Carlo: ajuste de dificultad")
+st.caption("Sin hashes reales: los tiempos de bloque se muestrean (geométrica/exponencial) con NumPy, así que se pueden explorar dificultades muy superiores a 6.")
+
+m1, m2, m3 = st.columns(3)
+with m1:
+    mc_bloques = int(st.number_input("Bloques a simular", 1_000, 5_000_000, 100_000, step=10_000))
+    mc_ceros = st.slider("Dificultad inicial (ceros hex)", 1, 24, 12)
+with m2:
+    mc_curva = st.selectbox("Curva de hashrate", CURVES, index=2)
+    mc_h0 = st.number_input("Hashrate inicial (TH/s)", 0.000001, 1e9, 1.0, format="%.6f") * 1e12
+    mc_factor = st.number_input("Factor de la curva (×)", 1.0, 100.0, 4.0, step=0.5)
+with m3:
+    mc_regla = st.selectbox("Regla de retarget", RULES)
+    min_periodo = min_retarget_every(mc_bloques)
+    mc_periodo = int(st.number_input("Retarget cada (bloques)", min_periodo, 100_000, max(2016, min_periodo), step=1,
+                                     help=f"Con {mc_bloques:,} bloques, como mínimo {min_periodo:,} para que la simulación siga siendo inmediata."))
+    mc_objetivo = st.number_input("Tiempo objetivo por bloque (s)", 1.0, 3600.0, 600.0, step=10.0)
+
+if st.button("🎲 Simular"):
+    t_sim = time.perf_counter()
+    sim = simulate(
+        mc_bloques,
+        hashrate_curve(mc_curva, mc_bloques, mc_h0, mc_factor),
+        work_for_zeros(mc_ceros),
+        target_block_time=mc_objetivo,
+        retarget_every=mc_periodo,
+        rule=mc_regla,
+        joules_per_hash=kwh_por_mhash * 3.6,  # kWh/1e6 hashes → J/hash
+    )
+    t_sim = time.perf_counter() - t_sim
+    res_sim = sim.summary()
+
+    s1, s2, s3, s4 = st.columns(4)
+    s1.metric("Tiempo medio de bloque", f"{res_sim['tiempo_medio_s']:.1f} s", delta=f"{res_sim['desviacion_objetivo_pct']:+.1f}% vs objetivo")
+    s2.metric("Dificultad final (ceros hex)", f"{res_sim['ceros_hex_final']:.2f}")
+    s3.metric("Energía total", f"{res_sim['energia_kwh']:,.0f} kWh")
+    s4.metric("Coste total (€)", f"{res_sim['energia_kwh'] * c_kwh:,.0f}")
+    st.caption(f"{res_sim['bloques']:,} bloques · {res_sim['duracion_dias']:,.1f} días simulados · calculado en {t_sim*1000:.0f} ms")
+
+    x_bt, y_bt = downsample(sim.block_times)
+    fig_bt = go.Figure(go.Scatter(x=x_bt, y=y_bt, mode="lines", name="Tiempo de bloque (media por tramo)"))
+    fig_bt.add_hline(y=mc_objetivo, line_dash="dash", annotation_text="objetivo")
+    fig_bt.update_layout(title="Tiempo de bloque", xaxis_title="Bloque", yaxis_title="s", template="plotly_dark")
+    st.plotly_chart(fig_bt, width="stretch")
+
+    x_w, y_w = downsample(zeros_for_work(sim.work))
+    x_h, y_h = downsample(zeros_for_work(sim.hashrate * mc_objetivo))
+    fig_d = go.Figure()
+    fig_d.add_trace(go.Scatter(x=x_w, y=y_w, mode="lines", name="Dificultad vigente"))
+    fig_d.add_trace(go.Scatter(x=x_h, y=y_h, mode="lines", name="Dificultad ideal (hashrate × objetivo)", line=dict(dash="dot")))
+    fig_d.update_layout(title="Dificultad (ceros hex equivalentes)", xaxis_title="Bloque", template="plotly_dark")
+    st.plotly_chart(fig_d, width="stretch")
+
 st.divider()
 st.subheader("Síntesis (6–8 líneas)")
 sintesis = st.text_area("¿Puede justificarse jurídicamente el gasto energético del PoW?")
@@ -45,7 +173,9 @@ score = round((e1+e2+e3)/3, 2)
 md = f"""# Simulador PoW
 - Fecha: {datetime.utcnow().isoformat()}Z
 - Dificultad: {dif}
-- kWh/1e6 hashes: {kwh_por_mhash}
+- Procesos: {workers}
+- Algoritmo: {algoritmo}
+- kWh/1e6 hashes: {kwh_por_mhash:.3e} ({'calibrado' if calib else 'manual'})
 - Precio kWh: {c_kwh} €
 ## Síntesis
 {sintesis}
@@ -0,0 +1,14 @@
+"""Mutaciones de un carácter: siempre distinto del original y sobre todo el alfabeto."""
+from ud1.avalanche import ALPHABET, mutations
+
+
+def _primeros(text, n=5000):
+    return {v[0] for chunk in mutations(text, n, seed=1, chunk_size=1000) for v in chunk}
+
+
+def test_original_en_el_alfabeto():
+    assert _primeros("a") == set(ALPHABET) - {"a"}
+
+
+def test_original_fuera_del_alfabeto():
+    assert _primeros("é") == set(ALPHABET)
@@ -0,0 +1,19 @@
+"""Almacén de artefactos: `clear` no borra blobs recién escritos por otra sesión."""
+import os
+import time
+
+from ud1.blob_store import BlobStore
+
+
+def test_clear_respeta_el_margen_de_gc(tmp_path):
+    store = BlobStore(str(tmp_path / "store"))
+    viejo = store.put("viejo.md", "contenido antiguo")
+    antes = time.time() - 3600
+    os.utime(store.blob_path(viejo.sha256), (antes, antes))
+    store.put("nuevo.md", "recién subido")
+    # Otra sesión ha escrito su blob pero todavía no ha registrado el nombre
+    en_vuelo = store._write_blob(b"en vuelo")
+    assert store.clear() == 2
+    assert not os.path.exists(store.blob_path(viejo.sha256))
+    assert os.path.exists(store.blob_path(en_vuelo))
+    assert store.put("en_vuelo.md", b"en vuelo").sha256 == en_vuelo
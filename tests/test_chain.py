@@ -0,0 +1,54 @@
+"""Cadena de hashes: ida y vuelta, y localización de manipulaciones con checkpoints firmados."""
+import json
+import os
+
+from ud1.chain import HashChain, first_divergence, locate_tamper
+from ud1.ledger_store import LedgerStore
+
+
+def _cadena(n=64, every=4):
+    return HashChain([f"Asiento {i}" for i in range(n)], checkpoint_every=every)
+
+
+def test_ida_y_vuelta():
+    chain = _cadena()
+    assert chain.verify() is None
+    assert HashChain(chain.content_at(i) for i in range(len(chain))).head == chain.head
+    assert chain.set(10, "rectificado") == len(chain) - 10
+    assert chain.verify() is None
+    assert locate_tamper(chain, chain.checkpoints).intact
+
+
+def test_cola_rehasheada():
+    chain = _cadena()
+    copia = chain.copy()
+    copia.set(21, "manipulado")
+    rep = locate_tamper(copia, chain.checkpoints)
+    assert (rep.intact, rep.start, rep.end) == (False, 20, 23)
+    assert first_divergence(chain, copia, rep.start, rep.end)[0] == 21
+
+
+def test_contenido_editado_sin_tocar_su_hash():
+    chain = _cadena()
+    chain._entries[37] = "editado a mano"  # el hash guardado sigue siendo el original
+    rep = locate_tamper(chain, chain.checkpoints)
+    assert (rep.intact, rep.start, rep.end) == (False, 36, 39)
+    assert rep.probes <= 5
+
+
+def test_ledger_editado_a_mano(tmp_path):
+    path = str(tmp_path / "ledger")
+    with LedgerStore(path, checkpoint_every=5) as store:
+        for i in range(20):
+            store.append({"texto": f"asiento {i}", "hash": f"{i:064x}"})
+    seg = os.path.join(path, "seg_000000.jsonl")
+    with open(seg, encoding="utf-8") as f:
+        lineas = f.read().splitlines()
+    rec = json.loads(lineas[12])
+    rec["texto"] = "asiento 99"  # misma longitud: los offsets siguen valiendo
+    lineas[12] = json.dumps(rec, ensure_ascii=False, separators=(",", ":"))
+    with open(seg, "w", encoding="utf-8") as f:
+        f.write("\n".join(lineas) + "\n")
+    with LedgerStore(path, readonly=True) as store:
+        rep = locate_tamper(store, store.checkpoints)
+        assert (rep.intact, rep.start, rep.end) == (False, 10, 14)
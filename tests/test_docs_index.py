@@ -0,0 +1,27 @@
+"""Índice de documentos: ids repetidos o no enteros se omiten sin romper la paginación."""
+from ud1.docs_index import DocsIndex
+
+
+def test_omite_ids_invalidos_y_repetidos():
+    idx = DocsIndex.from_rows([(1, "a"), ("x", "b"), (2, "c"), (1, "d"), ("", "e"), (None, "f"), (3, "g")])
+    assert (len(idx), idx.skipped) == (3, 4)
+    assert idx.get(1) == "a"
+    assert idx.page(1, 2) == [(1, "a"), (2, "c")]
+    assert idx.page(2, 2) == [(3, "g")]
+    assert idx.position(3) == 2
+
+
+def test_csv_con_filas_malas(tmp_path):
+    csv_path = tmp_path / "docs.csv"
+    csv_path.write_text("id,texto\n7,siete\n7,otra vez\nabc,mal\n8,ocho\n", encoding="utf-8")
+    idx = DocsIndex.for_csv(str(csv_path), cache_dir=str(tmp_path / "cache"))
+    assert (len(idx), idx.skipped, idx.first_id()) == (2, 2, 7)
+    assert DocsIndex.for_csv(str(csv_path), cache_dir=str(tmp_path / "cache")).skipped == 2
+
+
+def test_corpus_vacio():
+    idx = DocsIndex.from_rows([])
+    assert (len(idx), idx.first_id(), idx.n_pages()) == (0, None, 1)
+    assert idx.get(idx.first_id()) is None
+    assert idx.position(None) is None
+    assert idx.page(1) == []
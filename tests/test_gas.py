@@ -0,0 +1,24 @@
+"""Importación de trazas: `max_bytes` acota la lectura (``/dev/zero``, bombas gzip)."""
+import gzip
+import io
+
+import pytest
+
+from ud1.gas import import_file, import_trace
+
+STEP = b'{"pc":0,"op":"SLOAD","gasCost":2100},'
+
+
+def test_dentro_del_limite():
+    traza = import_trace(io.BytesIO(STEP * 10), max_bytes=len(STEP) * 10)
+    assert (traza.pasos, traza.ops["lectura"]) == (10, 10)
+
+
+def test_bomba_gzip(tmp_path):
+    bomba = tmp_path / "bomba.json.gz"
+    with gzip.open(bomba, "wb") as f:
+        for _ in range(64):
+            f.write(b"\0" * (1 << 20))
+    assert bomba.stat().st_size < 1 << 20
+    with pytest.raises(ValueError):
+        import_file(str(bomba), max_bytes=8 << 20)
@@ -0,0 +1,80 @@
+"""Recuperación del ledger tras una caída y numeración de lotes entre sesiones."""
+import os
+import threading
+
+from ud1.chain import locate_tamper
+from ud1.ledger_store import LedgerStore
+
+
+def _llenar(path, n=10):
+    with LedgerStore(path) as store:
+        for i in range(n):
+            store.append({"texto": f"asiento {i}", "hash": f"{i:064x}"})
+        return [store.hash_at(i) for i in range(n)]
+
+
+def test_offsets_por_delante_del_segmento(tmp_path):
+    path = str(tmp_path / "ledger")
+    hashes = _llenar(path)
+    seg = os.path.join(path, "seg_000000.jsonl")
+    os.truncate(seg, os.path.getsize(seg) - 10)   # el último asiento queda a medias
+    with LedgerStore(path) as store:
+        assert len(store) == 9
+        assert store.head == hashes[8]
+        assert os.path.getsize(os.path.join(path, "offsets.bin")) == 9 * 16
+        store.append({"texto": "tras la caída", "hash": "f" * 64})
+        assert store.verify_chain() is None
+    with LedgerStore(path, readonly=True) as store:
+        assert len(store) == 10
+
+
+def test_offsets_sin_segmento(tmp_path):
+    path = str(tmp_path / "ledger")
+    _llenar(path)
+    os.truncate(os.path.join(path, "seg_000000.jsonl"), 0)
+    with open(os.path.join(path, "offsets.bin"), "ab") as f:
+        f.write(b"\x00" * 7)                          # entrada de offsets incompleta
+    with LedgerStore(path) as store:
+        assert len(store) == 0
+        store.append({"texto": "de nuevo", "hash": "0" * 64})
+        assert store.verify_chain() is None
+
+
+def test_numeros_de_lote_unicos(tmp_path):
+    with LedgerStore(str(tmp_path / "ledger")) as store:
+        numeros = []
+        hilos = [threading.Thread(target=lambda: numeros.append(store.append_batch({"raiz_merkle": "00"})))
+                 for _ in range(16)]
+        for h in hilos:
+            h.start()
+        for h in hilos:
+            h.join()
+        assert sorted(numeros) == list(range(1, 17))
+        assert [b["lote"] for b in store.batches()] == list(range(1, 17))
+
+
+def test_checkpoints_y_lotes_de_la_cola_perdida(tmp_path):
+    path = str(tmp_path / "ledger")
+    with LedgerStore(path, checkpoint_every=2) as store:
+        for i in range(6):
+            store.append({"texto": f"asiento {i}", "hash": f"{i:064x}"})
+        lote = store.append_batch({"raiz_merkle": "ab" * 32, "registros": 2})
+        for i in range(2):
+            store.append({"texto": f"sellado {i}", "hash": f"{i:064x}", "lote": lote})
+    seg = os.path.join(path, "seg_000000.jsonl")
+    with open(seg, "rb") as f:
+        lineas = f.read().splitlines(keepends=True)
+    os.truncate(seg, sum(len(x) for x in lineas[:5]))   # se pierden los asientos 5..7 y el lote
+    with LedgerStore(path, checkpoint_every=2) as store:
+        assert len(store) == 5
+        assert [cp.index for cp in store.checkpoints] == [1, 3]
+        assert store.batches() == []
+        for i in range(3):
+            store.append({"texto": f"nuevo {i}", "hash": f"{i:064x}"})
+        assert store.append_batch({"raiz_merkle": "cd" * 32, "registros": 1}) == 1
+        store.append({"texto": "sellado de nuevo", "hash": "c" * 64, "lote": 1})
+    with LedgerStore(path, checkpoint_every=2) as store:
+        assert [cp.index for cp in store.checkpoints] == [1, 3, 5, 7]
+        assert all(store.hash_at(cp.index) == cp.hash for cp in store.checkpoints)
+        assert [b["raiz_merkle"] for b in store.batches()] == ["cd" * 32]
+        assert locate_tamper(store, store.checkpoints).intact
@@ -0,0 +1,108 @@
+"""Filas falsificadas en un ledger CSV exportado: ninguna debe contar como correcta."""
+import csv
+import io
+from hashlib import sha256
+
+from ud1.core import now_iso, pseudo_signature, sha256_hex
+from ud1.ledger_store import LedgerStore
+from ud1.ledger_view import LEDGER_COLUMNS, LedgerView
+from ud1.ledger_verify import verify_csv
+from ud1.merkle import MerkleTree, leaf_digest, proof_to_str
+
+KEY = "DEMO_SECRET"
+
+
+def _csv(rows) -> io.StringIO:
+    buf = io.StringIO()
+    w = csv.DictWriter(buf, fieldnames=LEDGER_COLUMNS, extrasaction="ignore")
+    w.writeheader()
+    w.writerows(rows)
+    buf.seek(0)
+    return buf
+
+
+def _row(texto: str, **extra) -> dict:
+    return {"texto": texto, "hash": sha256_hex(texto), "timestamp": now_iso(), **extra}
+
+
+def _motivos(rows) -> list:
+    rep = verify_csv(_csv(rows), workers=1, key=KEY)
+    return [i["motivo"] for i in rep.incidencias]
+
+
+def test_filas_legitimas():
+    ts = now_iso()
+    firmada = _row("individual", timestamp=ts, pseudo_firma=pseudo_signature(sha256_hex("individual"), ts, KEY))
+    textos = ["a", "b", "c"]
+    tree = MerkleTree([sha256_hex(t) for t in textos])
+    firma_raiz = pseudo_signature(tree.root, ts, KEY)
+    lote = [_row(t, timestamp=ts, raiz_merkle=tree.root, prueba_merkle=proof_to_str(tree.proof(i)),
+                 pseudo_firma=firma_raiz) for i, t in enumerate(textos)]
+    assert _motivos([firmada] + lote) == []
+
+
+def test_raiz_sin_firma():
+    # El atacante construye su propio árbol: la prueba cuadra, pero nadie firmó la raíz
+    tree = MerkleTree([sha256_hex("falsa"), sha256_hex("otra")])
+    row = _row("falsa", raiz_merkle=tree.root, prueba_merkle=proof_to_str(tree.proof(0)))
+    assert _motivos([row]) == ["falta la pseudo-firma de la raíz"]
+
+
+def test_raiz_igual_a_la_hoja_con_prueba_vacia():
+    row = _row("falsa")
+    row["raiz_merkle"] = leaf_digest(row["hash"]).hex()
+    row["prueba_merkle"] = ""
+    assert _motivos([row]) == ["falta la pseudo-firma de la raíz"]
+
+
+def test_raiz_con_firma_ajena():
+    tree = MerkleTree([sha256_hex("falsa")])
+    row = _row("falsa", raiz_merkle=tree.root, prueba_merkle="", pseudo_firma="0" * 64)
+    assert _motivos([row]) == ["pseudo-firma de la raíz no válida"]
+
+
+def test_prueba_sin_raiz_no_es_verificable():
+    tree = MerkleTree([sha256_hex("falsa"), sha256_hex("otra")])
+    row = _row("falsa", lote="1", prueba_merkle=proof_to_str(tree.proof(0)))
+    assert _motivos([row]) == ["no verificable: prueba de Merkle sin raíz firmada"]
+
+
+def test_exportacion_resuelve_los_lotes_locales(tmp_path):
+    with LedgerStore(str(tmp_path / "ledger")) as store:
+        textos = [f"registro {i}" for i in range(5)]
+        tree = MerkleTree([sha256_hex(t) for t in textos])
+        ts = now_iso()
+        lote = store.append_batch({"raiz_merkle": tree.root, "timestamp": ts,
+                                   "pseudo_firma": pseudo_signature(tree.root, ts, KEY), "registros": len(tree)})
+        for i, t in enumerate(textos):
+            store.append({"texto": t, "hash": sha256_hex(t), "timestamp": ts, "lote": lote,
+                          "prueba_merkle": proof_to_str(tree.proof(i))})
+        exported = io.StringIO("".join(LedgerView(store).iter_csv()))
+    rep = verify_csv(exported, workers=1, key=KEY)
+    assert (rep.filas, rep.errores) == (5, 0)
+
+
+def test_fila_de_fichero_falsificada():
+    # Texto cambiado con el hash, timestamp y firma originales y un nombre de fichero cualquiera
+    ts = now_iso()
+    h = sha256_hex("original")
+    row = _row("texto cambiado", hash=h, timestamp=ts, fichero="x.pdf", pseudo_firma=pseudo_signature(h, ts, KEY))
+    rep = verify_csv(_csv([row]), workers=1, key=KEY)
+    assert (rep.correctas, rep.errores) == (0, 1)
+    assert rep.incidencias[0]["motivo"] == "no verificable: fichero sellado sin su contenido; registro de fichero con texto"
+
+
+def test_fila_de_fichero_contra_sus_bytes(tmp_path):
+    contenido = b"%PDF-1.4 escritura"
+    (tmp_path / "escritura.pdf").write_bytes(contenido)
+    ts = now_iso()
+    h = sha256(contenido).hexdigest()
+    firma = pseudo_signature(h, ts, KEY)
+    buena = {"texto": "", "hash": h, "timestamp": ts, "fichero": "escritura.pdf", "pseudo_firma": firma}
+    cambiada = {**buena, "fichero": "otro.pdf"}
+    (tmp_path / "otro.pdf").write_bytes(b"otro contenido")
+    ajena = {**buena, "fichero": "no_esta.pdf"}
+    rep = verify_csv(_csv([buena, cambiada, ajena]), workers=1, key=KEY, files_dir=str(tmp_path))
+    assert rep.correctas == 1
+    assert [i["motivo"] for i in rep.incidencias] == [
+        "hash no coincide con el fichero", "no verificable: fichero sellado sin su contenido"]
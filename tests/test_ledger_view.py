@@ -0,0 +1,19 @@
+"""Vista del ledger: la exportación CSV devuelve bytes y no deja ficheros abiertos."""
+import csv
+import io
+
+from ud1.ledger_store import LedgerStore
+from ud1.ledger_view import LedgerView
+
+
+def test_exporta_csv_completo(tmp_path):
+    with LedgerStore(str(tmp_path / "ledger")) as store:
+        for i in range(25):
+            store.append({"texto": f"asiento {i}", "hash": f"{i:064x}"})
+        view = LedgerView(store, capacity=10)
+        view.sync()
+        data = view.export_csv()
+    assert isinstance(data, bytes)
+    rows = list(csv.DictReader(io.StringIO(data.decode("utf-8"))))
+    assert [r["texto"] for r in rows] == [f"asiento {i}" for i in range(25)]
+    assert view.page(3, 10)["texto"] == [f"asiento {i}" for i in range(20, 25)]
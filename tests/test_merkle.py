@@ -0,0 +1,33 @@
+"""Lotes de Merkle: pruebas de inclusión de ida y vuelta para tamaños pares e impares."""
+from hashlib import sha256
+
+import pytest
+
+from ud1.merkle import MerkleTree, proof_from_str, proof_to_str, verify_proof
+
+
+def _hashes(n):
+    return [sha256(f"registro {i}".encode()).hexdigest() for i in range(n)]
+
+
+@pytest.mark.parametrize("n", [1, 2, 5, 8, 13])
+def test_pruebas_de_inclusion(n):
+    hashes = _hashes(n)
+    tree = MerkleTree(hashes)
+    for i, h in enumerate(hashes):
+        proof = proof_from_str(proof_to_str(tree.proof(i)))
+        assert verify_proof(h, proof, tree.root)
+    otro = sha256(b"intruso").hexdigest()
+    assert not verify_proof(otro, tree.proof(0), tree.root)
+
+
+def test_raiz_cambia_con_un_registro():
+    hashes = _hashes(6)
+    root = MerkleTree(hashes).root
+    hashes[3] = sha256(b"manipulado").hexdigest()
+    assert MerkleTree(hashes).root != root
+
+
+def test_lote_vacio():
+    with pytest.raises(ValueError):
+        MerkleTree([])
@@ -0,0 +1,41 @@
+"""Volcado de métricas: temporales únicos y un solo `autodump` por intervalo."""
+import os
+import threading
+
+from ud1 import metrics
+
+
+def test_volcados_simultaneos(tmp_path, monkeypatch):
+    monkeypatch.setattr(metrics, "_enabled", True)
+    metrics.observe("prueba", 0.01)
+    destino = tmp_path / "m.prom"
+    errores = []
+
+    def volcar():
+        try:
+            metrics.dump(str(destino))
+        except OSError as e:
+            errores.append(e)
+
+    hilos = [threading.Thread(target=volcar) for _ in range(16)]
+    for h in hilos:
+        h.start()
+    for h in hilos:
+        h.join()
+    assert errores == []
+    assert os.listdir(tmp_path) == ["m.prom"]
+    assert "ud1_span_seconds_count" in destino.read_text(encoding="utf-8")
+
+
+def test_autodump_una_vez_por_intervalo(tmp_path, monkeypatch):
+    monkeypatch.setattr(metrics, "_enabled", True)
+    monkeypatch.setattr(metrics, "_last_dump", float("-inf"))
+    monkeypatch.setenv("UD1_METRICS_DUMP", str(tmp_path / "m.jsonl"))
+    volcados = []
+    monkeypatch.setattr(metrics, "dump", lambda path: volcados.append(path))
+    hilos = [threading.Thread(target=metrics.autodump, kwargs={"every": 3600}) for _ in range(16)]
+    for h in hilos:
+        h.start()
+    for h in hilos:
+        h.join()
+    assert len(volcados) == 1
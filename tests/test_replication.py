@@ -0,0 +1,31 @@
+"""Simulación de replicación: reproducible con semilla y sin cuelgues si falla un nodo."""
+import pytest
+
+from ud1.replication import Node, simulate
+
+
+def _resumen(**kw):
+    s = simulate(nodos=7, duracion=3000, semilla=7, **kw).summary()
+    s.pop("segundos")
+    s.pop("eventos_por_s")
+    return s
+
+
+def test_misma_semilla_mismo_resultado():
+    assert _resumen(perdida=0.05) == _resumen(perdida=0.05)
+
+
+def test_consistente_con_caidas():
+    res = simulate(nodos=7, duracion=5000, perdida=0.02, caida_cada=1500, caida_duracion=500, semilla=3)
+    assert res.consistente
+    assert res.bloques_confirmados > 0
+    assert res.elecciones >= 2
+
+
+def test_excepcion_de_un_nodo_llega_al_llamador(monkeypatch):
+    def roto(self, msg):
+        raise RuntimeError("nodo roto")
+
+    monkeypatch.setattr(Node, "handle", roto)
+    with pytest.raises(RuntimeError, match="nodo roto"):
+        simulate(nodos=3, duracion=1000, semilla=1)
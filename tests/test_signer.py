@@ -0,0 +1,28 @@
+"""Firmador HMAC precomputado: equivale a `hmac.new` y la firma en bloque a la individual."""
+import hashlib
+import hmac
+
+from ud1.signer import get_signer
+
+TS = "2024-01-01T00:00:00+00:00"
+
+
+def test_ida_y_vuelta():
+    signer = get_signer("clave")
+    h = hashlib.sha256(b"hola").hexdigest()
+    firma = signer.sign(h, TS)
+    assert firma == hmac.new(b"clave", f"{h}|{TS}".encode(), "sha256").hexdigest()
+    assert signer.verify(h, TS, firma)
+    assert not signer.verify(h, TS, "0" * 64)
+    assert not get_signer("otra").verify(h, TS, firma)
+
+
+def test_firma_en_bloque():
+    signer = get_signer()
+    pairs = [(hashlib.sha256(str(i).encode()).hexdigest(), TS) for i in range(50)]
+    firmas = signer.sign_many(pairs, workers=3, chunk_size=7)
+    assert firmas == [signer.sign(h, ts) for h, ts in pairs]
+    triples = [(h, ts, f) for (h, ts), f in zip(pairs, firmas)]
+    triples[4] = (triples[4][0], triples[4][1], "0" * 64)
+    ok = signer.verify_many(triples, workers=2, chunk_size=5)
+    assert ok == [i != 4 for i in range(50)]
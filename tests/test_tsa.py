@@ -0,0 +1,53 @@
+"""TSA local: peticiones que no son objetos JSON reciben un error, no un corte de conexión."""
+import asyncio
+import json
+import socket
+import threading
+
+import pytest
+
+from ud1.core import sha256_hex
+from ud1.tsa import TimestampAuthority, TSAClient
+
+
+@pytest.fixture
+def tsa_port():
+    loop = asyncio.new_event_loop()
+    server = loop.run_until_complete(TimestampAuthority().start("127.0.0.1", 0))
+    hilo = threading.Thread(target=loop.run_forever, daemon=True)
+    hilo.start()
+    yield server.sockets[0].getsockname()[1]
+
+    async def parar():
+        server.close()
+        await server.wait_closed()
+        for t in asyncio.all_tasks() - {asyncio.current_task()}:
+            t.cancel()
+
+    asyncio.run_coroutine_threadsafe(parar(), loop).result(5)
+    loop.call_soon_threadsafe(loop.stop)
+    hilo.join()
+    loop.close()
+
+
+def _raw(port: int, *lines: bytes) -> list:
+    with socket.create_connection(("127.0.0.1", port), timeout=5) as sock:
+        sock.sendall(b"".join(line + b"\n" for line in lines))
+        with sock.makefile("rb") as f:
+            return [json.loads(f.readline()) for _ in lines]
+
+
+def test_peticiones_que_no_son_objetos(tsa_port):
+    resp = _raw(tsa_port, b"[]", b"1", b'"hola"', b"{no json")
+    assert all("error" in r for r in resp)
+    # La conexión sigue viva tras un error
+    _, token = _raw(tsa_port, b"[]", json.dumps({"hash": sha256_hex("x")}).encode())
+    assert token["hash"] == sha256_hex("x")
+
+
+def test_cliente_sella_y_rechaza_errores(tsa_port):
+    cliente = TSAClient("127.0.0.1", tsa_port)
+    token = cliente.stamp(sha256_hex("documento"))
+    assert token["hash"] == sha256_hex("documento")
+    with pytest.raises(ValueError):
+        cliente.stamp("no es un hash")
@@ -0,0 +1,60 @@
+"""Exportación ZIP: las altas se añaden en sitio y una caída a mitad obliga a reconstruir."""
+import io
+import os
+import zipfile
+
+from ud1.zip_export import ZipExporter
+
+
+def _names(path) -> list:
+    with zipfile.ZipFile(path) as zf:
+        return zf.namelist()
+
+
+def test_altas_en_sitio(tmp_path):
+    src = tmp_path / "src"
+    src.mkdir()
+    (src / "a.md").write_text("a")
+    exp = ZipExporter(str(src), cache_dir=str(tmp_path / "cache"))
+    with zipfile.ZipFile(io.BytesIO(exp.read())) as zf:
+        assert zf.namelist() == ["a.md"]
+    inode = os.stat(exp.zip_path).st_ino
+    (src / "b.md").write_text("b")
+    data = exp.read()
+    assert (exp.last_added, exp.last_rebuilt) == (1, False)
+    assert os.stat(exp.zip_path).st_ino == inode
+    with zipfile.ZipFile(io.BytesIO(data)) as zf:
+        assert zf.namelist() == ["a.md", "b.md"]
+        assert zf.testzip() is None
+    assert not [f for f in os.listdir(tmp_path / "cache") if f.endswith(".tmp")]
+
+
+def test_caida_antes_del_manifiesto_no_duplica(tmp_path):
+    src = tmp_path / "src"
+    src.mkdir()
+    (src / "a.md").write_text("a")
+    exp = ZipExporter(str(src), cache_dir=str(tmp_path / "cache"))
+    exp.update()
+    (src / "b.md").write_text("b")
+    exp._save_manifest = lambda entries: None  # caída tras sustituir el ZIP
+    exp.update()
+    del exp._save_manifest
+    exp.update()
+    assert exp.last_rebuilt
+    assert _names(exp.zip_path) == ["a.md", "b.md"]
+
+
+def test_caida_a_mitad_de_las_altas(tmp_path):
+    src = tmp_path / "src"
+    src.mkdir()
+    (src / "a.md").write_text("a")
+    exp = ZipExporter(str(src), cache_dir=str(tmp_path / "cache"))
+    exp.update()
+    (src / "b.md").write_text("b" * 1000)
+    exp._save_manifest = lambda entries: None
+    exp.update()
+    del exp._save_manifest
+    os.truncate(exp.zip_path, os.path.getsize(exp.zip_path) - 30)  # directorio central a medias
+    exp.update()
+    assert exp.last_rebuilt
+    assert _names(exp.zip_path) == ["a.md", "b.md"]
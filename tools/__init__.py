@@ -0,0 +1 @@
+"""Herramientas de medición fuera de la app (arranque, carga); se ejecutan con ``python -m tools.<nombre>``."""
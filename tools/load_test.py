@@ -0,0 +1,514 @@
+"""Prueba de carga con sesiones concurrentes sobre ``streamlit.testing.v1.AppTest``.
+
+    python -m tools.load_test --workers 8 --sessions 5
+    python -m tools.load_test --workers 16 --scenarios entrega_s1 ledger_append zip
+    python -m tools.load_test --workers 1 --scenarios ledger_concurrente --ledger-threads 32
+    python -m tools.load_test --workers 8 --compare .cache/ud1/load_test/carga_20250101_120000.json
+
+Cada *worker* es un proceso (``AppTest`` cambia estado global de Streamlit en
+cada ejecución, así que no admite hilos) que hace de réplica del servidor:
+abre sus propias sesiones de ``AppTest`` y, en cada una, repite los caminos
+pesados de la app:
+
+- ``entrega_s1``: «Guardar entrega S1» (escribe un blob y su nombre en SQLite);
+- ``ledger_append``: sellar un texto y «Registrar en ledger»;
+- ``ledger_concurrente``: `ledger_threads` sesiones sellan y registran a la vez
+  sobre el ledger compartido del proceso (el mismo objeto que usan las páginas),
+  para medir la espera por su cerrojo y por los ``fsync`` agrupados;
+- ``zip``: preparar la descarga «Descargar TODO (ZIP)» de las entregas;
+- ``pow``: «Ejecutar prueba breve» del simulador PoW.
+
+Todos los workers comparten un directorio temporal (``entregas/``,
+``.cache/``...) y el mismo ledger (``UD1_LEDGER_DIR``), de modo que compiten por
+el disco y por sus cerrojos como lo harían varias réplicas. Un ledger admite un
+único proceso escritor: con más de un worker, las réplicas que no lo abren
+primero reciben el error del ``flock`` y el informe lo cuenta en «errores de
+bloqueo». Las sesiones de un mismo worker se ejecutan una tras otra porque
+``AppTest`` no admite hilos; la concurrencia entre sesiones sobre el ledger la
+mide ``ledger_concurrente``. Se mide:
+
+- latencia p50/p95/p99 de cada interacción;
+- memoria: RSS tras el calentamiento, al final y pico, por worker;
+- contención del sistema de ficheros: latencia de una escritura + ``fsync``
+  de sondeo en reposo y bajo carga, bytes leídos/escritos, esperas por el
+  cerrojo del ZIP y errores de bloqueo.
+
+El informe es un JSON con esquema fijo en ``.cache/ud1/load_test/``;
+``--compare`` muestra la variación respecto a otro informe.
+"""
+import argparse
+import json
+import multiprocessing as mp
+import os
+import platform
+import queue
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+
+from tools.startup_bench import APP, ROOT, _git_rev, _percentile
+
+REPORT_DIR = os.path.join(".cache", "ud1", "load_test")
+SCENARIOS = ("entrega_s1", "ledger_append", "ledger_concurrente", "zip", "pow")
+PAGES = {
+    "entrega_s1": "views/s1_hash.py",
+    "ledger_append": "views/s2_sellado.py",
+    "ledger_concurrente": "views/s2_sellado.py",
+    "zip": "views/entregables.py",
+    "pow": "apps/pow_energia.py",
+}
+LOCK_ERRORS = ("locked", "ya está abierto", "BlockingIOError", "Resource temporarily unavailable")
+
+
+# ---------------------------
+# Medidas del proceso
+# ---------------------------
+def _rss_mb() -> float:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1e6
+    except (OSError, ValueError, AttributeError):
+        return 0.0
+
+
+def _peak_rss_mb() -> float:
+    try:
+        import resource
+    except ImportError:
+        return 0.0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1e6 if sys.platform == "darwin" else peak * 1024 / 1e6  # bytes en macOS, KiB en Linux
+
+
+def _io_bytes() -> dict:
+    """Bytes leídos/escritos por el proceso (``/proc/self/io``; vacío fuera de Linux)."""
+    try:
+        with open("/proc/self/io") as f:
+            raw = dict(line.split(": ") for line in f.read().splitlines())
+    except OSError:
+        return {}
+    return {"leido": int(raw.get("rchar", 0)), "escrito": int(raw.get("wchar", 0))}
+
+
+class FsProbe:
+    """Escribe 4 KiB + ``fsync`` cada `interval` segundos y guarda cuánto tarda."""
+
+    def __init__(self, path: str, interval: float = 0.25):
+        self.path = path
+        self.interval = interval
+        self.samples = []
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+
+    def _loop(self) -> None:
+        block = os.urandom(4096)
+        with open(self.path, "wb") as f:
+            while not self._stop.is_set():
+                t0 = time.perf_counter()
+                f.seek(0)
+                f.write(block)
+                f.flush()
+                os.fsync(f.fileno())
+                self.samples.append(time.perf_counter() - t0)
+                self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+        return False
+
+
+# ---------------------------
+# Interacciones
+# ---------------------------
+def _check(at):
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+    return at
+
+
+def _by_label(widgets, prefix: str):
+    for w in widgets:
+        if w.label.startswith(prefix):
+            return w
+    raise LookupError(f"No se encontró el control «{prefix}…»")
+
+
+def _timed_run(at) -> float:
+    t0 = time.perf_counter()
+    at.run()
+    dt = time.perf_counter() - t0
+    _check(at)
+    return dt
+
+
+def scenario_entrega_s1(at, tag: str) -> float:
+    at.text_area(key="s1_entrega_text").input(f"Entrega de carga {tag}: el hash encadena los asientos.")
+    _by_label(at.button, "💾 Guardar entrega S1").click()
+    return _timed_run(at)
+
+
+def scenario_ledger_append(at, tag: str) -> float:
+    at.text_area(key="s2_text").input(f"Registro de carga {tag}")
+    _by_label(at.button, "🕒 Generar hash").click()
+    _check(at.run())
+    _by_label(at.button, "📌 Registrar en ledger").click()
+    return _timed_run(at)
+
+
+def scenario_ledger_concurrente(at, tag: str, hilos: int = 8, por_hilo: int = 4) -> list:
+    """`hilos` sesiones que sellan y registran a la vez; devuelve la latencia de cada registro."""
+    # Como en `scenario_zip`: AppTest no admite hilos, así que las sesiones concurrentes
+    # llaman al mismo ledger compartido (cache_resource) que el botón «Registrar en ledger».
+    from ud1.core import stamp
+    from views.common import get_ledger
+    ledger = get_ledger()
+    latencias, errores = [], []
+    salida = threading.Barrier(hilos)
+
+    def sesion(k: int) -> None:
+        try:
+            salida.wait()
+            for i in range(por_hilo):
+                record = stamp(f"Registro concurrente {tag}-h{k}-{i}", key="DEMO_SECRET")
+                t0 = time.perf_counter()
+                ledger.append(record)
+                latencias.append(time.perf_counter() - t0)
+        except Exception as e:
+            errores.append(e)
+
+    ts = [threading.Thread(target=sesion, args=(k,)) for k in range(hilos)]
+    for t in ts:
+        t.start()
+    for t in ts:
+        t.join()
+    if errores:
+        raise errores[0]
+    return latencias
+
+
+def scenario_zip(at, tag: str) -> float:
+    # El botón de descarga llama a `ZipExporter.read` al pulsarlo; AppTest no puede
+    # pulsar descargas, así que se invoca el mismo objeto compartido del proceso.
+    from views.common import get_zip_exporter
+    t0 = time.perf_counter()
+    get_zip_exporter("entregas").read()
+    return time.perf_counter() - t0
+
+
+def scenario_pow(at, tag: str, dificultad: int = 3) -> float:
+    _by_label(at.slider, "Dificultad").set_value(dificultad)
+    _by_label(at.number_input, "Procesos de minado").set_value(1)
+    _by_label(at.button, "Ejecutar prueba breve").click()
+    return _timed_run(at)
+
+
+def _worker(wid: int, run_dir: str, cfg: dict, barrier, results) -> None:
+    if ROOT not in sys.path:
+        sys.path.insert(0, ROOT)
+    os.chdir(run_dir)
+    os.environ["UD1_LEDGER_DIR"] = "ledger"  # el mismo para todas las réplicas
+    if "fork" in mp.get_all_start_methods():
+        # Un hijo de `spawn` hereda ese método, y el pool del PoW re-ejecutaría app.py
+        # como __main__; el servidor real arranca con el método por defecto (fork en Linux)
+        mp.set_start_method("fork", force=True)
+    from streamlit.testing.v1 import AppTest
+    from ud1 import metrics
+    metrics.enable()
+
+    out = {"worker": wid, "latencias": {s: [] for s in cfg["scenarios"]}, "navegacion": [], "errores": []}
+    funcs = {
+        "entrega_s1": scenario_entrega_s1,
+        "ledger_append": scenario_ledger_append,
+        "ledger_concurrente": lambda at, tag: scenario_ledger_concurrente(at, tag, cfg["ledger_threads"]),
+        "zip": scenario_zip,
+        "pow": lambda at, tag: scenario_pow(at, tag, cfg["pow_dificultad"]),
+    }
+
+    def navigate(at, page):
+        t0 = time.perf_counter()
+        _check(at.switch_page(page).run())
+        out["navegacion"].append(time.perf_counter() - t0)
+
+    # Calentamiento: imports, compilación de páginas y apertura de almacenes
+    t0 = time.perf_counter()
+    try:
+        at = AppTest.from_file(APP, default_timeout=cfg["timeout"])
+        for s in cfg["scenarios"]:
+            _check(at.switch_page(PAGES[s]).run())
+    except Exception as e:  # el worker no llega a medir, pero el informe lo recoge
+        out["errores"].append(f"calentamiento: {e!r}")
+    out["calentamiento_s"] = time.perf_counter() - t0
+    metrics.reset()
+    out["rss_inicio_mb"] = _rss_mb()
+    io0 = _io_bytes()
+
+    try:
+        barrier.wait(timeout=cfg["barrier_timeout"])
+    except threading.BrokenBarrierError:
+        # Otro worker murió o no terminó de calentar: sin medición simultánea no hay prueba
+        out["errores"].append("barrera: no todos los workers llegaron a tiempo")
+        out.update(duracion_s=0.0, fsync=[], rss_fin_mb=out["rss_inicio_mb"], rss_pico_mb=_peak_rss_mb(),
+                   io={}, spans=[])
+        results.put(out)
+        return
+    t_start = time.perf_counter()
+    with FsProbe(os.path.join(run_dir, "probe", f"w{wid}.bin")) as probe:
+        for n in range(cfg["sessions"]):
+            at = AppTest.from_file(APP, default_timeout=cfg["timeout"])
+            for s in cfg["scenarios"]:
+                tag = f"w{wid}-s{n}"
+                try:
+                    navigate(at, PAGES[s])
+                    dt = funcs[s](at, tag)
+                    out["latencias"][s].extend(dt if isinstance(dt, list) else [dt])
+                except Exception as e:
+                    out["errores"].append(f"{s}: {e!r}"[:300])
+                if cfg["think"]:
+                    time.sleep(cfg["think"])
+    out["duracion_s"] = time.perf_counter() - t_start
+    out["fsync"] = probe.samples
+    out["rss_fin_mb"] = _rss_mb()
+    out["rss_pico_mb"] = _peak_rss_mb()
+    io1 = _io_bytes()
+    out["io"] = {k: io1[k] - io0.get(k, 0) for k in io1}
+    out["spans"] = [(n, h.counts, h.count, h.sum, h.max) for n, _, h in metrics.REGISTRY.items()]
+    results.put(out)
+
+
+# ---------------------------
+# Orquestación e informe
+# ---------------------------
+def _stats(values) -> dict:
+    if not values:
+        return {"n": 0, "p50_s": 0.0, "p95_s": 0.0, "p99_s": 0.0, "max_s": 0.0, "media_s": 0.0}
+    return {
+        "n": len(values),
+        "p50_s": _percentile(values, 0.50),
+        "p95_s": _percentile(values, 0.95),
+        "p99_s": _percentile(values, 0.99),
+        "max_s": max(values),
+        "media_s": sum(values) / len(values),
+    }
+
+
+def _idle_fsync(run_dir: str, seconds: float = 2.0) -> list:
+    with FsProbe(os.path.join(run_dir, "probe", "reposo.bin"), interval=0.05) as probe:
+        time.sleep(seconds)
+    return probe.samples
+
+
+def _prepare_run_dir(run_dir: str) -> None:
+    os.makedirs(os.path.join(run_dir, "probe"), exist_ok=True)
+    data = os.path.join(run_dir, "data")
+    if not os.path.exists(data):
+        try:
+            os.symlink(os.path.join(ROOT, "data"), data, target_is_directory=True)
+        except OSError:
+            shutil.copytree(os.path.join(ROOT, "data"), data)
+
+
+def _collect(procs, results, deadline: float, on_worker=None) -> list:
+    """Informes de los workers hasta que lleguen todos, mueran los que faltan o venza `deadline`."""
+    outs = []
+    while len(outs) < len(procs):
+        try:
+            outs.append(results.get(timeout=1.0))
+        except queue.Empty:
+            if time.monotonic() > deadline or not any(p.is_alive() for p in procs):
+                # Un último vistazo: el informe puede haber llegado justo antes de salir
+                try:
+                    outs.append(results.get(timeout=1.0))
+                    continue
+                except queue.Empty:
+                    break
+            continue
+        if on_worker:
+            on_worker(outs[-1])
+    return outs
+
+
+def run_load_test(workers: int = 4, sessions: int = 3, scenarios=SCENARIOS, think: float = 0.0,
+                  pow_dificultad: int = 3, timeout: float = 300.0, run_dir: str = None, on_worker=None,
+                  ledger_threads: int = 8) -> dict:
+    """Lanza `workers` procesos con `sessions` sesiones cada uno y devuelve el informe.
+
+    `timeout` acota cada ejecución de ``AppTest``; de él salen también la espera en la
+    barrera de arranque y el plazo total. Un worker que muere o no entrega su informe a
+    tiempo se termina y figura en ``workers_caidos`` con su código de salida.
+    """
+    import streamlit
+    from ud1.metrics import Histogram
+
+    own_dir = run_dir is None
+    run_dir = run_dir or tempfile.mkdtemp(prefix="ud1_carga_")
+    _prepare_run_dir(run_dir)
+    cfg = {"sessions": sessions, "scenarios": list(scenarios), "think": think,
+           "pow_dificultad": pow_dificultad, "ledger_threads": ledger_threads, "timeout": timeout,
+           "barrier_timeout": timeout * (len(scenarios) + 1)}
+    # Calentamiento + cada navegación e interacción, con margen para la barrera
+    deadline = time.monotonic() + cfg["barrier_timeout"] + sessions * len(scenarios) * (2 * timeout + think)
+    try:
+        reposo = _idle_fsync(run_dir)
+        ctx = mp.get_context("spawn")
+        barrier = ctx.Barrier(workers)
+        results = ctx.Queue()
+        procs = [ctx.Process(target=_worker, args=(i, run_dir, cfg, barrier, results)) for i in range(workers)]
+        for p in procs:
+            p.start()
+        outs = _collect(procs, results, deadline, on_worker)
+        for p in procs:
+            p.join(timeout=10.0)
+            if p.is_alive():
+                p.terminate()
+                p.join()
+    finally:
+        if own_dir:
+            shutil.rmtree(run_dir, ignore_errors=True)
+
+    latencias = {s: _stats([x for o in outs for x in o["latencias"].get(s, [])]) for s in scenarios}
+    errores = [e for o in outs for e in o["errores"]]
+    entregados = {o["worker"] for o in outs}
+    caidos = [{"worker": i, "exitcode": p.exitcode, "informe": i in entregados}
+              for i, p in enumerate(procs) if p.exitcode != 0 or i not in entregados]
+    errores += [f"worker {c['worker']}: código de salida {c['exitcode']}" + ("" if c["informe"] else ", sin informe")
+                for c in caidos]
+    for s in scenarios:
+        latencias[s]["errores"] = sum(1 for e in errores if e.startswith(f"{s}:"))
+    spans = {}
+    for o in outs:
+        for name, counts, count, total, mx in o["spans"]:
+            h = Histogram()
+            h.counts, h.count, h.sum, h.max = counts, count, total, mx
+            spans.setdefault(name, Histogram()).merge(h)
+    duracion = max((o["duracion_s"] for o in outs), default=0.0)
+    n_inter = sum(v["n"] for v in latencias.values())
+    crecimiento = [o["rss_fin_mb"] - o["rss_inicio_mb"] for o in outs]
+    return {
+        "fecha": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": _git_rev(),
+        "streamlit": streamlit.__version__,
+        "python": platform.python_version(),
+        "cpus": os.cpu_count(),
+        "config": {"workers": workers, **{k: v for k, v in cfg.items() if k not in ("timeout", "barrier_timeout")}},
+        "workers_caidos": caidos,
+        "duracion_s": duracion,
+        "interacciones": n_inter,
+        "interacciones_por_s": n_inter / duracion if duracion else 0.0,
+        "latencias": latencias,
+        "navegacion": _stats([x for o in outs for x in o["navegacion"]]),
+        "memoria": {
+            "rss_inicio_mb": max((o["rss_inicio_mb"] for o in outs), default=0.0),
+            "crecimiento_medio_mb": sum(crecimiento) / len(crecimiento) if crecimiento else 0.0,
+            "crecimiento_max_mb": max(crecimiento, default=0.0),
+            "pico_mb": max((o["rss_pico_mb"] for o in outs), default=0.0),
+        },
+        "disco": {
+            "fsync_reposo": _stats(reposo),
+            "fsync_carga": _stats([x for o in outs for x in o["fsync"]]),
+            "leido_mb": sum(o["io"].get("leido", 0) for o in outs) / 1e6,
+            "escrito_mb": sum(o["io"].get("escrito", 0) for o in outs) / 1e6,
+            "errores_bloqueo": sum(1 for e in errores if any(k in e for k in LOCK_ERRORS)),
+        },
+        "spans": {name: h.summary() for name, h in sorted(spans.items())},
+        "errores": errores[:20],
+    }
+
+
+def save_report(report: dict, folder: str = REPORT_DIR) -> str:
+    os.makedirs(folder, exist_ok=True)
+    path = os.path.join(folder, f"carga_{datetime.now():%Y%m%d_%H%M%S}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    return path
+
+
+def _key_metrics(report: dict) -> dict:
+    out = {"interacciones/s": report["interacciones_por_s"]}
+    for s, v in report["latencias"].items():
+        out[f"{s} p50 (ms)"] = v["p50_s"] * 1e3
+        out[f"{s} p95 (ms)"] = v["p95_s"] * 1e3
+        out[f"{s} p99 (ms)"] = v["p99_s"] * 1e3
+    out["fsync p95 carga (ms)"] = report["disco"]["fsync_carga"]["p95_s"] * 1e3
+    out["crecimiento RSS máx (MB)"] = report["memoria"]["crecimiento_max_mb"]
+    out["pico RSS (MB)"] = report["memoria"]["pico_mb"]
+    return out
+
+
+def format_report(report: dict, previous: dict = None) -> str:
+    c = report["config"]
+    lines = [
+        f"{c['workers']} workers × {c['sessions']} sesiones · {report['interacciones']} interacciones "
+        f"en {report['duracion_s']:.1f} s ({report['interacciones_por_s']:.2f}/s) · {report['cpus']} CPU",
+        f"{'escenario':<19} {'n':>5} {'err':>4} {'p50 (ms)':>10} {'p95 (ms)':>10} {'p99 (ms)':>10} {'máx (ms)':>10}",
+    ]
+    for s, v in report["latencias"].items():
+        lines.append(f"{s:<19} {v['n']:>5} {v['errores']:>4} {v['p50_s'] * 1e3:>10.1f} "
+                     f"{v['p95_s'] * 1e3:>10.1f} {v['p99_s'] * 1e3:>10.1f} {v['max_s'] * 1e3:>10.1f}")
+    m, d = report["memoria"], report["disco"]
+    lines += [
+        f"memoria: RSS tras calentar {m['rss_inicio_mb']:.0f} MB · crecimiento medio {m['crecimiento_medio_mb']:.1f} MB "
+        f"(máx {m['crecimiento_max_mb']:.1f}) · pico {m['pico_mb']:.0f} MB",
+        f"disco: fsync p95 {d['fsync_reposo']['p95_s'] * 1e3:.2f} ms en reposo → {d['fsync_carga']['p95_s'] * 1e3:.2f} ms "
+        f"bajo carga · {d['escrito_mb']:.1f} MB escritos · {d['leido_mb']:.1f} MB leídos · "
+        f"{d['errores_bloqueo']} errores de bloqueo",
+    ]
+    if "zip_lock_wait" in report["spans"]:
+        z = report["spans"]["zip_lock_wait"]
+        lines.append(f"cerrojo del ZIP: {z['n']} esperas · p95 {z['p95_s'] * 1e3:.1f} ms · máx {z['max_s'] * 1e3:.1f} ms")
+    for c in report.get("workers_caidos", []):
+        lines.append(f"worker caído: {c['worker']} (código {c['exitcode']}" + (")" if c["informe"] else ", sin informe)"))
+    for e in report["errores"][:5]:
+        lines.append(f"  error: {e}")
+    if previous:
+        lines.append(f"\ncomparación con {previous['fecha']} ({previous.get('commit') or '-'}):")
+        old, new = _key_metrics(previous), _key_metrics(report)
+        for k, v in new.items():
+            if k in old:
+                delta = f"{(v - old[k]) / old[k] * 100:+.0f} %" if old[k] else "—"
+                lines.append(f"  {k:<28} {old[k]:>10.2f} → {v:>10.2f}  {delta}")
+    return "\n".join(lines)
+
+
+def main(argv=None) -> int:
+    p = argparse.ArgumentParser(description="Prueba de carga de la app UD1 con sesiones AppTest concurrentes")
+    p.add_argument("--workers", type=int, default=4, help="procesos en paralelo (réplicas)")
+    p.add_argument("--sessions", type=int, default=3, help="sesiones por worker")
+    p.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    p.add_argument("--think", type=float, default=0.0, help="pausa (s) entre interacciones")
+    p.add_argument("--pow-dificultad", type=int, default=3)
+    p.add_argument("--ledger-threads", type=int, default=8, help="sesiones simultáneas en ledger_concurrente")
+    p.add_argument("--run-dir", help="directorio de trabajo (por defecto, uno temporal que se borra)")
+    p.add_argument("--compare", help="informe JSON anterior con el que comparar")
+    p.add_argument("--no-save", action="store_true")
+    args = p.parse_args(argv)
+
+    previous = None
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            previous = json.load(f)
+    report = run_load_test(
+        args.workers, args.sessions, args.scenarios, args.think, args.pow_dificultad, run_dir=args.run_dir,
+        ledger_threads=args.ledger_threads,
+        on_worker=lambda o: print(f"worker {o['worker']}: {o['duracion_s']:.1f} s, {len(o['errores'])} errores",
+                                  file=sys.stderr, flush=True),
+    )
+    print(format_report(report, previous))
+    if not args.no_save:
+        print(f"\nInforme guardado en {save_report(report)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
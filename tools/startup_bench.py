@@ -0,0 +1,179 @@
+"""Benchmark de arranque y de rerun del lanzador multipágina.
+
+    python -m tools.startup_bench                  # todas las páginas
+    python -m tools.startup_bench --pages views/s1_hash.py apps/pow_energia.py --reruns 20
+    python -m tools.startup_bench --history        # resultados anteriores
+
+Para cada página mide, con ``streamlit.testing.v1.AppTest``:
+
+- **arranque en frío**: un intérprete nuevo importa Streamlit y ejecuta la
+  página por primera vez (incluye importar sus módulos y abrir índices/ledger);
+- **rerun**: ejecuciones sucesivas en la misma sesión, que es lo que paga cada
+  interacción del alumno.
+
+Cada página se mide en un proceso nuevo cuyo directorio de trabajo es un
+``tempfile.TemporaryDirectory()`` (con ``data/`` enlazado y ``UD1_LEDGER_DIR``
+dentro): el benchmark no abre el ``./ledger`` real ni compite con un servidor
+en marcha por su cerrojo, y el arranque en frío incluye abrir almacenes vacíos.
+
+Cada ejecución se añade como una línea JSON a ``.cache/ud1/startup_bench.jsonl``
+(con la versión de Streamlit y el commit) para comparar entre versiones.
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(ROOT, "app.py")
+HISTORY = os.path.join(".cache", "ud1", "startup_bench.jsonl")
+PAGES = (
+    "views/teoria.py", "views/s1_hash.py", "views/s2_sellado.py", "views/comparativa.py",
+    "views/lecturas.py", "views/entregables.py",
+    "apps/hash_visual_demo.py", "apps/pow_energia.py", "apps/gas_comparador.py", "apps/explorador_licencias.py",
+)
+
+
+def _percentile(values, q: float) -> float:
+    s = sorted(values)
+    if not s:
+        return 0.0
+    return s[min(len(s) - 1, int(round(q * (len(s) - 1))))]
+
+
+def _app_test(page: str):
+    from streamlit.testing.v1 import AppTest
+    at = AppTest.from_file(APP, default_timeout=120)
+    return at.switch_page(page)
+
+
+def _sandbox_env(tmp: str) -> dict:
+    """Entorno del proceso hijo: `tmp` como ledger y el repositorio en ``PYTHONPATH``."""
+    data = os.path.join(tmp, "data")
+    try:
+        os.symlink(os.path.join(ROOT, "data"), data, target_is_directory=True)
+    except OSError:
+        shutil.copytree(os.path.join(ROOT, "data"), data)
+    path = os.environ.get("PYTHONPATH")
+    return {**os.environ, "UD1_LEDGER_DIR": os.path.join(tmp, "ledger"),
+            "PYTHONPATH": ROOT + (os.pathsep + path if path else "")}
+
+
+def measure(page: str, n_reruns: int = 10) -> dict:
+    """Arranque en frío de `page` en un proceso nuevo y latencia de `n_reruns` reruns de esa sesión."""
+    with tempfile.TemporaryDirectory(prefix="ud1_bench_") as tmp:
+        t0 = time.perf_counter()
+        out = subprocess.run(
+            [sys.executable, "-m", "tools.startup_bench", "--_child", page, "--reruns", str(n_reruns)],
+            cwd=tmp, env=_sandbox_env(tmp), capture_output=True, text=True, check=True,
+        ).stdout
+        total = time.perf_counter() - t0
+    child = json.loads(out.strip().splitlines()[-1])
+    return {"proceso_s": total - child.pop("reruns_s"), **child}
+
+
+def _child(page: str, n_reruns: int) -> None:
+    t0 = time.perf_counter()
+    at = _app_test(page)
+    t1 = time.perf_counter()
+    at.run()
+    t2 = time.perf_counter()
+    if at.exception:
+        raise SystemExit(f"{page}: {at.exception[0].message}")
+    times = []
+    for _ in range(n_reruns):
+        t = time.perf_counter()
+        at.run()
+        times.append(time.perf_counter() - t)
+    if at.exception:
+        raise SystemExit(f"{page}: {at.exception[0].message}")
+    print(json.dumps({
+        "import_s": t1 - t0, "primera_ejecucion_s": t2 - t1, "reruns_s": sum(times),
+        "rerun_p50_s": _percentile(times, 0.5), "rerun_p95_s": _percentile(times, 0.95),
+        "rerun_max_s": max(times, default=0.0),
+    }))
+
+
+def _git_rev() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def run_benchmark(pages=PAGES, n_reruns: int = 10, on_page=None) -> dict:
+    import streamlit
+    results = {}
+    for page in pages:
+        results[page] = measure(page, n_reruns)
+        if on_page:
+            on_page(page, results[page])
+    return {
+        "fecha": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": _git_rev(),
+        "streamlit": streamlit.__version__,
+        "python": platform.python_version(),
+        "reruns": n_reruns,
+        "paginas": results,
+    }
+
+
+def save_result(result: dict, path: str = HISTORY) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(result, ensure_ascii=False) + "\n")
+
+
+def load_history(path: str = HISTORY) -> list:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return [json.loads(line) for line in f if line.strip()]
+    except FileNotFoundError:
+        return []
+
+
+def _row(page: str, r: dict) -> str:
+    return (f"{page:<30} {r['proceso_s']:>8.2f} {r['primera_ejecucion_s']:>10.3f} "
+            f"{r['rerun_p50_s'] * 1e3:>9.1f} {r['rerun_p95_s'] * 1e3:>9.1f}")
+
+
+HEADER = f"{'página':<30} {'frío (s)':>8} {'1ª ejec.':>10} {'p50 (ms)':>9} {'p95 (ms)':>9}"
+
+
+def main(argv=None) -> int:
+    p = argparse.ArgumentParser(description="Arranque en frío y latencia de rerun de cada página")
+    p.add_argument("--pages", nargs="+", default=list(PAGES))
+    p.add_argument("--reruns", type=int, default=10)
+    p.add_argument("--history", action="store_true", help="muestra las ejecuciones guardadas")
+    p.add_argument("--no-save", action="store_true")
+    p.add_argument("--_child", help=argparse.SUPPRESS)
+    args = p.parse_args(argv)
+
+    if args._child:
+        _child(args._child, args.reruns)
+        return 0
+    if args.history:
+        for h in load_history():
+            paginas = h["paginas"]
+            frio = sum(r["proceso_s"] for r in paginas.values()) / len(paginas)
+            p50 = sum(r["rerun_p50_s"] for r in paginas.values()) / len(paginas)
+            print(f"{h['fecha']}  {h['commit'] or '-':<8} streamlit {h['streamlit']:<8} "
+                  f"frío medio {frio:.2f} s · rerun p50 medio {p50 * 1e3:.1f} ms ({len(paginas)} páginas)")
+        return 0
+
+    print(HEADER)
+    result = run_benchmark(args.pages, args.reruns, on_page=lambda page, r: print(_row(page, r), flush=True))
+    if not args.no_save:
+        save_result(result)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
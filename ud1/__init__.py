@@ -0,0 +1 @@
+"""Motores reutilizables de la UD1 (hash, PoW, cadenas, ledger) sin dependencia de Streamlit."""
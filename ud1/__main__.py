@@ -0,0 +1,5 @@
+import sys
+
+from ud1.cli import main
+
+sys.exit(main())
@@ -0,0 +1,151 @@
+"""Análisis vectorizado del efecto avalancha.
+
+Se generan `n` variantes de un texto con un único carácter cambiado (la misma
+regla que `alter_one_char`), se hashean por bloques en una matriz ``(n, 32)`` de
+``uint8`` y, con ``XOR`` + ``np.unpackbits``, se obtienen de una vez la distancia
+de Hamming de cada variante respecto al original y la probabilidad de que cambie
+cada uno de los 256 bits. Un hash ideal da distancias ~ Binomial(256, 1/2).
+El algoritmo es cualquiera de `ud1.hashes` (la matriz tiene su ``digest_size``).
+
+    python -m ud1.avalanche "Contrato de arrendamiento 2025" -n 100000
+"""
+import argparse
+import json
+import math
+import random
+import string
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+from ud1.hashes import DEFAULT_ALGORITHM, get_provider
+
+ALPHABET = string.ascii_letters + string.digits + " .,-_:;()¿?¡!/'\""
+DEFAULT_CHUNK = 20_000
+
+
+def alter_one_char(text: str, rng=random) -> str:
+    """Cambia un carácter aleatorio de `text` por otro distinto del alfabeto."""
+    if not text:
+        return text
+    pos = rng.randrange(len(text))
+    original_char = text[pos]
+    new_char = original_char
+    for _ in range(10):
+        candidate = rng.choice(ALPHABET)
+        if candidate != original_char:
+            new_char = candidate
+            break
+    return text[:pos] + new_char + text[pos+1:]
+
+
+def mutations(text: str, n: int, seed: int = None, chunk_size: int = DEFAULT_CHUNK):
+    """Genera `n` variantes de `text` (un carácter cambiado) en bloques de hasta `chunk_size`.
+
+    Posiciones y caracteres se sortean en bloque con NumPy; el carácter nuevo se
+    elige uniformemente entre los del alfabeto distintos del original.
+    """
+    if not text:
+        raise ValueError("El texto no puede estar vacío")
+    rng = np.random.default_rng(seed)
+    alpha = np.array(list(ALPHABET))
+    index = {c: i for i, c in enumerate(ALPHABET)}
+    for start in range(0, n, chunk_size):
+        m = min(chunk_size, n - start)
+        pos = rng.integers(0, len(text), size=m)
+        # Se sortea entre los len-1 símbolos distintos del original y se salta el suyo;
+        # si el original no está en el alfabeto, entre todos
+        orig = np.array([index.get(text[p], len(ALPHABET)) for p in pos.tolist()])
+        k = rng.integers(0, len(ALPHABET) - (orig < len(ALPHABET)), size=m)
+        chars = alpha[k + (k >= orig)]
+        yield [text[:p] + c + text[p+1:] for p, c in zip(pos.tolist(), chars.tolist())]
+
+
+def digest_matrix(texts, algorithm: str = DEFAULT_ALGORITHM) -> np.ndarray:
+    """Matriz ``(len(texts), digest_size)`` de ``uint8`` con el hash de cada texto."""
+    provider = get_provider(algorithm)
+    new = provider.new
+    raw = b"".join(new(t.encode("utf-8")).digest() for t in texts)
+    return np.frombuffer(raw, dtype=np.uint8).reshape(-1, provider.digest_size)
+
+
+def hamming(digests: np.ndarray, reference: np.ndarray) -> np.ndarray:
+    """Bits distintos (``uint8`` 0/1, una columna por bit) entre cada fila y `reference`."""
+    return np.unpackbits(digests ^ reference, axis=1)
+
+
+@dataclass
+class AvalancheResult:
+    n: int
+    bits: int
+    distancias: np.ndarray      # (n,) distancia de Hamming de cada variante
+    prob_bit: np.ndarray        # (bits,) fracción de variantes en que cambia cada bit
+    segundos: float
+
+    @property
+    def media(self) -> float:
+        return float(self.distancias.mean())
+
+    @property
+    def desviacion(self) -> float:
+        return float(self.distancias.std())
+
+    @property
+    def mutaciones_por_s(self) -> float:
+        return self.n / self.segundos if self.segundos else 0.0
+
+    def histogram(self) -> np.ndarray:
+        """Frecuencia de cada distancia 0..bits."""
+        return np.bincount(self.distancias, minlength=self.bits + 1)
+
+    def expected(self) -> np.ndarray:
+        """Frecuencias esperadas para un hash ideal: n · Binomial(bits, 1/2)."""
+        b = self.bits
+        return np.array([self.n * math.comb(b, k) / 2**b for k in range(b + 1)])
+
+
+def analyze(text: str, n: int = 10_000, seed: int = None, algorithm: str = DEFAULT_ALGORITHM,
+            chunk_size: int = DEFAULT_CHUNK, on_progress=None) -> AvalancheResult:
+    """Hashea `n` mutaciones de `text` y mide la avalancha respecto al hash original."""
+    t0 = time.perf_counter()
+    reference = digest_matrix([text], algorithm)[0]
+    bits = reference.size * 8
+    distancias = np.empty(n, dtype=np.int64)
+    flips = np.zeros(bits, dtype=np.int64)
+    done = 0
+    for batch in mutations(text, n, seed, chunk_size):
+        diff = hamming(digest_matrix(batch, algorithm), reference)
+        distancias[done:done + len(batch)] = diff.sum(axis=1, dtype=np.int64)
+        flips += diff.sum(axis=0, dtype=np.int64)
+        done += len(batch)
+        if on_progress:
+            on_progress(done, n)
+    return AvalancheResult(n, bits, distancias, flips / max(n, 1), time.perf_counter() - t0)
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m ud1.avalanche", description="Mide el efecto avalancha de un hash")
+    parser.add_argument("texto")
+    parser.add_argument("-n", type=int, default=100_000, help="nº de mutaciones")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--algorithm", default=DEFAULT_ALGORITHM)
+    args = parser.parse_args(argv)
+
+    res = analyze(args.texto, args.n, args.seed, args.algorithm)
+    print(json.dumps({
+        "mutaciones": res.n,
+        "bits": res.bits,
+        "distancia_media": round(res.media, 3),
+        "desviacion": round(res.desviacion, 3),
+        "min": int(res.distancias.min()),
+        "max": int(res.distancias.max()),
+        "prob_bit_min": round(float(res.prob_bit.min()), 4),
+        "prob_bit_max": round(float(res.prob_bit.max()), 4),
+        "segundos": round(res.segundos, 3),
+        "mutaciones_por_s": round(res.mutaciones_por_s),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+"""Almacén direccionado por contenido para entregas y materiales generados.
+
+Estructura de la carpeta::
+
+    blobs/ab/abcdef...     contenido, con el SHA-256 como nombre (uno por contenido distinto)
+    index.sqlite           nombre legible → blob (sha256, tamaño, fecha de alta)
+
+Los blobs se escriben en un temporal de la misma carpeta y se publican con
+``os.replace`` (atómico): un lector nunca ve un fichero a medias y dos sesiones
+que guardan lo mismo a la vez producen un único blob. Los nombres se reservan
+en una transacción de SQLite, así que dos guardados en el mismo segundo no se
+pisan. Los ``.md`` sueltos de versiones anteriores se importan al abrir (con
+`FileIndex`). La interfaz de lectura (``len``, ``search``, ``page``, ``read``) es la
+de `FileIndex`, así que el listado paginado sirve para ambos.
+"""
+import hashlib
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+
+from ud1 import metrics
+from ud1.file_index import FileIndex
+
+
+@dataclass(frozen=True)
+class Artifact:
+    name: str
+    size: int
+    mtime_ns: int      # fecha de alta del nombre
+    sha256: str
+
+
+class BlobStore:
+    def __init__(self, root: str, import_suffix: str = ".md"):
+        self.root = root
+        self._blobs = os.path.join(root, "blobs")
+        os.makedirs(self._blobs, exist_ok=True)
+        self._db = sqlite3.connect(os.path.join(root, "index.sqlite"), timeout=30,
+                                   check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS artifacts ("
+            "name TEXT PRIMARY KEY, sha256 TEXT NOT NULL, size INTEGER NOT NULL, created_ns INTEGER NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS artifacts_sha ON artifacts(sha256)")
+        self._lock = threading.Lock()
+        self._import_loose(import_suffix)
+
+    # ---------------------------
+    # Blobs
+    # ---------------------------
+    def blob_path(self, sha256: str) -> str:
+        return os.path.join(self._blobs, sha256[:2], sha256)
+
+    def _write_blob(self, data: bytes) -> str:
+        sha = hashlib.sha256(data).hexdigest()
+        path = self.blob_path(sha)
+        if os.path.exists(path):
+            os.utime(path)  # lo protege de un `gc` concurrente hasta que se registre su nombre
+            return sha
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+        return sha
+
+    # ---------------------------
+    # Escritura
+    # ---------------------------
+    def put(self, name: str, data, reuse: bool = False) -> Artifact:
+        """Guarda `data` (str o bytes) con el nombre `name`.
+
+        Si el nombre ya existe con otro contenido se añade un sufijo (``-2``, ``-3``...).
+        Con ``reuse=True`` un contenido ya guardado devuelve su entrada existente
+        en lugar de darle un nombre nuevo.
+        """
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        name = os.path.basename(name)
+        sha = self._write_blob(data)
+        with self._lock:
+            db = self._db
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                if reuse:
+                    row = db.execute("SELECT name, size, created_ns, sha256 FROM artifacts WHERE sha256 = ? "
+                                     "ORDER BY created_ns LIMIT 1", (sha,)).fetchone()
+                    if row:
+                        db.execute("COMMIT")
+                        return Artifact(*row)
+                stem, ext = os.path.splitext(name)
+                candidate, n = name, 1
+                while True:
+                    row = db.execute("SELECT name, size, created_ns, sha256 FROM artifacts WHERE name = ?",
+                                     (candidate,)).fetchone()
+                    if row is None:
+                        break
+                    if row[3] == sha:
+                        db.execute("COMMIT")
+                        return Artifact(*row)
+                    n += 1
+                    candidate = f"{stem}-{n}{ext}"
+                art = Artifact(candidate, len(data), time.time_ns(), sha)
+                db.execute("INSERT INTO artifacts(name, sha256, size, created_ns) VALUES (?, ?, ?, ?)",
+                           (art.name, art.sha256, art.size, art.mtime_ns))
+                db.execute("COMMIT")
+                return art
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+
+    def _import_loose(self, suffix: str) -> None:
+        """Mueve al almacén los ficheros sueltos de la carpeta (formato anterior)."""
+        if not suffix:
+            return
+        loose = FileIndex(self.root, suffix)
+        for name in loose.search():
+            self.put(name, loose.read(name))
+            os.remove(os.path.join(self.root, name))
+
+    def clear(self) -> int:
+        """Borra todos los nombres y sus blobs. Devuelve cuántos nombres había.
+
+        Los blobs se recogen con el margen por defecto de `gc`: uno recién escrito por
+        otra sesión, aún sin nombre, no se borra (queda para la siguiente recogida).
+        """
+        with self._lock:
+            n = self._db.execute("DELETE FROM artifacts").rowcount
+        self.gc()
+        return n
+
+    def gc(self, grace: float = 60.0) -> int:
+        """Elimina los blobs que ya no referencia ningún nombre.
+
+        Se respetan los escritos en los últimos `grace` segundos: otra sesión puede
+        haber creado el blob y no haber registrado todavía su nombre.
+        """
+        cutoff = time.time() - grace
+        with self._lock:
+            live = {r[0] for r in self._db.execute("SELECT DISTINCT sha256 FROM artifacts")}
+        removed = 0
+        for root, _, files in os.walk(self._blobs):
+            for name in files:
+                path = os.path.join(root, name)
+                if name not in live and not name.startswith(".tmp-") and os.stat(path).st_mtime < cutoff:
+                    os.remove(path)
+                    removed += 1
+        return removed
+
+    # ---------------------------
+    # Lectura (desde el índice, sin listar la carpeta)
+    # ---------------------------
+    def _query(self, sql: str, params=()):
+        with self._lock:
+            return self._db.execute(sql, params).fetchall()
+
+    def __len__(self) -> int:
+        return self._query("SELECT COUNT(*) FROM artifacts")[0][0]
+
+    def get(self, name: str):
+        row = self._query("SELECT name, size, created_ns, sha256 FROM artifacts WHERE name = ?", (name,))
+        return Artifact(*row[0]) if row else None
+
+    def _like(self, query: str) -> str:
+        q = query.strip().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        return f"%{q}%"
+
+    def search(self, query: str = "") -> list:
+        """Nombres (ordenados) que contienen `query`, sin distinguir mayúsculas."""
+        rows = self._query("SELECT name FROM artifacts WHERE name LIKE ? ESCAPE '\\' ORDER BY name",
+                           (self._like(query),))
+        return [r[0] for r in rows]
+
+    def count(self, query: str = "") -> int:
+        return self._query("SELECT COUNT(*) FROM artifacts WHERE name LIKE ? ESCAPE '\\'", (self._like(query),))[0][0]
+
+    def page(self, number: int = 1, size: int = 20, query: str = ""):
+        """(entradas de la página `number`, nº total de coincidencias)."""
+        like = self._like(query)
+        total = self.count(query)
+        rows = self._query(
+            "SELECT name, size, created_ns, sha256 FROM artifacts WHERE name LIKE ? ESCAPE '\\' "
+            "ORDER BY name LIMIT ? OFFSET ?", (like, size, (number - 1) * size),
+        )
+        return [Artifact(*r) for r in rows], total
+
+    def read(self, name: str) -> bytes:
+        art = self.get(name)
+        if art is None:
+            raise FileNotFoundError(name)
+        with metrics.span("blob_read"), open(self.blob_path(art.sha256), "rb") as f:
+            return f.read()
+
+    def zip_entries(self) -> dict:
+        """{nombre: [sha256, tamaño]} para `ZipExporter` (la huella sale del índice)."""
+        return {n: [s, z] for n, s, z in self._query("SELECT name, sha256, size FROM artifacts")}
+
+    def path_for(self, name: str) -> str:
+        art = self.get(name)
+        if art is None:
+            raise FileNotFoundError(name)
+        return self.blob_path(art.sha256)
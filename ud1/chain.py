@@ -0,0 +1,269 @@
+"""Cadena de hashes incremental para la cadena de custodia (S1).
+
+Cada asiento guarda su hash encadenado: el primero es ``sha256(contenido)`` y los
+siguientes ``sha256(contenido + "|" + prev_hash)``. Añadir es O(1) y editar el
+asiento i sólo rehashea desde i hasta el final.
+
+Opcionalmente la cadena firma (HMAC) un checkpoint cada ``checkpoint_every``
+asientos. `locate_tamper` localiza el tramo manipulado con una búsqueda binaria
+sobre los checkpoints (O(log n) comprobaciones). Cada comprobación recalcula los
+enlaces del tramo desde el último checkpoint ya validado: no basta con que el
+hash guardado coincida con el firmado, porque un asiento editado sin tocar su
+hash también debe detectarse. En total se rehashean como mucho unos 2n asientos;
+lo que se ahorra frente a `verify` no es hashing sino acotar el tramo exacto.
+
+El algoritmo es configurable (`ud1.hashes`); SHA-256 por defecto.
+"""
+import hmac
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from ud1.hashes import DEFAULT_ALGORITHM, get_provider
+from ud1.signer import DEFAULT_KEY, get_signer
+
+GENESIS_PREV = "-"
+
+
+def link_hash(content: str, prev_hash: str, algorithm: str = DEFAULT_ALGORITHM) -> str:
+    new = get_provider(algorithm).new
+    if prev_hash == GENESIS_PREV:
+        return new(content.encode("utf-8")).hexdigest()
+    return new(f"{content}|{prev_hash}".encode("utf-8")).hexdigest()
+
+
+def sign_checkpoint(index: int, hash_value: str, key: str = DEFAULT_KEY) -> str:
+    return get_signer(key).sign(str(index), hash_value)
+
+
+@dataclass(frozen=True)
+class Checkpoint:
+    index: int      # posición del asiento (0-based)
+    hash: str       # hash encadenado en esa posición
+    firma: str      # HMAC de "index|hash"
+
+
+@dataclass
+class TamperReport:
+    intact: bool                  # todos los checkpoints cuadran
+    start: Optional[int]          # primer asiento del tramo sospechoso (0-based)
+    end: Optional[int]            # último asiento del tramo sospechoso
+    probes: int                   # comprobaciones de checkpoint realizadas
+    unchecked_from: int = 0       # asientos posteriores al último checkpoint (sin cubrir)
+    hashed: int = 0               # enlaces recalculados (cota superior)
+
+
+class HashChain:
+    def __init__(self, entries=(), checkpoint_every: int = 0, key: str = DEFAULT_KEY,
+                 algorithm: str = DEFAULT_ALGORITHM):
+        self._entries = []
+        self._hashes = []
+        self._checkpoints = []
+        self.checkpoint_every = checkpoint_every
+        self.algorithm = get_provider(algorithm).name
+        self._key = key
+        self.extend(entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __getitem__(self, index: int) -> dict:
+        index = range(len(self))[index]
+        return self._row(index)
+
+    def _row(self, index: int) -> dict:
+        return {
+            "idx": index + 1,
+            "contenido": self._entries[index],
+            "hash": self._hashes[index],
+            "prev_hash": self.prev_hash(index),
+        }
+
+    def prev_hash(self, index: int) -> str:
+        return self._hashes[index - 1] if index > 0 else GENESIS_PREV
+
+    @property
+    def head(self) -> str:
+        """Hash del último asiento (o GENESIS_PREV si la cadena está vacía)."""
+        return self._hashes[-1] if self._hashes else GENESIS_PREV
+
+    def hash_at(self, index: int) -> str:
+        return self._hashes[index]
+
+    def content_at(self, index: int) -> str:
+        return self._entries[index]
+
+    def iter_links(self, start: int, stop: int):
+        """Pares (contenido, hash guardado) de los asientos [start, stop)."""
+        return zip(self._entries[start:stop], self._hashes[start:stop])
+
+    @property
+    def checkpoints(self) -> list:
+        return list(self._checkpoints)
+
+    def _maybe_checkpoint(self, index: int) -> None:
+        every = self.checkpoint_every
+        if every and (index + 1) % every == 0:
+            h = self._hashes[index]
+            self._checkpoints.append(Checkpoint(index, h, sign_checkpoint(index, h, self._key)))
+
+    def append(self, content: str) -> str:
+        h = link_hash(content, self.head, self.algorithm)
+        self._entries.append(content)
+        self._hashes.append(h)
+        self._maybe_checkpoint(len(self._hashes) - 1)
+        return h
+
+    def extend(self, contents) -> None:
+        prev = self.head
+        entries, hashes, alg = self._entries, self._hashes, self.algorithm
+        for content in contents:
+            prev = link_hash(content, prev, alg)
+            entries.append(content)
+            hashes.append(prev)
+            self._maybe_checkpoint(len(hashes) - 1)
+
+    def truncate(self, length: int) -> None:
+        del self._entries[length:]
+        del self._hashes[length:]
+        self._checkpoints = [cp for cp in self._checkpoints if cp.index < length]
+
+    def copy(self) -> "HashChain":
+        """Copia independiente (sin rehashear), p. ej. para simular una réplica."""
+        other = HashChain(checkpoint_every=self.checkpoint_every, key=self._key, algorithm=self.algorithm)
+        other._entries = list(self._entries)
+        other._hashes = list(self._hashes)
+        other._checkpoints = list(self._checkpoints)
+        return other
+
+    def set(self, index: int, content: str) -> int:
+        """Edita un asiento y rehashea la cola. Devuelve cuántos hashes se recalcularon."""
+        index = range(len(self))[index]
+        if self._entries[index] == content:
+            return 0
+        self._entries[index] = content
+        return self._rehash_from(index)
+
+    def _rehash_from(self, index: int) -> int:
+        entries, hashes = self._entries, self._hashes
+        prev = self.prev_hash(index)
+        for i in range(index, len(entries)):
+            prev = link_hash(entries[i], prev, self.algorithm)
+            hashes[i] = prev
+        # Una rectificación por la vía oficial vuelve a firmar los checkpoints afectados
+        if self.checkpoint_every:
+            self._checkpoints = [cp for cp in self._checkpoints if cp.index < index]
+            every = self.checkpoint_every
+            for i in range(index + (-(index + 1)) % every, len(hashes), every):
+                self._checkpoints.append(Checkpoint(i, hashes[i], sign_checkpoint(i, hashes[i], self._key)))
+        return len(entries) - index
+
+    def rows(self, start: int = 0, stop: int = None) -> list:
+        """Ventana de asientos como lista de dicts (para `st.dataframe`)."""
+        stop = len(self) if stop is None else min(stop, len(self))
+        return [self._row(i) for i in range(max(start, 0), stop)]
+
+    def verify(self):
+        """Recalcula toda la cadena. Devuelve el índice del primer asiento roto o None."""
+        prev = GENESIS_PREV
+        for i, (content, h) in enumerate(zip(self._entries, self._hashes)):
+            prev = link_hash(content, prev, self.algorithm)
+            if prev != h:
+                return i
+        return None
+
+
+def _segment_ok(chain, cp: Checkpoint, key: str, prev_index: int, prev_hash: str) -> bool:
+    """¿El tramo (prev_index, cp.index] se recalcula desde `prev_hash` hasta el hash firmado en `cp`?"""
+    if cp.index >= len(chain):
+        return False
+    if not hmac.compare_digest(sign_checkpoint(cp.index, cp.hash, key), cp.firma):
+        return False
+    prev = prev_hash
+    for content, stored in chain.iter_links(prev_index + 1, cp.index + 1):
+        prev = link_hash(content, prev, chain.algorithm)
+        if prev != stored:
+            return False
+    return prev == cp.hash
+
+
+def locate_tamper(chain, checkpoints, key: str = DEFAULT_KEY) -> TamperReport:
+    """Busca (binaria) el primer checkpoint firmado hasta el que `chain` no se recalcula.
+
+    `chain` es un `HashChain` o cualquier objeto con ``len``, ``algorithm`` e
+    ``iter_links(start, stop)`` (p. ej. el `LedgerStore`). Cada comprobación
+    rehashea el tramo desde el último checkpoint válido, así que detecta tanto un
+    hash de cadena alterado como un contenido editado que conserva su hash.
+    Devuelve el tramo entre el último checkpoint válido y el primero roto; con
+    ``checkpoint_every=1`` el tramo es exactamente el asiento alterado.
+    """
+    lo, hi, probes, hashed = 0, len(checkpoints), 0, 0
+    anchor_index, anchor_hash = -1, GENESIS_PREV
+    while lo < hi:
+        mid = (lo + hi) // 2
+        probes += 1
+        cp = checkpoints[mid]
+        hashed += max(0, min(cp.index, len(chain) - 1) - anchor_index)
+        if _segment_ok(chain, cp, key, anchor_index, anchor_hash):
+            # El prefijo hasta `cp` es auténtico: las siguientes comprobaciones parten de él
+            lo = mid + 1
+            anchor_index, anchor_hash = cp.index, cp.hash
+        else:
+            hi = mid
+    covered = checkpoints[lo - 1].index + 1 if lo > 0 else 0
+    if lo == len(checkpoints):
+        return TamperReport(True, None, None, probes, unchecked_from=covered, hashed=hashed)
+    return TamperReport(False, covered, checkpoints[lo].index, probes, unchecked_from=covered, hashed=hashed)
+
+
+def first_divergence(reference: HashChain, chain: HashChain, lo: int = 0, hi: int = None):
+    """Primer índice en [lo, hi] donde `chain` difiere de la cadena de referencia.
+
+    Búsqueda binaria sobre los hashes encadenados. Devuelve (índice o None, comprobaciones).
+    """
+    n = min(len(reference), len(chain))
+    hi = n - 1 if hi is None else min(hi, n - 1)
+    probes = 0
+    found = None
+    while lo <= hi:
+        mid = (lo + hi) // 2
+        probes += 1
+        if reference.hash_at(mid) == chain.hash_at(mid):
+            lo = mid + 1
+        else:
+            found, hi = mid, mid - 1
+    if found is None and len(reference) != len(chain):
+        found = n
+    return found, probes
+
+
+def benchmark_chain(n: int = 100_000, edits: int = 20, algorithm: str = DEFAULT_ALGORITHM) -> dict:
+    """Throughput de append, edición (cola media) y verificación completa sobre `n` asientos."""
+    contents = [f"Asiento {i}: anotación de prueba." for i in range(n)]
+    chain = HashChain(algorithm=algorithm)
+    t0 = time.perf_counter()
+    for c in contents:
+        chain.append(c)
+    t_append = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    rehashed = 0
+    for k in range(edits):
+        rehashed += chain.set(n - 1 - (k * n) // (2 * edits), f"Edición {k}")
+    t_edit = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    ok = chain.verify() is None
+    t_verify = time.perf_counter() - t0
+
+    return {
+        "algoritmo": chain.algorithm,
+        "asientos": n,
+        "append_por_s": n / t_append,
+        "ediciones": edits,
+        "hashes_rehasheados": rehashed,
+        "edicion_ms_media": 1000 * t_edit / edits,
+        "rehash_por_s": rehashed / t_edit if t_edit else float("inf"),
+        "verificacion_s": t_verify,
+        "verifica_ok": ok,
+    }
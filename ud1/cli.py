@@ -0,0 +1,161 @@
+"""CLI de las primitivas de UD1 (sin Streamlit ni pandas).
+
+    python -m ud1 hash "Acta nº 6789"            # SHA-256 de cada argumento
+    cat textos.txt | python -m ud1 hash          # una línea de entrada → un hash
+    python -m ud1 hash --file escritura.pdf      # fichero por bloques
+    python -m ud1 stamp "Acta nº 6789"           # registro sellado (JSON por línea)
+    python -m ud1 stamp --ledger ledger < textos.txt
+    python -m ud1 chain < asientos.txt           # CSV idx,contenido,hash,prev_hash
+    python -m ud1 verify ledger_ud1.csv          # auditoría de un CSV exportado
+    python -m ud1 verify --ledger ledger         # recalcula la cadena del ledger
+    python -m ud1 export ledger -o ledger.csv
+
+Cada subcomando importa sólo lo que necesita para que el arranque sea mínimo.
+"""
+import argparse
+import json
+import sys
+
+from ud1.signer import DEFAULT_KEY
+
+
+def _inputs(values):
+    """Argumentos posicionales o, si no hay (o es ``-``), líneas de la entrada estándar."""
+    if values and values != ["-"]:
+        yield from values
+        return
+    for line in sys.stdin:
+        yield line.rstrip("\r\n")
+
+
+def cmd_hash(args) -> int:
+    out = sys.stdout.write
+    if args.file:
+        from ud1.stream_hash import hash_file
+        for path in args.file:
+            out(f"{hash_file(path, algorithm=args.algorithm).hexdigest}  {path}\n")
+        return 0
+    from ud1.hashes import get_provider
+    new = get_provider(args.algorithm).new
+    for text in _inputs(args.texto):
+        out(new(text.encode("utf-8")).hexdigest() + "\n")
+    return 0
+
+
+def cmd_stamp(args) -> int:
+    from ud1.core import stamp
+    store = None
+    if args.ledger:
+        from ud1.ledger_store import LedgerStore
+        store = LedgerStore(args.ledger, key=args.key)
+    try:
+        for text in _inputs(args.texto):
+            rec = stamp(text, args.key)
+            if store is not None:
+                store.append(rec)
+            sys.stdout.write(json.dumps(rec, ensure_ascii=False) + "\n")
+    finally:
+        if store is not None:
+            store.close()
+    return 0
+
+
+def cmd_chain(args) -> int:
+    from ud1.chain import GENESIS_PREV, link_hash
+    prev = GENESIS_PREV
+    writer = None
+    if not args.head:
+        import csv
+        writer = csv.writer(sys.stdout)
+        writer.writerow(["idx", "contenido", "hash", "prev_hash"])
+    for i, text in enumerate(_inputs(args.texto), 1):
+        h = link_hash(text, prev, args.algorithm)
+        if writer is not None:
+            writer.writerow([i, text, h, prev])
+        prev = h
+    if args.head:
+        sys.stdout.write(prev + "\n")
+    return 0
+
+
+def cmd_verify(args) -> int:
+    if args.ledger:
+        import os
+        from ud1.ledger_store import LedgerStore
+        if not os.path.isdir(args.ledger):
+            sys.stderr.write(f"No existe el ledger {args.ledger}\n")
+            return 2
+        with LedgerStore(args.ledger, readonly=True) as store:
+            broken = store.verify_chain()
+            n = len(store)
+        print(json.dumps({"asientos": n, "cadena_ok": broken is None, "primer_roto": broken}))
+        return 0 if broken is None else 1
+    if not args.csv:
+        sys.stderr.write("Indica un CSV o --ledger DIR\n")
+        return 2
+    from ud1.ledger_verify import main as verify_main
+    argv = [args.csv, "--key", args.key]
+    if args.workers is not None:
+        argv += ["--workers", str(args.workers)]
+    if args.report:
+        argv += ["--report", args.report]
+    return verify_main(argv)
+
+
+def cmd_export(args) -> int:
+    from ud1.core import export_ledger_csv
+    if args.output in (None, "-"):
+        n = export_ledger_csv(args.ledger, sys.stdout)
+    else:
+        with open(args.output, "w", encoding="utf-8", newline="") as f:
+            n = export_ledger_csv(args.ledger, f)
+    sys.stderr.write(f"{n} asientos exportados\n")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m ud1", description="Hash, sellado y ledger de UD1")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    p = sub.add_parser("hash", help="hash de textos (argumentos o stdin) o ficheros")
+    p.add_argument("texto", nargs="*")
+    p.add_argument("--file", nargs="+", help="hashea ficheros por bloques")
+    p.add_argument("--algorithm", default="sha256")
+    p.set_defaults(func=cmd_hash)
+
+    p = sub.add_parser("stamp", help="sella textos: hash + timestamp + pseudo-firma")
+    p.add_argument("texto", nargs="*")
+    p.add_argument("--key", default=DEFAULT_KEY)
+    p.add_argument("--ledger", help="añade los registros a este ledger persistente")
+    p.set_defaults(func=cmd_stamp)
+
+    p = sub.add_parser("chain", help="encadena textos (uno por línea) como en S1")
+    p.add_argument("texto", nargs="*")
+    p.add_argument("--algorithm", default="sha256")
+    p.add_argument("--head", action="store_true", help="imprime sólo el hash final")
+    p.set_defaults(func=cmd_chain)
+
+    p = sub.add_parser("verify", help="verifica un ledger CSV exportado o un ledger persistente")
+    p.add_argument("csv", nargs="?")
+    p.add_argument("--ledger")
+    p.add_argument("--key", default=DEFAULT_KEY)
+    p.add_argument("--workers", type=int, default=None)
+    p.add_argument("--report")
+    p.set_defaults(func=cmd_verify)
+
+    p = sub.add_parser("export", help="exporta un ledger persistente a CSV")
+    p.add_argument("ledger")
+    p.add_argument("-o", "--output", help="fichero de salida (por defecto, stdout)")
+    p.set_defaults(func=cmd_export)
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    try:
+        return args.func(args)
+    except BrokenPipeError:  # p. ej. `python -m ud1 hash < big.txt | head`
+        return 0
+    except (FileNotFoundError, ValueError, RuntimeError) as e:
+        sys.stderr.write(f"error: {e}\n")
+        return 2
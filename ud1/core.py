@@ -0,0 +1,61 @@
+"""Primitivas de hash, sellado de tiempo y ledger sin dependencias de la UI.
+
+Es lo que usan la app Streamlit y la CLI (``python -m ud1``); no importa
+Streamlit ni pandas y no crea directorios al importarse.
+"""
+import csv
+import hashlib
+import os
+from datetime import datetime, timezone
+
+from ud1.signer import DEFAULT_KEY, get_signer
+
+RECORD_COLUMNS = ("texto", "hash", "timestamp", "pseudo_firma")
+
+
+def sha256_hex(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+def pseudo_signature(hash_value: str, timestamp_iso: str, key: str = DEFAULT_KEY) -> str:
+    return get_signer(key).sign(hash_value, timestamp_iso)
+
+
+def stamp(texto: str, key: str = DEFAULT_KEY, timestamp_iso: str = None) -> dict:
+    """Registro sellado de un texto: hash, timestamp UTC y pseudo-firma HMAC."""
+    h = sha256_hex(texto)
+    ts = timestamp_iso or now_iso()
+    return {"texto": texto, "hash": h, "timestamp": ts, "pseudo_firma": pseudo_signature(h, ts, key)}
+
+
+def build_chain(contents, checkpoint_every: int = 0, key: str = DEFAULT_KEY, algorithm: str = "sha256"):
+    """`HashChain` con los contenidos dados (la cadena simulada de S1)."""
+    from ud1.chain import HashChain
+    return HashChain(contents, checkpoint_every=checkpoint_every, key=key, algorithm=algorithm)
+
+
+def write_ledger_csv(records, out, columns=None) -> int:
+    """Escribe registros (dicts) como CSV en el fichero de texto `out`. Devuelve cuántos."""
+    if columns is None:
+        from ud1.ledger_view import LEDGER_COLUMNS
+        columns = LEDGER_COLUMNS
+    writer = csv.DictWriter(out, fieldnames=list(columns), extrasaction="ignore")
+    writer.writeheader()
+    n = 0
+    for rec in records:
+        writer.writerow(rec)
+        n += 1
+    return n
+
+
+def export_ledger_csv(path: str, out) -> int:
+    """Exporta el ledger persistente de `path` (sólo lectura) como CSV en `out`."""
+    from ud1.ledger_store import LedgerStore
+    if not os.path.isdir(path):
+        raise FileNotFoundError(f"No existe el ledger {path}")
+    with LedgerStore(path, readonly=True) as store:
+        return write_ledger_csv(store.with_batch_roots(store.iter_range(0, len(store))), out)
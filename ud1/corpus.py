@@ -0,0 +1,169 @@
+"""Anclaje por lotes de un registro CSV (``id,texto``) en una sola pasada.
+
+El CSV se lee por bloques; el SHA-256 de cada ``texto`` (la parte cara) se
+calcula en un pool de procesos y después, en orden, se encadena cada fila con
+la anterior: ``hash_cadena = sha256(hash + "|" + prev_hash)`` (la misma regla
+que `ud1.chain`). La salida tiene las columnas ``id, hash, prev_hash,
+hash_cadena`` y se escribe por bloques en Parquet (si hay ``pyarrow``) o CSV.
+
+    python -m ud1.corpus data/docs_demo.csv anclaje.parquet --workers 8
+"""
+import argparse
+import csv
+import hashlib
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import islice
+
+from ud1.chain import GENESIS_PREV, link_hash
+
+OUT_COLUMNS = ("id", "hash", "prev_hash", "hash_cadena")
+DEFAULT_CHUNK = 50_000
+
+csv.field_size_limit(min(sys.maxsize, 2**31 - 1))
+
+
+@dataclass
+class CorpusReport:
+    filas: int
+    segundos: float
+    cabeza: str          # hash_cadena de la última fila: ancla de todo el registro
+    salida: str
+
+    @property
+    def filas_por_s(self) -> float:
+        return self.filas / self.segundos if self.segundos else 0.0
+
+
+def digest_texts(texts) -> list:
+    sha = hashlib.sha256
+    return [sha(t.encode("utf-8")).hexdigest() for t in texts]
+
+
+class _CsvSink:
+    def __init__(self, path: str):
+        self._f = open(path, "w", encoding="utf-8", newline="")
+        self._w = csv.writer(self._f)
+        self._w.writerow(OUT_COLUMNS)
+
+    def write(self, cols: dict) -> None:
+        self._w.writerows(zip(*(cols[c] for c in OUT_COLUMNS)))
+
+    def close(self) -> None:
+        self._f.close()
+
+
+class _ParquetSink:
+    def __init__(self, path: str):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        self._pa = pa
+        self._schema = pa.schema([(c, pa.string()) for c in OUT_COLUMNS])
+        self._w = pq.ParquetWriter(path, self._schema)
+
+    def write(self, cols: dict) -> None:
+        self._w.write_table(self._pa.table({c: cols[c] for c in OUT_COLUMNS}, schema=self._schema))
+
+    def close(self) -> None:
+        self._w.close()
+
+
+def _open_sink(path: str):
+    if path.endswith(".parquet"):
+        try:
+            return _ParquetSink(path)
+        except ImportError:
+            raise ImportError("La salida Parquet necesita `pyarrow` (pip install pyarrow); usa .csv en su lugar.")
+    return _CsvSink(path)
+
+
+def _chunks(reader, id_col: str, text_col: str, size: int):
+    while True:
+        rows = list(islice(reader, size))
+        if not rows:
+            return
+        yield [r[id_col] for r in rows], [r[text_col] or "" for r in rows]
+
+
+def anchor_registry(
+    src: str,
+    dst: str,
+    workers: int = None,
+    chunk_size: int = DEFAULT_CHUNK,
+    id_col: str = "id",
+    text_col: str = "texto",
+    on_progress=None,
+) -> CorpusReport:
+    """Hashea y encadena todas las filas de `src` y escribe el anclaje en `dst`."""
+    workers = max(1, workers or os.cpu_count() or 1)
+    t0 = time.perf_counter()
+    prev = GENESIS_PREV
+    filas = 0
+    sink = _open_sink(dst)
+
+    def emit(ids, digests):
+        nonlocal prev, filas
+        prevs, chained = [], []
+        for d in digests:
+            prevs.append(prev)
+            prev = link_hash(d, prev)
+            chained.append(prev)
+        sink.write({"id": ids, "hash": digests, "prev_hash": prevs, "hash_cadena": chained})
+        filas += len(ids)
+        if on_progress:
+            on_progress(filas, time.perf_counter() - t0)
+
+    try:
+        with open(src, "r", encoding="utf-8", newline="") as f:
+            reader = csv.DictReader(f)
+            missing = [c for c in (id_col, text_col) if c not in (reader.fieldnames or ())]
+            if missing:
+                raise ValueError(f"Faltan columnas en {src}: {', '.join(missing)}")
+            chunks = _chunks(reader, id_col, text_col, chunk_size)
+            if workers == 1:
+                for ids, texts in chunks:
+                    emit(ids, digest_texts(texts))
+            else:
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    # Ventana FIFO acotada: los bloques se encadenan en el orden de lectura
+                    window = deque()
+                    for ids, texts in chunks:
+                        window.append((ids, pool.submit(digest_texts, texts)))
+                        if len(window) >= 2 * workers:
+                            ids_done, fut = window.popleft()
+                            emit(ids_done, fut.result())
+                    while window:
+                        ids_done, fut = window.popleft()
+                        emit(ids_done, fut.result())
+    finally:
+        sink.close()
+    return CorpusReport(filas, time.perf_counter() - t0, prev, dst)
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m ud1.corpus", description="Ancla un registro CSV (id, texto)")
+    parser.add_argument("src", help="CSV de entrada, p. ej. data/docs_demo.csv")
+    parser.add_argument("dst", help="salida .csv o .parquet")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk", type=int, default=DEFAULT_CHUNK)
+    parser.add_argument("--id-col", default="id")
+    parser.add_argument("--text-col", default="texto")
+    args = parser.parse_args(argv)
+
+    rep = anchor_registry(args.src, args.dst, args.workers, args.chunk, args.id_col, args.text_col)
+    print(json.dumps({
+        "filas": rep.filas,
+        "segundos": round(rep.segundos, 3),
+        "filas_por_s": round(rep.filas_por_s),
+        "cabeza": rep.cabeza,
+        "salida": rep.salida,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
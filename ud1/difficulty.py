@@ -0,0 +1,143 @@
+"""Simulador Monte Carlo del ajuste de dificultad (retarget) con NumPy vectorizado.
+
+No se calcula ningún hash: el número de intentos de cada bloque se muestrea de una
+geométrica de parámetro 1/trabajo (o de una exponencial cuando el trabajo es tan
+grande que la geométrica desborda int64), y el tiempo de bloque es intentos/hashrate.
+Dentro de cada periodo de retarget la dificultad es constante, así que cada periodo
+se muestrea de una sola vez; el coste crece con el número de periodos, que la
+interfaz acota con `min_retarget_every`.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+
+CURVES = ("constante", "lineal", "exponencial", "choque", "ciclo")
+RULES = ("bitcoin", "amortiguada", "fija")
+_GEOMETRIC_MAX_WORK = 1e15
+MAX_PERIODS = 25_000        # ~8 µs por periodo: la simulación se mantiene por debajo de ~0,3 s
+
+
+def work_for_zeros(zeros: float) -> float:
+    """Trabajo esperado (hashes por bloque) para `zeros` ceros hex al inicio."""
+    return 16.0 ** zeros
+
+
+def zeros_for_work(work):
+    return np.log(work) / np.log(16.0)
+
+
+def min_retarget_every(n_blocks: int) -> int:
+    """Periodo de retarget mínimo para no superar `MAX_PERIODS` periodos con `n_blocks` bloques."""
+    return max(1, -(-int(n_blocks) // MAX_PERIODS))
+
+
+def hashrate_curve(kind: str, n_blocks: int, h0: float, factor: float = 2.0) -> np.ndarray:
+    """Hashrate (H/s) por bloque. `factor` es el multiplicador final (lineal/exponencial),
+    la caída (choque) o la amplitud relativa (ciclo)."""
+    x = np.linspace(0.0, 1.0, n_blocks)
+    if kind == "constante":
+        return np.full(n_blocks, h0)
+    if kind == "lineal":
+        return h0 * (1.0 + (factor - 1.0) * x)
+    if kind == "exponencial":
+        return h0 * factor ** x
+    if kind == "choque":
+        return np.where(x < 0.5, h0, h0 / factor)
+    if kind == "ciclo":
+        amp = min(max(factor - 1.0, 0.0), 0.95)
+        return h0 * (1.0 + amp * np.sin(2 * np.pi * 4 * x))
+    raise ValueError(f"Curva desconocida: {kind}. Opciones: {', '.join(CURVES)}")
+
+
+@dataclass
+class SimulationResult:
+    block_times: np.ndarray      # segundos por bloque
+    work: np.ndarray             # hashes esperados por bloque (dificultad vigente)
+    hashrate: np.ndarray         # H/s por bloque
+    target_block_time: float
+    retarget_every: int
+    energy_kwh: float
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        return np.cumsum(self.block_times)
+
+    @property
+    def hashes(self) -> float:
+        return float(np.dot(self.hashrate, self.block_times))
+
+    def summary(self) -> dict:
+        bt = self.block_times
+        return {
+            "bloques": int(bt.size),
+            "tiempo_medio_s": float(bt.mean()),
+            "p50_s": float(np.median(bt)),
+            "p99_s": float(np.percentile(bt, 99)),
+            "desviacion_objetivo_pct": float(100 * (bt.mean() / self.target_block_time - 1)),
+            "duracion_dias": float(bt.sum() / 86400),
+            "ceros_hex_final": float(zeros_for_work(self.work[-1])),
+            "hashes_totales": self.hashes,
+            "energia_kwh": self.energy_kwh,
+        }
+
+
+def _sample_attempts(rng: np.random.Generator, work: float, size: int) -> np.ndarray:
+    if work <= _GEOMETRIC_MAX_WORK:
+        return rng.geometric(1.0 / work, size).astype(np.float64)
+    return rng.standard_exponential(size) * work
+
+
+def simulate(
+    n_blocks: int,
+    hashrate: np.ndarray,
+    initial_work: float,
+    target_block_time: float = 600.0,
+    retarget_every: int = 2016,
+    rule: str = "bitcoin",
+    max_adjust: float = 4.0,
+    joules_per_hash: float = 0.0,
+    seed: int = None,
+) -> SimulationResult:
+    """Simula `n_blocks` bloques con reajuste cada `retarget_every` bloques.
+
+    - ``bitcoin``: trabajo *= objetivo/real del periodo, limitado a [1/max_adjust, max_adjust].
+    - ``amortiguada``: igual, pero sólo se aplica 1/4 del ajuste (en escala logarítmica).
+    - ``fija``: la dificultad nunca cambia.
+    """
+    if rule not in RULES:
+        raise ValueError(f"Regla desconocida: {rule}. Opciones: {', '.join(RULES)}")
+    hashrate = np.asarray(hashrate, dtype=np.float64)
+    if hashrate.shape != (n_blocks,):
+        raise ValueError("`hashrate` debe tener un valor por bloque.")
+    rng = np.random.default_rng(seed)
+    retarget_every = max(1, int(retarget_every))
+
+    block_times = np.empty(n_blocks)
+    work = np.empty(n_blocks)
+    w = float(initial_work)
+    for start in range(0, n_blocks, retarget_every):
+        end = min(start + retarget_every, n_blocks)
+        attempts = _sample_attempts(rng, w, end - start)
+        block_times[start:end] = attempts / hashrate[start:end]
+        work[start:end] = w
+        if rule == "fija":
+            continue
+        ratio = target_block_time * (end - start) / block_times[start:end].sum()
+        ratio = min(max(ratio, 1.0 / max_adjust), max_adjust)
+        if rule == "amortiguada":
+            ratio = ratio ** 0.25
+        w *= ratio
+
+    energy_kwh = float(np.dot(hashrate, block_times)) * joules_per_hash / 3.6e6
+    return SimulationResult(block_times, work, hashrate, target_block_time, retarget_every, energy_kwh)
+
+
+def downsample(values: np.ndarray, points: int = 2000):
+    """Media por tramos para graficar series largas: devuelve (índice_central, media)."""
+    n = values.size
+    if n <= points:
+        return np.arange(n), values
+    edges = np.linspace(0, n, points + 1).astype(np.int64)
+    sums = np.add.reduceat(values, edges[:-1])
+    counts = np.diff(edges)
+    return (edges[:-1] + counts // 2), sums / counts
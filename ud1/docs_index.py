@@ -0,0 +1,194 @@
+"""Índice en disco (SQLite) del dataset de documentos (``id,texto``).
+
+Se construye una vez en streaming desde el CSV y se reconstruye sólo si el CSV
+cambia (tamaño/mtime). Cada fila guarda su posición en el CSV (``pos``, clave
+primaria) y su ``id`` (índice único; las filas con id no entero o repetido se
+omiten y se cuentan en ``skipped``), de modo que buscar por id y servir una
+página son O(log n). La búsqueda de texto usa FTS5 si SQLite lo incluye y, si no,
+un ``LIKE`` con límite.
+"""
+import csv
+import hashlib
+import os
+import sqlite3
+import sys
+import threading
+from itertools import islice
+
+CACHE_DIR = os.path.join(".cache", "ud1")
+
+csv.field_size_limit(min(sys.maxsize, 2**31 - 1))
+
+
+def _has_fts5() -> bool:
+    try:
+        sqlite3.connect(":memory:").execute("CREATE VIRTUAL TABLE t USING fts5(x)")
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+
+HAS_FTS5 = _has_fts5()
+
+
+def _create_schema(db) -> None:
+    db.execute("CREATE TABLE meta (k TEXT PRIMARY KEY, v TEXT)")
+    db.execute("CREATE TABLE docs (pos INTEGER PRIMARY KEY, id INTEGER NOT NULL UNIQUE, texto TEXT NOT NULL)")
+    if HAS_FTS5:
+        db.execute("CREATE VIRTUAL TABLE docs_fts USING fts5(texto, content='docs', content_rowid='pos')")
+
+
+def _parse_id(doc_id):
+    try:
+        return int(doc_id)
+    except (TypeError, ValueError):
+        return None
+
+
+def _fill(db, rows, chunk: int = 50_000) -> int:
+    """Inserta los pares (id, texto); omite (y cuenta en ``meta``) ids no enteros o repetidos.
+
+    ``pos`` se asigna como ``MAX(pos) + 1`` en la propia inserción, así que las filas
+    omitidas no dejan huecos y la paginación por rango de ``pos`` sigue siendo exacta.
+    """
+    leidas = 0
+    it = iter(rows)
+    before = db.total_changes
+    while True:
+        batch = [(_parse_id(doc_id), texto) for doc_id, texto in islice(it, chunk)]
+        if not batch:
+            break
+        leidas += len(batch)
+        db.executemany(
+            "INSERT OR IGNORE INTO docs(pos, id, texto) "
+            "VALUES ((SELECT IFNULL(MAX(pos) + 1, 0) FROM docs), ?, ?)",
+            [r for r in batch if r[0] is not None],
+        )
+    n = db.total_changes - before
+    if HAS_FTS5:
+        db.execute("INSERT INTO docs_fts(docs_fts) VALUES ('rebuild')")
+    db.executemany("INSERT INTO meta VALUES (?, ?)", [("n", str(n)), ("omitidas", str(leidas - n))])
+    return n
+
+
+class DocsIndex:
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        meta = dict(self._db.execute("SELECT k, v FROM meta").fetchall())
+        self._n = int(meta["n"])
+        self.skipped = int(meta.get("omitidas", 0))
+
+    @staticmethod
+    def _signature(csv_path: str) -> str:
+        st = os.stat(csv_path)
+        return f"{os.path.abspath(csv_path)}|{st.st_size}|{st.st_mtime_ns}"
+
+    @classmethod
+    def for_csv(cls, csv_path: str, cache_dir: str = CACHE_DIR, id_col: str = "id", text_col: str = "texto") -> "DocsIndex":
+        """Abre el índice del CSV, construyéndolo (de forma atómica) si no existe o está desfasado."""
+        os.makedirs(cache_dir, exist_ok=True)
+        name = hashlib.sha256(os.path.abspath(csv_path).encode("utf-8")).hexdigest()[:16]
+        db_path = os.path.join(cache_dir, f"docs_{name}.sqlite")
+        sig = cls._signature(csv_path)
+        if os.path.exists(db_path):
+            try:
+                with sqlite3.connect(db_path) as db:
+                    row = db.execute("SELECT v FROM meta WHERE k = 'src'").fetchone()
+                if row and row[0] == sig:
+                    return cls(db_path)
+            except sqlite3.DatabaseError:
+                pass
+        tmp = f"{db_path}.{os.getpid()}.tmp"
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        db = sqlite3.connect(tmp)
+        try:
+            _create_schema(db)
+            with open(csv_path, "r", encoding="utf-8", newline="") as f:
+                reader = csv.DictReader(f)
+                _fill(db, ((r[id_col], r[text_col] or "") for r in reader))
+            db.execute("INSERT INTO meta VALUES ('src', ?)", (sig,))
+            db.commit()
+        finally:
+            db.close()
+        os.replace(tmp, db_path)
+        return cls(db_path)
+
+    @classmethod
+    def from_rows(cls, rows) -> "DocsIndex":
+        """Índice en memoria a partir de pares (id, texto) (datos por defecto, pruebas)."""
+        obj = cls.__new__(cls)
+        obj.db_path = ":memory:"
+        obj._db = sqlite3.connect(":memory:", check_same_thread=False)
+        obj._lock = threading.Lock()
+        _create_schema(obj._db)
+        obj._n = _fill(obj._db, rows)
+        obj.skipped = int(obj._db.execute("SELECT v FROM meta WHERE k = 'omitidas'").fetchone()[0])
+        obj._db.commit()
+        return obj
+
+    def __len__(self) -> int:
+        return self._n
+
+    def _query(self, sql: str, params=()):
+        with self._lock:
+            return self._db.execute(sql, params).fetchall()
+
+    def get(self, doc_id: int):
+        """Texto del documento o None (índice único sobre id)."""
+        if doc_id is None:
+            return None
+        row = self._query("SELECT texto FROM docs WHERE id = ?", (int(doc_id),))
+        return row[0][0] if row else None
+
+    def first_id(self):
+        row = self._query("SELECT id FROM docs WHERE pos = 0")
+        return row[0][0] if row else None
+
+    def position(self, doc_id: int):
+        """Posición (0-based) del documento en el dataset, o None."""
+        if doc_id is None:
+            return None
+        row = self._query("SELECT pos FROM docs WHERE id = ?", (int(doc_id),))
+        return row[0][0] if row else None
+
+    def page(self, number: int, size: int = 50) -> list:
+        """Página `number` (1-based): lista de (id, texto) por rango de `pos`."""
+        start = (number - 1) * size
+        return self._query("SELECT id, texto FROM docs WHERE pos >= ? AND pos < ? ORDER BY pos", (start, start + size))
+
+    def n_pages(self, size: int = 50) -> int:
+        return max(1, (self._n + size - 1) // size)
+
+    def search(self, query: str, limit: int = 50) -> list:
+        """Documentos cuyo id es `query` o cuyo texto contiene los términos buscados."""
+        query = query.strip()
+        if not query:
+            return []
+        out = []
+        if query.isdigit():
+            texto = self.get(int(query))
+            if texto is not None:
+                out.append((int(query), texto))
+        if HAS_FTS5:
+            # Cada término como prefijo entre comillas: sin operadores FTS inyectados por el usuario
+            terms = " ".join('"' + t.replace('"', '""') + '"*' for t in query.split())
+            try:
+                out += self._query(
+                    "SELECT d.id, d.texto FROM docs_fts JOIN docs d ON d.pos = docs_fts.rowid "
+                    "WHERE docs_fts MATCH ? ORDER BY d.pos LIMIT ?", (terms, limit),
+                )
+            except sqlite3.OperationalError:
+                pass
+        else:
+            out += self._query(
+                "SELECT id, texto FROM docs WHERE texto LIKE ? ORDER BY pos LIMIT ?", (f"%{query}%", limit)
+            )
+        seen, uniq = set(), []
+        for doc_id, texto in out:
+            if doc_id not in seen:
+                seen.add(doc_id)
+                uniq.append((doc_id, texto))
+        return uniq[:limit]
@@ -0,0 +1,98 @@
+"""Índice perezoso de los ficheros guardados en una carpeta (``entregas/``, ``materiales/``).
+
+Guarda por fichero nombre, tamaño, mtime y SHA-256. En cada consulta sólo se
+hace un ``stat`` de la carpeta: si su mtime no ha cambiado (y el índice no es más
+antiguo que `max_age`) se reutiliza tal cual; si cambió, se relista con
+``os.scandir`` y sólo se hashean los ficheros nuevos o modificados. El contenido
+se lee únicamente cuando se pide una descarga concreta (`read`).
+"""
+import os
+import threading
+import time
+from dataclasses import dataclass
+
+from ud1.stream_hash import hash_file
+
+
+@dataclass(frozen=True)
+class FileEntry:
+    name: str
+    size: int
+    mtime_ns: int
+    sha256: str
+
+
+class FileIndex:
+    def __init__(self, folder: str, suffix: str = ".md", max_age: float = 30.0):
+        self.folder = folder
+        self.suffix = suffix
+        self.max_age = max_age   # relistado de seguridad (ediciones in situ no cambian el mtime de la carpeta)
+        self._entries = {}
+        self._sorted = []
+        self._dir_mtime = None
+        self._scanned_at = 0.0
+        self._lock = threading.Lock()
+
+    def refresh(self, force: bool = False) -> bool:
+        """Relista la carpeta si ha cambiado. Devuelve True si se relistó."""
+        try:
+            dir_mtime = os.stat(self.folder).st_mtime_ns
+        except FileNotFoundError:
+            dir_mtime = None
+        with self._lock:
+            fresh = time.monotonic() - self._scanned_at < self.max_age
+            if not force and fresh and dir_mtime == self._dir_mtime:
+                return False
+            entries = {}
+            if dir_mtime is not None:
+                with os.scandir(self.folder) as it:
+                    for de in it:
+                        if not de.name.endswith(self.suffix) or not de.is_file():
+                            continue
+                        try:
+                            st = de.stat()
+                        except FileNotFoundError:
+                            continue
+                        old = self._entries.get(de.name)
+                        if old is not None and old.size == st.st_size and old.mtime_ns == st.st_mtime_ns:
+                            entries[de.name] = old
+                        else:
+                            try:
+                                digest = hash_file(de.path).hexdigest
+                            except FileNotFoundError:
+                                continue
+                            entries[de.name] = FileEntry(de.name, st.st_size, st.st_mtime_ns, digest)
+            self._entries = entries
+            self._sorted = sorted(entries)
+            self._dir_mtime = dir_mtime
+            self._scanned_at = time.monotonic()
+            return True
+
+    def __len__(self) -> int:
+        self.refresh()
+        return len(self._sorted)
+
+    def get(self, name: str):
+        self.refresh()
+        return self._entries.get(name)
+
+    def search(self, query: str = "") -> list:
+        """Nombres (ordenados) que contienen `query`, sin distinguir mayúsculas."""
+        self.refresh()
+        names = self._sorted
+        q = query.strip().lower()
+        return [n for n in names if q in n.lower()] if q else list(names)
+
+    def page(self, number: int = 1, size: int = 20, query: str = ""):
+        """(entradas de la página `number`, nº total de coincidencias)."""
+        names = self.search(query)
+        start = (number - 1) * size
+        entries = self._entries
+        return [entries[n] for n in names[start:start + size] if n in entries], len(names)
+
+    def read(self, name: str) -> bytes:
+        """Contenido de un fichero indexado (sólo al pedir su descarga)."""
+        if os.path.basename(name) != name or self.get(name) is None:
+            raise FileNotFoundError(name)
+        with open(os.path.join(self.folder, name), "rb") as f:
+            return f.read()
@@ -0,0 +1,285 @@
+"""Estimación didáctica de gas: barrido vectorizado e importación de trazas EVM.
+
+El modelo agrupa las operaciones en lectura de estado, escritura de estado y
+criptográficas, cada una con un peso en gas (`WEIGHTS`). `sweep` evalúa gas y
+coste sobre rejillas completas de parámetros: cada parámetro que se pasa como
+vector ocupa su propio eje y NumPy difunde (*broadcasting*) el resto sin
+materializar productos cartesianos intermedios.
+
+`import_trace` obtiene recuentos reales a partir de una traza de opcodes de
+``debug_traceTransaction`` / ``debug_traceBlock*`` (``structLogs`` de geth) o
+del JSONL de ``evm --json``. La lectura es incremental, por bloques, y sólo se
+retiene el paso en curso, así que una traza de varios GB (también ``.gz``) no
+necesita caber en memoria. Cuenta con el orden de campos de geth: ``gasCost``
+y ``opName`` aparecen después de ``op``.
+
+    python -m ud1.gas traza.json.gz --top 15
+"""
+import argparse
+import gzip
+import json
+import os
+import re
+import time
+from collections import Counter
+from dataclasses import dataclass
+
+import numpy as np
+
+# Pesos didácticos (gas por operación)
+WEIGHTS = {"lectura": 5, "escritura": 20, "cripto": 200}
+CATEGORIES = ("lectura", "escritura", "cripto", "otras")
+PARAMS = ("ops_lec", "ops_escr", "ops_cript", "precio_gwei", "eth_eur")
+
+READ_OPS = frozenset({"SLOAD", "TLOAD", "BALANCE", "SELFBALANCE", "EXTCODESIZE", "EXTCODECOPY", "EXTCODEHASH",
+                      "BLOCKHASH", "BLOBHASH"})
+WRITE_OPS = frozenset({"SSTORE", "TSTORE", "LOG0", "LOG1", "LOG2", "LOG3", "LOG4", "CREATE", "CREATE2",
+                       "SELFDESTRUCT"})
+CRYPTO_OPS = frozenset({"KECCAK256", "SHA3"})
+CALL_OPS = frozenset({"CALL", "CALLCODE", "DELEGATECALL", "STATICCALL"})
+# Precompilados criptográficos (0x04 es la copia de datos): ecrecover, sha256, ripemd160, modexp, bn256, blake2f, KZG, BLS
+CRYPTO_PRECOMPILES = frozenset(range(1, 0x12)) - {4}
+
+# Nombre por byte para las trazas que sólo traen el número (``evm --json`` lo acompaña de ``opName``)
+OPCODES = {
+    0x00: "STOP", 0x01: "ADD", 0x02: "MUL", 0x03: "SUB", 0x04: "DIV", 0x05: "SDIV", 0x06: "MOD", 0x07: "SMOD",
+    0x08: "ADDMOD", 0x09: "MULMOD", 0x0a: "EXP", 0x0b: "SIGNEXTEND", 0x10: "LT", 0x11: "GT", 0x12: "SLT",
+    0x13: "SGT", 0x14: "EQ", 0x15: "ISZERO", 0x16: "AND", 0x17: "OR", 0x18: "XOR", 0x19: "NOT", 0x1a: "BYTE",
+    0x1b: "SHL", 0x1c: "SHR", 0x1d: "SAR", 0x20: "KECCAK256", 0x30: "ADDRESS", 0x31: "BALANCE", 0x32: "ORIGIN",
+    0x33: "CALLER", 0x34: "CALLVALUE", 0x35: "CALLDATALOAD", 0x36: "CALLDATASIZE", 0x37: "CALLDATACOPY",
+    0x38: "CODESIZE", 0x39: "CODECOPY", 0x3a: "GASPRICE", 0x3b: "EXTCODESIZE", 0x3c: "EXTCODECOPY",
+    0x3d: "RETURNDATASIZE", 0x3e: "RETURNDATACOPY", 0x3f: "EXTCODEHASH", 0x40: "BLOCKHASH", 0x41: "COINBASE",
+    0x42: "TIMESTAMP", 0x43: "NUMBER", 0x44: "PREVRANDAO", 0x45: "GASLIMIT", 0x46: "CHAINID", 0x47: "SELFBALANCE",
+    0x48: "BASEFEE", 0x49: "BLOBHASH", 0x4a: "BLOBBASEFEE", 0x50: "POP", 0x51: "MLOAD", 0x52: "MSTORE",
+    0x53: "MSTORE8", 0x54: "SLOAD", 0x55: "SSTORE", 0x56: "JUMP", 0x57: "JUMPI", 0x58: "PC", 0x59: "MSIZE",
+    0x5a: "GAS", 0x5b: "JUMPDEST", 0x5c: "TLOAD", 0x5d: "TSTORE", 0x5e: "MCOPY", 0x5f: "PUSH0",
+    **{0x60 + i: f"PUSH{i + 1}" for i in range(32)},
+    **{0x80 + i: f"DUP{i + 1}" for i in range(16)},
+    **{0x90 + i: f"SWAP{i + 1}" for i in range(16)},
+    **{0xa0 + i: f"LOG{i}" for i in range(5)},
+    0xf0: "CREATE", 0xf1: "CALL", 0xf2: "CALLCODE", 0xf3: "RETURN", 0xf4: "DELEGATECALL", 0xf5: "CREATE2",
+    0xfa: "STATICCALL", 0xfd: "REVERT", 0xfe: "INVALID", 0xff: "SELFDESTRUCT",
+}
+
+DEFAULT_CHUNK = 1024 * 1024
+_TAIL = 64                          # bytes que se conservan entre bloques para no partir una clave
+_MAX_STEP = 8 * 1024 * 1024         # un paso más largo (memoria enorme) se cierra con lo leído
+
+_OP = re.compile(rb'"op"\s*:\s*(?:"([A-Za-z0-9]+)"|(\d+))')
+_GAS_COST = re.compile(rb'"gasCost"\s*:\s*"?(0x[0-9a-fA-F]+|\d+)')
+_OP_NAME = re.compile(rb'"opName"\s*:\s*"([A-Za-z0-9]+)"')
+_STACK = re.compile(rb'"stack"\s*:\s*\[')
+
+
+def category(op: str, target: int = None) -> str:
+    """Categoría de un opcode; en las llamadas, `target` es la dirección destino (precompilados)."""
+    if op in READ_OPS:
+        return "lectura"
+    if op in WRITE_OPS:
+        return "escritura"
+    if op in CRYPTO_OPS or (op in CALL_OPS and target in CRYPTO_PRECOMPILES):
+        return "cripto"
+    return "otras"
+
+
+# ---------------------------
+# Barrido de escenarios
+# ---------------------------
+@dataclass
+class SweepResult:
+    axes: dict                      # parámetro barrido → valores, en el orden de los ejes
+    gas: np.ndarray
+    eth: np.ndarray
+    eur: np.ndarray
+
+    @property
+    def shape(self) -> tuple:
+        return self.eur.shape
+
+    def summary(self) -> dict:
+        p5, p50, p95 = np.percentile(self.eur, [5, 50, 95])
+        return {
+            "escenarios": int(self.eur.size),
+            "ejes": {k: len(v) for k, v in self.axes.items()},
+            "gas_min": int(self.gas.min()),
+            "gas_max": int(self.gas.max()),
+            "eur_min": float(self.eur.min()),
+            "eur_p5": float(p5),
+            "eur_p50": float(p50),
+            "eur_p95": float(p95),
+            "eur_max": float(self.eur.max()),
+        }
+
+
+def sweep(ops_lec, ops_escr, ops_cript, precio_gwei, eth_eur, weights: dict = None) -> SweepResult:
+    """Gas, ETH y € para todas las combinaciones de los parámetros.
+
+    Cada parámetro es un escalar o un vector 1-D; los vectores se colocan en
+    ejes distintos (en el orden de `PARAMS`) y el resultado tiene un eje por
+    cada uno. ``gas`` es una vista difundida sobre esa forma, sin copias.
+    """
+    w = {**WEIGHTS, **(weights or {})}
+    values = dict(zip(PARAMS, (ops_lec, ops_escr, ops_cript, precio_gwei, eth_eur)))
+    swept = [k for k, v in values.items() if np.ndim(v) > 0]
+    grids = {}
+    for k, v in values.items():
+        a = np.asarray(v, dtype=np.float64)
+        if a.ndim > 1:
+            raise ValueError(f"{k}: se esperaba un escalar o un vector 1-D")
+        if a.ndim:
+            shape = [1] * len(swept)
+            shape[swept.index(k)] = -1
+            a = a.reshape(shape)
+        grids[k] = a
+    gas = grids["ops_lec"] * w["lectura"] + grids["ops_escr"] * w["escritura"] + grids["ops_cript"] * w["cripto"]
+    # 1 Gwei = 1e-9 ETH; Coste(ETH) = gas * precio_gwei * 1e-9
+    eth = gas * (grids["precio_gwei"] * 1e-9)
+    eur = eth * grids["eth_eur"]
+    eth = np.broadcast_to(eth, eur.shape)
+    return SweepResult(
+        axes={k: np.asarray(values[k], dtype=np.float64) for k in swept},
+        gas=np.broadcast_to(gas, eur.shape),
+        eth=eth,
+        eur=eur,
+    )
+
+
+# ---------------------------
+# Importación de trazas de opcodes
+# ---------------------------
+@dataclass
+class TraceCounts:
+    ops: dict                       # categoría → nº de pasos
+    gas: dict                       # categoría → gas cargado (``gasCost``)
+    opcodes: Counter
+    bytes: int
+    seconds: float
+
+    @property
+    def pasos(self) -> int:
+        return sum(self.ops.values())
+
+    @property
+    def mb_s(self) -> float:
+        return self.bytes / 1e6 / self.seconds if self.seconds > 0 else 0.0
+
+    def pesos(self) -> dict:
+        """Gas medio por operación de cada categoría del modelo (el didáctico si no hay pasos).
+
+        En geth el ``gasCost`` de una llamada incluye el gas que se cede al
+        destino, así que el peso «cripto» de los precompilados sale por exceso.
+        """
+        return {k: self.gas[k] / self.ops[k] if self.ops[k] else WEIGHTS[k] for k in WEIGHTS}
+
+    def summary(self, top: int = 10) -> dict:
+        return {
+            "pasos": self.pasos,
+            "ops": dict(self.ops),
+            "gas": dict(self.gas),
+            "pesos": {k: round(v, 2) for k, v in self.pesos().items()},
+            "top_opcodes": dict(self.opcodes.most_common(top)),
+            "bytes": self.bytes,
+            "segundos": round(self.seconds, 3),
+            "mb_s": round(self.mb_s, 1),
+        }
+
+
+def _stack_target(buf: bytes, start: int, end: int):
+    """Dirección destino de una llamada: segundo elemento desde la cima (la cima va al final)."""
+    m = _STACK.search(buf, start, end)
+    if m is None:
+        return None
+    close = buf.find(b"]", m.end(), end)
+    if close < 0:
+        return None
+    items = buf[m.end():close].split(b",")
+    if len(items) < 2:
+        return None
+    raw = items[-2].strip().strip(b'"')
+    try:
+        return int(raw, 16) if raw[:2] in (b"0x", b"0X") else int(raw)
+    except ValueError:
+        return None
+
+
+def import_trace(fileobj, chunk_size: int = DEFAULT_CHUNK, total: int = None, on_progress=None,
+                 max_bytes: int = None) -> TraceCounts:
+    """Recuentos por categoría y opcode de una traza abierta en binario.
+
+    `on_progress(bytes_leidos, total)` se llama tras cada bloque (`total` puede ser None).
+    Con `max_bytes`, leer más de esos bytes (ya descomprimidos) lanza ``ValueError``:
+    acota el tiempo ante ``/dev/zero`` o una bomba gzip.
+    """
+    ops = dict.fromkeys(CATEGORIES, 0)
+    gas = dict.fromkeys(CATEGORIES, 0)
+    opcodes = Counter()
+
+    def step(buf: bytes, m, end: int) -> None:
+        name, num = m.group(1), m.group(2)
+        if num is not None:
+            named = _OP_NAME.search(buf, m.end(), end)
+            op = named.group(1).decode() if named else OPCODES.get(int(num), f"0x{int(num):02x}")
+        else:
+            op = name.decode().upper()
+        target = _stack_target(buf, m.end(), end) if op in CALL_OPS else None
+        cat = category(op, target)
+        ops[cat] += 1
+        opcodes[op] += 1
+        cost = _GAS_COST.search(buf, m.end(), end)
+        if cost:
+            raw = cost.group(1)
+            gas[cat] += int(raw, 16) if raw[:2] == b"0x" else int(raw)
+
+    carry = b""
+    done = 0
+    t0 = time.perf_counter()
+    while True:
+        chunk = fileobj.read(chunk_size)
+        if not chunk:
+            break
+        done += len(chunk)
+        if max_bytes is not None and done > max_bytes:
+            raise ValueError(f"La traza supera el límite de {max_bytes:,} bytes")
+        buf = carry + chunk
+        prev = None
+        for m in _OP.finditer(buf):
+            # Un paso termina donde empieza el siguiente; el último queda pendiente
+            if prev is not None:
+                step(buf, prev, m.start())
+            prev = m
+        if prev is None:
+            carry = buf[-_TAIL:]
+        elif len(buf) - prev.start() > _MAX_STEP:
+            step(buf, prev, len(buf))
+            carry = buf[-_TAIL:]
+        else:
+            carry = buf[prev.start():]
+        if on_progress:
+            on_progress(done, total)
+    last = _OP.match(carry)
+    if last:
+        step(carry, last, len(carry))
+    return TraceCounts(ops, gas, opcodes, done, time.perf_counter() - t0)
+
+
+def import_file(path: str, chunk_size: int = DEFAULT_CHUNK, on_progress=None, max_bytes: int = None) -> TraceCounts:
+    """Como `import_trace` sobre un fichero en disco; ``.gz`` se descomprime al vuelo (sin total)."""
+    if path.endswith(".gz"):
+        with gzip.open(path, "rb") as f:
+            return import_trace(f, chunk_size, None, on_progress, max_bytes)
+    with open(path, "rb") as f:
+        return import_trace(f, chunk_size, os.path.getsize(path), on_progress, max_bytes)
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m ud1.gas",
+                                     description="Recuentos de opcodes por categoría de una traza EVM (JSON/JSONL, .gz)")
+    parser.add_argument("traza")
+    parser.add_argument("--top", type=int, default=10, help="opcodes más frecuentes a mostrar")
+    parser.add_argument("--chunk", type=int, default=DEFAULT_CHUNK, help="bytes por lectura")
+    args = parser.parse_args(argv)
+    print(json.dumps(import_file(args.traza, args.chunk).summary(args.top), ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""Benchmark de los proveedores de hash: MB/s y ops/s por algoritmo, tamaño e hilos.
+
+``hashlib`` libera el GIL con mensajes de más de 2 KiB y ``pycryptodome`` en cada
+llamada nativa, así que con mensajes grandes los hilos escalan y con mensajes
+cortos manda el coste por llamada. Los resultados se guardan por huella de
+máquina (como la calibración del PoW) y `fastest` elige, entre los algoritmos
+aceptables, el de más throughput para un tamaño de mensaje y nº de hilos.
+
+    python -m ud1.hash_bench --sizes 64 1024 1048576 --threads 1 4
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from ud1.hashes import DEFAULT_ALGORITHM, available, get_provider
+from ud1.hashrate import CACHE_DIR, machine_fingerprint, machine_info
+
+DEFAULT_SIZES = (64, 1024, 65536, 1024 * 1024)
+# Todos ofrecen ≥ 128 bits de resistencia a colisiones; Keccak-256 queda fuera por
+# no ser un estándar NIST (se usa sólo para comparar con Ethereum)
+ACCEPTABLE = ("sha256", "sha512", "sha3_256", "blake2b", "blake2s",
+              "pycryptodome-sha256", "pycryptodome-sha512", "pycryptodome-sha3_256",
+              "pycryptodome-blake2b", "pycryptodome-blake2s")
+
+
+def _cache_path(fingerprint: str) -> str:
+    return os.path.join(CACHE_DIR, f"hashes_{fingerprint}.json")
+
+
+def _ops(new, data: bytes, deadline: float) -> int:
+    ops = 0
+    while True:
+        for _ in range(16):
+            new(data).digest()
+        ops += 16
+        if time.perf_counter() >= deadline:
+            return ops
+
+
+def measure(algorithm: str, size: int, threads: int = 1, seconds: float = 0.2) -> dict:
+    """Throughput de `algorithm` con mensajes de `size` bytes en `threads` hilos durante ~`seconds`."""
+    new = get_provider(algorithm).new
+    data = os.urandom(size)
+    new(data).digest()  # calentamiento
+    t0 = time.perf_counter()
+    deadline = t0 + seconds
+    if threads == 1:
+        ops = _ops(new, data, deadline)
+    else:
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            ops = sum(pool.map(lambda _: _ops(new, data, deadline), range(threads)))
+    elapsed = time.perf_counter() - t0
+    return {
+        "algoritmo": algorithm,
+        "size": size,
+        "threads": threads,
+        "ops_s": ops / elapsed,
+        "mb_s": ops * size / elapsed / 1e6,
+    }
+
+
+def run_benchmark(algorithms=None, sizes=DEFAULT_SIZES, threads=(1,), seconds: float = 0.2, on_step=None) -> dict:
+    algorithms = list(algorithms or available())
+    info = machine_info()
+    rows = []
+    for alg in algorithms:
+        for size in sizes:
+            for t in threads:
+                row = measure(alg, size, t, seconds)
+                rows.append(row)
+                if on_step:
+                    on_step(f"{alg} · {size} B · {t} hilo(s): {row['mb_s']:,.0f} MB/s")
+    return {
+        "fingerprint": machine_fingerprint(info),
+        "machine": info,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "rows": rows,
+    }
+
+
+def save_results(results: dict) -> str:
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    path = _cache_path(results["fingerprint"])
+    # Temporal único: dos sesiones que guardan a la vez no se pisan
+    fd, tmp = tempfile.mkstemp(dir=CACHE_DIR, prefix=".bench-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        os.replace(tmp, path)
+    except BaseException:
+        os.remove(tmp)
+        raise
+    return path
+
+
+def load_results(fingerprint: str = None):
+    """Resultados guardados para esta máquina, o None si no existen o están corruptos."""
+    try:
+        with open(_cache_path(fingerprint or machine_fingerprint()), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def get_results(refresh: bool = False, **kwargs) -> dict:
+    results = None if refresh else load_results()
+    if results is None:
+        results = run_benchmark(**kwargs)
+        save_results(results)
+    return results
+
+
+def fastest(results: dict, size: int = 64, threads: int = 1, acceptable=ACCEPTABLE) -> str:
+    """Algoritmo aceptable y disponible con más MB/s en el tamaño y nº de hilos medidos más cercanos."""
+    rows = [r for r in results["rows"] if r["algoritmo"] in acceptable and r["algoritmo"] in available()]
+    if not rows:
+        return DEFAULT_ALGORITHM
+    near_size = min({r["size"] for r in rows}, key=lambda s: abs(s - size))
+    near_threads = min({r["threads"] for r in rows}, key=lambda t: abs(t - threads))
+    rows = [r for r in rows if r["size"] == near_size and r["threads"] == near_threads]
+    return max(rows, key=lambda r: r["mb_s"])["algoritmo"]
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m ud1.hash_bench", description="Benchmark de algoritmos de hash")
+    parser.add_argument("--algorithms", nargs="*", default=None, help=f"por defecto: {' '.join(available())}")
+    parser.add_argument("--sizes", nargs="*", type=int, default=list(DEFAULT_SIZES))
+    parser.add_argument("--threads", nargs="*", type=int, default=[1, os.cpu_count() or 1])
+    parser.add_argument("--seconds", type=float, default=0.2)
+    parser.add_argument("--save", action="store_true", help="guarda los resultados en la caché de la máquina")
+    args = parser.parse_args(argv)
+
+    results = run_benchmark(args.algorithms, args.sizes, sorted(set(args.threads)), args.seconds)
+    if args.save:
+        save_results(results)
+    print(f"{'algoritmo':24} {'bytes':>9} {'hilos':>5} {'ops/s':>12} {'MB/s':>9}")
+    for r in results["rows"]:
+        print(f"{r['algoritmo']:24} {r['size']:>9} {r['threads']:>5} {r['ops_s']:>12,.0f} {r['mb_s']:>9,.0f}")
+    for size in args.sizes:
+        print(f"más rápido ({size} B): {fastest(results, size, max(args.threads))}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Proveedores de hash intercambiables.
+
+Cada `HashProvider` expone el mismo interfaz mínimo (``new(data)`` que devuelve
+un objeto con ``update``/``digest``/``hexdigest``) sobre ``hashlib`` o, si está
+instalado, ``pycryptodome``. La cadena, el ledger y el PoW reciben el nombre del
+algoritmo (``"sha256"`` por defecto) y lo resuelven aquí; un nombre es
+serializable, así que también viaja a los procesos del pool.
+"""
+import hashlib
+import threading
+
+DEFAULT_ALGORITHM = "sha256"
+
+
+class HashProvider:
+    """Algoritmo de hash con un interfaz común (clase simple: importar `dataclasses` encarece la CLI)."""
+
+    __slots__ = ("name", "digest_size", "new", "source", "copyable")
+
+    def __init__(self, name: str, digest_size: int, new, source: str = "hashlib", copyable: bool = True):
+        self.name = name
+        self.digest_size = digest_size
+        self.new = new              # new(data=b"") -> objeto hash
+        self.source = source
+        self.copyable = copyable    # el objeto admite copy() (reutilizar un prefijo ya absorbido)
+
+    def __repr__(self) -> str:
+        return f"HashProvider({self.name!r}, {self.digest_size}, source={self.source!r})"
+
+    def digest(self, data: bytes) -> bytes:
+        return self.new(data).digest()
+
+    def hexdigest(self, data: bytes) -> str:
+        return self.new(data).hexdigest()
+
+    def hex_text(self, text: str) -> str:
+        return self.new(text.encode("utf-8")).hexdigest()
+
+
+PROVIDERS = {}
+
+
+def register(provider: HashProvider) -> HashProvider:
+    PROVIDERS[provider.name] = provider
+    return provider
+
+
+def get_provider(name: str = DEFAULT_ALGORITHM) -> HashProvider:
+    try:
+        return PROVIDERS[name]
+    except KeyError:
+        pass
+    _load_optional()
+    try:
+        return PROVIDERS[name]
+    except KeyError:
+        raise ValueError(f"Algoritmo de hash desconocido: {name}. Disponibles: {', '.join(PROVIDERS)}") from None
+
+
+def available(source: str = None) -> list:
+    """Nombres registrados (opcionalmente sólo los de `source`)."""
+    _load_optional()
+    return [n for n, p in PROVIDERS.items() if source is None or p.source == source]
+
+
+for _name in ("sha256", "sha512", "sha3_256", "blake2b", "blake2s"):
+    register(HashProvider(_name, hashlib.new(_name).digest_size, getattr(hashlib, _name)))
+
+_optional_loaded = False
+_optional_lock = threading.Lock()
+
+
+def _load_optional() -> None:
+    """Registra los proveedores de pycryptodome la primera vez que se piden (importarlo cuesta ~20 ms).
+
+    La marca se pone sólo cuando ya están registrados: otro hilo que la vea activa
+    encuentra los proveedores en `PROVIDERS`, y los que llegan mientras tanto esperan al cerrojo.
+    """
+    global _optional_loaded
+    if _optional_loaded:
+        return
+    with _optional_lock:
+        if not _optional_loaded:
+            _register_optional()
+            _optional_loaded = True
+
+
+def _register_optional() -> None:
+    try:
+        from Crypto.Hash import BLAKE2b, BLAKE2s, SHA3_256, SHA256, SHA512, keccak
+    except ImportError:  # pycryptodome es opcional: sólo añade proveedores
+        return
+    register(HashProvider("pycryptodome-sha256", 32, SHA256.new, "pycryptodome"))
+    register(HashProvider("pycryptodome-sha512", 64, SHA512.new, "pycryptodome"))
+    register(HashProvider("pycryptodome-sha3_256", 32, lambda data=b"": SHA3_256.new(data), "pycryptodome"))
+    register(HashProvider("pycryptodome-blake2b", 64, lambda data=b"": BLAKE2b.new(data=data, digest_bits=512),
+                          "pycryptodome", copyable=False))
+    register(HashProvider("pycryptodome-blake2s", 32, lambda data=b"": BLAKE2s.new(data=data, digest_bits=256),
+                          "pycryptodome", copyable=False))
+    # Keccak-256 (el hash de Ethereum): no es SHA3-256, difiere en el relleno
+    register(HashProvider("keccak256", 32, lambda data=b"": keccak.new(data=data, digest_bits=256),
+                          "pycryptodome", copyable=False))
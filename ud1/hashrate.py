@@ -0,0 +1,166 @@
+"""Benchmark de throughput de hash del equipo y proyección de tiempo/energía del PoW.
+
+Los resultados se guardan en disco por huella de máquina (CPU, núcleos, Python,
+OpenSSL) y algoritmo para no repetir la medición en cada sesión.
+"""
+import hashlib
+import json
+import os
+import platform
+import ssl
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+
+from ud1.hashes import DEFAULT_ALGORITHM, get_provider
+from ud1.pow import scan_range
+
+DEFAULT_SIZES = (64, 1024, 16384)
+CACHE_DIR = os.environ.get("UD1_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "ud1"))
+_NEVER = b"\x00" * 32  # umbral inalcanzable: obliga a recorrer el rango completo
+
+
+def machine_info() -> dict:
+    return {
+        "machine": platform.machine(),
+        "processor": platform.processor() or platform.machine(),
+        "system": platform.system(),
+        "cpu_count": os.cpu_count() or 1,
+        "python": platform.python_version(),
+        "openssl": ssl.OPENSSL_VERSION,
+    }
+
+
+def machine_fingerprint(info: dict = None) -> str:
+    info = info or machine_info()
+    raw = json.dumps(info, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(raw).hexdigest()[:16]
+
+
+def _cache_path(fingerprint: str, algorithm: str = DEFAULT_ALGORITHM) -> str:
+    suffix = "" if algorithm == DEFAULT_ALGORITHM else f"_{algorithm}"
+    return os.path.join(CACHE_DIR, f"hashrate_{fingerprint}{suffix}.json")
+
+
+def _time_digests(size: int, seconds: float, algorithm: str = DEFAULT_ALGORITHM) -> float:
+    """Operaciones de hash por segundo sobre mensajes de `size` bytes durante ~`seconds`."""
+    data = os.urandom(size)
+    sha = get_provider(algorithm).new
+    ops, t0 = 0, time.perf_counter()
+    deadline = t0 + seconds
+    while True:
+        for _ in range(256):
+            sha(data).digest()
+        ops += 256
+        now = time.perf_counter()
+        if now >= deadline:
+            return ops / (now - t0)
+
+
+def _nonces_for(seconds: float, algorithm: str = DEFAULT_ALGORITHM) -> int:
+    """Estima cuántos nonces recorre un proceso en `seconds` (sonda corta)."""
+    t0 = time.perf_counter()
+    scan_range(b"probe", 0, 20_000, _NEVER, algorithm)
+    rate = 20_000 / max(time.perf_counter() - t0, 1e-6)
+    return max(20_000, int(rate * seconds))
+
+
+def _pool_rate(pool: ProcessPoolExecutor, workers: int, count: int, algorithm: str = DEFAULT_ALGORITHM) -> float:
+    t0 = time.perf_counter()
+    futs = [pool.submit(scan_range, b"UD1|bench|", i * count, count, _NEVER, algorithm) for i in range(workers)]
+    total = sum(f.result()[1] for f in futs)
+    return total / (time.perf_counter() - t0)
+
+
+def run_benchmark(max_workers: int = None, sizes=DEFAULT_SIZES, seconds: float = 0.5, on_step=None,
+                  algorithm: str = DEFAULT_ALGORITHM) -> dict:
+    """Mide throughput por tamaño de mensaje y hashrate de minado con 1..N procesos.
+
+    «cold» incluye el arranque del pool y la primera pasada; «warm» repite la
+    medición sobre el mismo pool ya caliente.
+    """
+    max_workers = max(1, max_workers or os.cpu_count() or 1)
+    info = machine_info()
+    sizes_out = []
+    for size in sizes:
+        cold = _time_digests(size, seconds / 4, algorithm)
+        warm = _time_digests(size, seconds, algorithm)
+        sizes_out.append({"size": size, "cold_ops": cold, "warm_ops": warm, "warm_mb_s": warm * size / 1e6})
+        if on_step:
+            on_step(f"{size} B: {warm:,.0f} ops/s")
+
+    count = _nonces_for(seconds, algorithm)
+    workers_out = []
+    for w in range(1, max_workers + 1):
+        with ProcessPoolExecutor(max_workers=w) as pool:
+            cold = _pool_rate(pool, w, count, algorithm)
+            warm = _pool_rate(pool, w, count, algorithm)
+        workers_out.append({"workers": w, "cold_hs": cold, "warm_hs": warm})
+        if on_step:
+            on_step(f"{w} proceso(s): {warm/1e6:.2f} MH/s")
+
+    return {
+        "fingerprint": machine_fingerprint(info),
+        "machine": info,
+        "algorithm": algorithm,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "sizes": sizes_out,
+        "workers": workers_out,
+    }
+
+
+def save_calibration(calib: dict) -> str:
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    path = _cache_path(calib["fingerprint"], calib.get("algorithm", DEFAULT_ALGORITHM))
+    # Temporal único: dos sesiones que guardan a la vez no se pisan
+    fd, tmp = tempfile.mkstemp(dir=CACHE_DIR, prefix=".calib-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(calib, f, indent=2)
+        os.replace(tmp, path)
+    except BaseException:
+        os.remove(tmp)
+        raise
+    return path
+
+
+def load_calibration(fingerprint: str = None, algorithm: str = DEFAULT_ALGORITHM):
+    """Calibración guardada para esta máquina y algoritmo, o None si no existe o está corrupta."""
+    path = _cache_path(fingerprint or machine_fingerprint(), algorithm)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def get_calibration(refresh: bool = False, algorithm: str = DEFAULT_ALGORITHM, **kwargs) -> dict:
+    calib = None if refresh else load_calibration(algorithm=algorithm)
+    if calib is None:
+        calib = run_benchmark(algorithm=algorithm, **kwargs)
+        save_calibration(calib)
+    return calib
+
+
+def hashrate_for(calib: dict, workers: int) -> float:
+    """Hashrate sostenido (warm) para `workers` procesos; extrapola linealmente si no se midió."""
+    rows = sorted(calib["workers"], key=lambda r: r["workers"])
+    best = rows[0]
+    for r in rows:
+        if r["workers"] <= workers:
+            best = r
+    return best["warm_hs"] * workers / best["workers"] if workers > best["workers"] else best["warm_hs"]
+
+
+def project(difficulty: int, hashrate: float, potencia_w: float) -> dict:
+    """Tiempo esperado y energía para una dificultad (ceros hex) dado un hashrate y una potencia."""
+    hashes = 16.0 ** difficulty
+    seconds = hashes / hashrate if hashrate > 0 else float("inf")
+    kwh = potencia_w * seconds / 3.6e6
+    return {
+        "hashes": hashes,
+        "seconds": seconds,
+        "kwh": kwh,
+        "kwh_por_mhash": kwh / (hashes / 1e6),
+    }
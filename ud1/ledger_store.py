@@ -0,0 +1,413 @@
+"""Ledger persistente, sólo-append, en ficheros de segmento.
+
+Estructura del directorio::
+
+    seg_000000.jsonl ...   registros (una línea JSON por asiento), rotan por tamaño
+    offsets.bin            por asiento: (segmento u32, offset u64, longitud u32), 16 bytes
+    index.sqlite           índice hash → nº de asiento
+    checkpoints.jsonl      checkpoints firmados de la cadena (cada `checkpoint_every`)
+    lotes.jsonl            metadatos de los lotes de Merkle sellados (``desde``: su primer asiento)
+    meta.json              algoritmo de la cadena (fijado al crear el ledger)
+
+Añadir es O(1): se escribe la línea y su entrada de ``offsets.bin`` queda en
+memoria hasta que el segmento está en disco (``fsync``), así que un offset nunca
+apunta a datos que no existen; los ``fsync`` se agrupan (cada `sync_every`
+asientos o `sync_interval` segundos). Abrir el ledger no lee los registros: el
+número de asientos sale del tamaño de ``offsets.bin`` (descontando las entradas
+finales que no se pueden leer tras una caída) y cualquier asiento se lee con un
+``pread``. Los checkpoints y lotes de los asientos descartados en la recuperación
+se eliminan reescribiendo su fichero de forma atómica.
+"""
+import json
+import os
+import sqlite3
+import struct
+import threading
+import time
+
+from ud1.chain import GENESIS_PREV, Checkpoint, link_hash, sign_checkpoint
+from ud1.hashes import DEFAULT_ALGORITHM, get_provider
+from ud1.signer import DEFAULT_KEY
+
+try:
+    import fcntl
+except ImportError:  # Windows: sin bloqueo entre procesos
+    fcntl = None
+
+_OFF = struct.Struct("<IQI")
+CHAIN_FIELD = "hash_cadena"
+
+
+def record_content(record: dict) -> str:
+    """Forma canónica de un asiento (sin su hash de cadena) que se encadena."""
+    body = {k: v for k, v in record.items() if k != CHAIN_FIELD}
+    return json.dumps(body, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+
+
+class LedgerStore:
+    def __init__(
+        self,
+        path: str,
+        segment_bytes: int = 64 * 1024 * 1024,
+        sync_every: int = 64,
+        sync_interval: float = 0.5,
+        checkpoint_every: int = 0,
+        key: str = DEFAULT_KEY,
+        readonly: bool = False,
+        algorithm: str = None,
+    ):
+        self.path = path
+        self.segment_bytes = segment_bytes
+        self.sync_every = sync_every
+        self.sync_interval = sync_interval
+        self.checkpoint_every = checkpoint_every
+        self.readonly = readonly
+        self._key = key
+        self._lock = threading.RLock()
+        self._read_fds = {}
+        self._dirty = 0
+        self._last_sync = time.monotonic()
+        self._pending_index = []
+        self._pending_offsets = bytearray()   # entradas de offsets.bin cuyo segmento aún no tiene fsync
+
+        os.makedirs(path, exist_ok=True)
+        if not readonly:
+            self._lock_f = open(os.path.join(path, "LOCK"), "a")
+            if fcntl is not None:
+                try:
+                    fcntl.flock(self._lock_f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except OSError:
+                    self._lock_f.close()
+                    raise RuntimeError(f"El ledger {path} ya está abierto para escritura por otro proceso.")
+        self.algorithm = self._load_algorithm(algorithm)
+        off_path = os.path.join(path, "offsets.bin")
+        self._off_f = open(off_path, "rb" if readonly and os.path.exists(off_path) else "a+b")
+        self._recover()
+        self._db = sqlite3.connect(os.path.join(path, "index.sqlite"), check_same_thread=False)
+        self._db.execute("CREATE TABLE IF NOT EXISTS idx (hash TEXT NOT NULL, seq INTEGER PRIMARY KEY)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_hash ON idx(hash)")
+        # Tras una cola descartada, los checkpoints y lotes de esos asientos contradirían a los nuevos
+        cps = self._prune_jsonl("checkpoints.jsonl", lambda d: d["index"] < self._count)
+        self._checkpoints = [Checkpoint(**d) for d in cps]
+        self._prune_jsonl("lotes.jsonl", lambda d: d.get("desde", -1) < self._count)
+        if not readonly:
+            self._reindex()
+            self._cp_f = open(os.path.join(path, "checkpoints.jsonl"), "a", encoding="utf-8")
+            self._lotes_f = open(os.path.join(path, "lotes.jsonl"), "a", encoding="utf-8")
+        self._n_batches = len(self.batches())
+
+    # ---------------------------
+    # Apertura y recuperación
+    # ---------------------------
+    def _seg_path(self, seg: int) -> str:
+        return os.path.join(self.path, f"seg_{seg:06d}.jsonl")
+
+    def _readable(self, seq: int):
+        """El asiento `seq` si su offset apunta a una línea completa y legible; si no, None."""
+        seg, off, length = self._location(seq)
+        try:
+            if off + length > os.path.getsize(self._seg_path(seg)):
+                return None
+            return self._read_at(seg, off, length)
+        except (OSError, ValueError):
+            return None
+
+    def _recover(self) -> None:
+        """Descarta escrituras a medias tras una caída (offsets incompletos o por delante de los datos, colas de segmento)."""
+        size = os.fstat(self._off_f.fileno()).st_size
+        count = size // _OFF.size
+        # Desde el final, se descartan los offsets cuyo asiento no está (entero) en el segmento
+        last = None
+        while count and (last := self._readable(count - 1)) is None:
+            count -= 1
+        self._count = count
+        if not self.readonly and size != count * _OFF.size:
+            self._off_f.truncate(count * _OFF.size)
+        for fd in self._read_fds.values():
+            os.close(fd)
+        self._read_fds.clear()
+        self._head = GENESIS_PREV
+        if count:
+            seg, off, length = self._location(count - 1)
+            self._head = last.get(CHAIN_FIELD, GENESIS_PREV)
+            self._seg, self._seg_pos = seg, off + length
+        else:
+            self._seg, self._seg_pos = 0, 0
+        if self.readonly:
+            return
+        with open(self._seg_path(self._seg), "a+b") as f:
+            f.truncate(self._seg_pos)
+        nxt = self._seg + 1
+        while os.path.exists(self._seg_path(nxt)):
+            os.remove(self._seg_path(nxt))
+            nxt += 1
+        self._seg_f = open(self._seg_path(self._seg), "ab")
+
+    def _load_algorithm(self, requested) -> str:
+        """El algoritmo de un ledger existente es fijo; los ledgers sin meta.json son SHA-256."""
+        meta_path = os.path.join(self.path, "meta.json")
+        stored = None
+        if os.path.exists(meta_path):
+            with open(meta_path, "r", encoding="utf-8") as f:
+                stored = json.load(f).get("algoritmo")
+        elif os.path.exists(os.path.join(self.path, "offsets.bin")):
+            stored = DEFAULT_ALGORITHM
+        if stored is not None:
+            if requested is not None and requested != stored:
+                raise ValueError(f"El ledger {self.path} usa {stored}, no {requested}.")
+            return stored
+        algorithm = get_provider(requested or DEFAULT_ALGORITHM).name
+        if not self.readonly:
+            tmp = meta_path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"algoritmo": algorithm}, f)
+            os.replace(tmp, meta_path)
+        return algorithm
+
+    def _reindex(self) -> None:
+        row = self._db.execute("SELECT MAX(seq) FROM idx").fetchone()
+        start = (row[0] + 1) if row[0] is not None else 0
+        self._db.execute("DELETE FROM idx WHERE seq >= ?", (self._count,))
+        if start < self._count:
+            self._db.executemany(
+                "INSERT INTO idx(hash, seq) VALUES (?, ?)",
+                ((r.get("hash", ""), i) for i, r in zip(range(start, self._count), self.iter_range(start))),
+            )
+        self._db.commit()
+
+    def _load_jsonl(self, name: str, build):
+        p = os.path.join(self.path, name)
+        if not os.path.exists(p):
+            return []
+        out = []
+        with open(p, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    out.append(build(json.loads(line)))
+                except ValueError:
+                    break  # línea final a medio escribir
+        return out
+
+    def _prune_jsonl(self, name: str, keep) -> list:
+        """Entradas de `name` que cumplen `keep`; si sobra alguna (o una línea a medias), reescribe el fichero."""
+        p = os.path.join(self.path, name)
+        if not os.path.exists(p):
+            return []
+        with open(p, "r", encoding="utf-8") as f:
+            lines = f.read().splitlines()
+        kept = []
+        for line in lines:
+            try:
+                d = json.loads(line)
+            except ValueError:
+                break  # línea final a medio escribir
+            if keep(d):
+                kept.append(d)
+        if not self.readonly and len(kept) != len(lines):
+            tmp = p + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.writelines(json.dumps(d, ensure_ascii=False) + "\n" for d in kept)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, p)
+        return kept
+
+    # ---------------------------
+    # Escritura
+    # ---------------------------
+    def append(self, record: dict) -> int:
+        """Añade un asiento (se le añade `hash_cadena`). Devuelve su número (0-based)."""
+        if self.readonly:
+            raise RuntimeError("Ledger abierto en sólo lectura.")
+        with self._lock:
+            rec = dict(record)
+            rec[CHAIN_FIELD] = link_hash(record_content(rec), self._head, self.algorithm)
+            line = json.dumps(rec, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n"
+            if self._seg_pos and self._seg_pos + len(line) > self.segment_bytes:
+                self._rotate()
+            self._seg_f.write(line)
+            self._pending_offsets += _OFF.pack(self._seg, self._seg_pos, len(line))
+            self._seg_pos += len(line)
+            seq = self._count
+            self._count += 1
+            self._head = rec[CHAIN_FIELD]
+            self._pending_index.append((rec.get("hash", ""), seq))
+            every = self.checkpoint_every
+            if every and (seq + 1) % every == 0:
+                cp = Checkpoint(seq, self._head, sign_checkpoint(seq, self._head, self._key))
+                self._checkpoints.append(cp)
+                self._cp_f.write(json.dumps(cp.__dict__) + "\n")
+            self._dirty += 1
+            if self._dirty >= self.sync_every or time.monotonic() - self._last_sync >= self.sync_interval:
+                self.sync()
+            return seq
+
+    def _rotate(self) -> None:
+        self.sync()
+        self._seg_f.close()
+        self._seg += 1
+        self._seg_pos = 0
+        self._seg_f = open(self._seg_path(self._seg), "ab")
+
+    def _write_offsets(self) -> None:
+        """Publica los offsets pendientes; su segmento tiene que estar ya en disco."""
+        if self._pending_offsets:
+            self._off_f.write(self._pending_offsets)
+            self._pending_offsets = bytearray()
+        self._off_f.flush()
+
+    def _flush(self) -> None:
+        """Deja visibles para ``pread`` los asientos aún no sincronizados (segmento con fsync y luego offsets)."""
+        if not self.readonly and self._pending_offsets:
+            with self._lock:
+                self._seg_f.flush()
+                os.fsync(self._seg_f.fileno())
+                self._write_offsets()
+
+    def sync(self) -> None:
+        """Commit de grupo: datos antes que offsets, y ambos a disco con fsync."""
+        if self.readonly:
+            return
+        with self._lock:
+            self._seg_f.flush()
+            os.fsync(self._seg_f.fileno())
+            self._write_offsets()
+            os.fsync(self._off_f.fileno())
+            self._cp_f.flush()
+            if self._pending_index:
+                self._db.executemany("INSERT OR REPLACE INTO idx(hash, seq) VALUES (?, ?)", self._pending_index)
+                self._db.commit()
+                self._pending_index = []
+            self._dirty = 0
+            self._last_sync = time.monotonic()
+
+    def append_batch(self, meta: dict) -> int:
+        """Guarda los metadatos de un lote de Merkle (raíz, timestamp, firma...) y devuelve su número.
+
+        El número (``lote``, desde 1) se asigna aquí, bajo el cerrojo: dos sesiones
+        que sellan a la vez reciben números distintos. ``desde`` guarda el primer
+        asiento del lote (sus registros se añaden después): si una caída los pierde,
+        la recuperación descarta el lote.
+        """
+        if self.readonly:
+            raise RuntimeError("Ledger abierto en sólo lectura.")
+        with self._lock:
+            number = self._n_batches + 1
+            meta = {"lote": number, **{k: v for k, v in meta.items() if k not in ("lote", "desde")},
+                    "desde": self._count}
+            self._lotes_f.write(json.dumps(meta, ensure_ascii=False) + "\n")
+            self._lotes_f.flush()
+            os.fsync(self._lotes_f.fileno())
+            self._n_batches = number
+            return number
+
+    def close(self) -> None:
+        if not self.readonly:
+            self.sync()
+            for f in (self._seg_f, self._cp_f, self._lotes_f, self._lock_f):
+                f.close()
+        self._off_f.close()
+        for fd in self._read_fds.values():
+            os.close(fd)
+        self._read_fds.clear()
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ---------------------------
+    # Lectura
+    # ---------------------------
+    def refresh(self) -> int:
+        """Relee el nº de asientos desde disco (lectores que siguen a otro proceso escritor)."""
+        if self.readonly:
+            self._count = os.fstat(self._off_f.fileno()).st_size // _OFF.size
+        return self._count
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def head(self) -> str:
+        return self._head
+
+    def _location(self, seq: int):
+        return _OFF.unpack(os.pread(self._off_f.fileno(), _OFF.size, seq * _OFF.size))
+
+    def _read_at(self, seg: int, off: int, length: int) -> dict:
+        fd = self._read_fds.get(seg)
+        if fd is None:
+            fd = self._read_fds[seg] = os.open(self._seg_path(seg), os.O_RDONLY)
+        return json.loads(os.pread(fd, length, off))
+
+    def __getitem__(self, seq: int) -> dict:
+        seq = range(self._count)[seq]
+        self._flush()
+        return self._read_at(*self._location(seq))
+
+    def hash_at(self, seq: int) -> str:
+        return self[seq][CHAIN_FIELD]
+
+    def iter_links(self, start: int, stop: int):
+        """Pares (contenido canónico, hash de cadena guardado) en [start, stop), para `locate_tamper`."""
+        for rec in self.iter_range(start, stop):
+            yield record_content(rec), rec.get(CHAIN_FIELD)
+
+    def iter_range(self, start: int = 0, stop: int = None):
+        """Itera asientos en orden leyendo los offsets por bloques (streaming)."""
+        self._flush()
+        stop = self._count if stop is None else min(stop, self._count)
+        block = 4096
+        fd = self._off_f.fileno()
+        for base in range(max(start, 0), stop, block):
+            n = min(block, stop - base)
+            raw = os.pread(fd, n * _OFF.size, base * _OFF.size)
+            for seg, off, length in _OFF.iter_unpack(raw):
+                yield self._read_at(seg, off, length)
+
+    def __iter__(self):
+        return self.iter_range()
+
+    def page(self, start: int, size: int) -> list:
+        return list(self.iter_range(start, start + size))
+
+    def tail(self, from_seq: int):
+        """Asientos nuevos desde `from_seq` (tras `refresh`). Devuelve (asientos, siguiente seq)."""
+        n = self.refresh()
+        return list(self.iter_range(from_seq, n)), n
+
+    def find(self, hash_value: str) -> list:
+        """Números de asiento registrados con ese hash de documento (índice SQLite)."""
+        if self._pending_index:
+            self.sync()
+        rows = self._db.execute("SELECT seq FROM idx WHERE hash = ? ORDER BY seq", (hash_value,)).fetchall()
+        return [r[0] for r in rows if r[0] < self._count]
+
+    @property
+    def checkpoints(self) -> list:
+        return list(self._checkpoints)
+
+    def batches(self) -> list:
+        return self._load_jsonl("lotes.jsonl", lambda d: d)
+
+    def with_batch_roots(self, records):
+        """Completa raíz y firma de los asientos sellados en un lote local, para que un CSV exportado sea verificable."""
+        lotes = {b.get("lote"): b for b in self.batches()}
+        for rec in records:
+            if rec.get("prueba_merkle") is not None and not rec.get("raiz_merkle"):
+                meta = lotes.get(rec.get("lote"))
+                if meta is not None:
+                    rec = {**rec, "raiz_merkle": meta["raiz_merkle"], "pseudo_firma": meta["pseudo_firma"]}
+            yield rec
+
+    def verify_chain(self):
+        """Recorre el ledger recalculando `hash_cadena`. Devuelve el primer asiento roto o None."""
+        prev = GENESIS_PREV
+        for i, rec in enumerate(self):
+            prev = link_hash(record_content(rec), prev, self.algorithm)
+            if rec.get(CHAIN_FIELD) != prev:
+                return i
+        return None
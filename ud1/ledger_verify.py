@@ -0,0 +1,209 @@
+"""Verificación masiva de ledgers CSV exportados (``ledger_ud1.csv``).
+
+El CSV se lee en streaming por bloques de filas y cada bloque se verifica en un
+pool de procesos: ``sha256(texto) == hash``, timestamp ISO 8601 válido y
+pseudo-firma HMAC (o prueba de Merkle + firma de la raíz en los tokens por lote;
+una prueba sin raíz firmada no es verificable y cuenta como incidencia). Los
+registros de un fichero sellado no guardan su contenido: se recalcula su hash
+desde la carpeta `files_dir` (``--ficheros``) y, si no se indica o el fichero
+no está, la fila cuenta como incidencia «no verificable».
+La memoria queda acotada por ``chunk_size × 2 × workers`` filas, no por el
+tamaño del fichero.
+
+    python -m ud1.ledger_verify ledger_ud1.csv --workers 4
+    python -m ud1.ledger_verify ledger_ud1.csv --ficheros escrituras/
+"""
+import argparse
+import csv
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from datetime import datetime
+from itertools import islice
+
+from ud1.merkle import proof_from_str, verify_proof
+from ud1.signer import DEFAULT_KEY, get_signer
+from ud1.stream_hash import hash_file
+
+REQUIRED = ("texto", "hash", "timestamp")
+_FIELDS = ("texto", "hash", "timestamp", "pseudo_firma", "prueba_merkle", "raiz_merkle", "fichero")
+DEFAULT_CHUNK = 20_000
+MAX_ISSUES = 1_000
+
+csv.field_size_limit(min(sys.maxsize, 2**31 - 1))
+
+
+@dataclass
+class LedgerReport:
+    filas: int = 0
+    correctas: int = 0
+    errores: int = 0
+    incidencias: list = field(default_factory=list)  # [{"fila","hash","motivo"}], hasta MAX_ISSUES
+    segundos: float = 0.0
+
+    @property
+    def filas_por_s(self) -> float:
+        return self.filas / self.segundos if self.segundos else 0.0
+
+
+def _check_file(fichero: str, h: str, files_dir: str) -> list:
+    """El hash de un fichero sellado sólo se acredita recalculándolo desde sus bytes."""
+    path = os.path.join(files_dir, os.path.basename(fichero)) if files_dir else None
+    if path is None or not os.path.isfile(path):
+        return ["no verificable: fichero sellado sin su contenido"]
+    if hash_file(path).hexdigest != h:
+        return ["hash no coincide con el fichero"]
+    return []
+
+
+def _check_row(row, signer, files_dir: str = None) -> list:
+    texto, h, ts, firma, prueba, raiz, fichero = row
+    if fichero:
+        # Sin su contenido en el ledger, firma y timestamp no bastan: cualquiera puede
+        # cambiar el texto de una fila y ponerle un nombre de fichero
+        motivos = _check_file(fichero, h, files_dir)
+        if texto:
+            motivos.append("registro de fichero con texto")
+    elif hashlib.sha256(texto.encode("utf-8")).hexdigest() != h:
+        motivos = ["hash no coincide con el texto"]
+    else:
+        motivos = []
+    try:
+        datetime.fromisoformat(ts)
+    except ValueError:
+        motivos.append("timestamp mal formado")
+    if raiz:
+        # Token por lote: la firma cubre la raíz de Merkle, no el registro. Sin firma, la raíz
+        # (p. ej. la hoja del propio hash con una prueba vacía) no acredita nada.
+        if not verify_proof(h, proof_from_str(prueba), raiz):
+            motivos.append("prueba de Merkle no válida")
+        if not firma:
+            motivos.append("falta la pseudo-firma de la raíz")
+        elif not signer.verify(raiz, ts, firma):
+            motivos.append("pseudo-firma de la raíz no válida")
+    elif prueba:
+        motivos.append("no verificable: prueba de Merkle sin raíz firmada")
+    elif not signer.verify(h, ts, firma):
+        motivos.append("pseudo-firma no válida")
+    return motivos
+
+
+def verify_rows(first_row: int, rows, key: str = DEFAULT_KEY, files_dir: str = None):
+    """Verifica un bloque de filas (tuplas en el orden de `_FIELDS`). Devuelve (n, incidencias)."""
+    signer = get_signer(key)
+    issues = []
+    for i, row in enumerate(rows):
+        try:
+            motivos = _check_row(row, signer, files_dir)
+        except (ValueError, TypeError):
+            motivos = ["fila mal formada"]
+        if motivos:
+            issues.append({"fila": first_row + i, "hash": row[1], "motivo": "; ".join(motivos)})
+    return len(rows), issues
+
+
+def _row_tuples(reader):
+    for row in reader:
+        yield tuple((row.get(f) or "") for f in _FIELDS)
+
+
+def verify_csv(
+    source,
+    workers: int = None,
+    chunk_size: int = DEFAULT_CHUNK,
+    key: str = DEFAULT_KEY,
+    max_issues: int = MAX_ISSUES,
+    on_progress=None,
+    files_dir: str = None,
+) -> LedgerReport:
+    """Verifica un ledger CSV (ruta o fichero de texto abierto) en streaming.
+
+    Las filas se numeran como en una hoja de cálculo (la cabecera es la fila 1).
+    `files_dir`: carpeta con los ficheros sellados (por nombre) para recalcular su hash.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "r", encoding="utf-8", newline="") as f:
+            return verify_csv(f, workers, chunk_size, key, max_issues, on_progress, files_dir)
+
+    reader = csv.DictReader(source)
+    missing = [c for c in REQUIRED if c not in (reader.fieldnames or ())]
+    if missing:
+        raise ValueError(f"Faltan columnas en el ledger: {', '.join(missing)}")
+
+    workers = max(1, workers or os.cpu_count() or 1)
+    report = LedgerReport()
+    rows = _row_tuples(reader)
+    next_row = 2
+    t0 = time.perf_counter()
+
+    def collect(n, issues):
+        report.filas += n
+        report.errores += len(issues)
+        room = max_issues - len(report.incidencias)
+        report.incidencias.extend(issues[:room])
+        if on_progress:
+            on_progress(report.filas, time.perf_counter() - t0)
+
+    if workers == 1:
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                break
+            collect(*verify_rows(next_row, chunk, key, files_dir))
+            next_row += len(chunk)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending = set()
+            exhausted = False
+            while pending or not exhausted:
+                # Ventana acotada de bloques en vuelo: la memoria no crece con el fichero
+                while not exhausted and len(pending) < 2 * workers:
+                    chunk = list(islice(rows, chunk_size))
+                    if not chunk:
+                        exhausted = True
+                        break
+                    pending.add(pool.submit(verify_rows, next_row, chunk, key, files_dir))
+                    next_row += len(chunk)
+                if pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for fut in done:
+                        collect(*fut.result())
+
+    report.incidencias.sort(key=lambda x: x["fila"])
+    report.correctas = report.filas - report.errores
+    report.segundos = time.perf_counter() - t0
+    return report
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m ud1.ledger_verify", description="Verifica un ledger CSV exportado")
+    parser.add_argument("csv", help="ruta del ledger (p. ej. ledger_ud1.csv)")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk", type=int, default=DEFAULT_CHUNK)
+    parser.add_argument("--key", default=DEFAULT_KEY)
+    parser.add_argument("--ficheros", help="carpeta con los ficheros sellados, para recalcular su hash")
+    parser.add_argument("--report", help="guarda las incidencias en este CSV")
+    args = parser.parse_args(argv)
+
+    report = verify_csv(args.csv, args.workers, args.chunk, args.key, files_dir=args.ficheros)
+    if args.report:
+        with open(args.report, "w", encoding="utf-8", newline="") as f:
+            w = csv.DictWriter(f, fieldnames=["fila", "hash", "motivo"])
+            w.writeheader()
+            w.writerows(report.incidencias)
+    print(json.dumps({
+        "filas": report.filas,
+        "correctas": report.correctas,
+        "errores": report.errores,
+        "segundos": round(report.segundos, 3),
+        "filas_por_s": round(report.filas_por_s),
+    }, indent=2))
+    return 1 if report.errores else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,103 @@
+"""Vista paginada del ledger para la UI (S2).
+
+Mantiene un buffer columnar con las últimas `capacity` filas y, en cada rerun,
+sólo lee del `LedgerStore` los asientos nuevos. Las páginas recientes salen del
+buffer; las antiguas se leen del disco bajo demanda. Así la memoria y el coste
+de un rerun no crecen con el tamaño del ledger. La exportación CSV se genera por
+bloques en un fichero temporal que se cierra tras leerlo.
+"""
+import csv
+import io
+import tempfile
+import threading
+from collections import deque
+from itertools import islice
+
+LEDGER_COLUMNS = (
+    "texto", "fichero", "hash", "timestamp", "pseudo_firma",
+    "lote", "raiz_merkle", "prueba_merkle", "hash_cadena",
+)
+
+
+class LedgerView:
+    def __init__(self, store, capacity: int = 5_000, columns=LEDGER_COLUMNS):
+        self.store = store
+        self.capacity = capacity
+        self.columns = list(columns)
+        self._cols = {c: deque(maxlen=capacity) for c in self.columns}
+        self._start = 0   # nº del primer asiento en el buffer
+        self._next = 0    # siguiente asiento por ingerir
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._next
+
+    def sync(self) -> int:
+        """Ingiere los asientos nuevos del store. Devuelve cuántos se añadieron."""
+        with self._lock:
+            total = len(self.store)
+            if total <= self._next:
+                return 0
+            # Si llegan más filas de las que caben, sólo interesan las últimas `capacity`
+            first = max(self._next, total - self.capacity)
+            cols = self._cols
+            for rec in self.store.iter_range(first, total):
+                for c in cols:
+                    cols[c].append(rec.get(c))
+            added = total - self._next
+            self._next = total
+            self._start = max(0, total - self.capacity)
+            return added
+
+    def _from_store(self, start: int, stop: int) -> dict:
+        out = {c: [] for c in self.columns}
+        for rec in self.store.iter_range(start, stop):
+            for c in self.columns:
+                out[c].append(rec.get(c))
+        return out
+
+    def window(self, start: int, stop: int) -> dict:
+        """Filas [start, stop) en formato columnar (dict columna → lista)."""
+        # El buffer lo comparten todas las sesiones: se copia bajo el cerrojo de `sync`
+        with self._lock:
+            start, stop = max(start, 0), min(stop, self._next)
+            if start >= stop:
+                return {c: [] for c in self.columns}
+            if start >= self._start:
+                lo, hi = start - self._start, stop - self._start
+                return {c: list(islice(col, lo, hi)) for c, col in self._cols.items()}
+        return self._from_store(start, stop)
+
+    def n_pages(self, size: int) -> int:
+        return max(1, (len(self) + size - 1) // size)
+
+    def page(self, number: int, size: int = 50) -> dict:
+        """Página `number` (1-based) de `size` filas."""
+        start = (number - 1) * size
+        return self.window(start, start + size)
+
+    def iter_csv(self, chunk_rows: int = 10_000):
+        """Genera el CSV completo por bloques de texto (no materializa el ledger)."""
+        buf = io.StringIO()
+        writer = csv.DictWriter(buf, fieldnames=self.columns, extrasaction="ignore")
+        writer.writeheader()
+        for i, rec in enumerate(self.store.with_batch_roots(self.store.iter_range(0, len(self.store))), 1):
+            writer.writerow(rec)
+            if i % chunk_rows == 0:
+                yield buf.getvalue()
+                buf.seek(0)
+                buf.truncate()
+        yield buf.getvalue()
+
+    def export_csv(self) -> bytes:
+        """CSV completo en bytes (para `st.download_button(data=view.export_csv)`).
+
+        Los bloques se vuelcan a un temporal y se leen de una vez al final, de modo
+        que en memoria sólo hay una copia; el temporal se cierra antes de devolver.
+        """
+        with tempfile.TemporaryFile("w+b") as f:
+            for chunk in self.iter_csv():
+                f.write(chunk.encode("utf-8"))
+            f.seek(0)
+            return f.read()
@@ -0,0 +1,74 @@
+"""Árbol de Merkle para sellar lotes de registros con una sola firma (S2).
+
+Las hojas son ``sha256(0x00 || hash_del_registro)`` y los nodos internos
+``sha256(0x01 || izq || der)`` (separación de dominio hoja/nodo). Si un nivel
+tiene un número impar de nodos se duplica el último, como en Bitcoin.
+Una prueba de inclusión son los hermanos del camino hoja→raíz: O(log n) hashes.
+"""
+import hashlib
+from typing import List, Tuple
+
+_LEAF = b"\x00"
+_NODE = b"\x01"
+
+Proof = List[Tuple[str, str]]  # [(lado del hermano "L"/"R", hash hex del hermano)]
+
+
+def leaf_digest(record_hash_hex: str) -> bytes:
+    return hashlib.sha256(_LEAF + bytes.fromhex(record_hash_hex)).digest()
+
+
+def _node(left: bytes, right: bytes) -> bytes:
+    return hashlib.sha256(_NODE + left + right).digest()
+
+
+class MerkleTree:
+    def __init__(self, record_hashes):
+        leaves = [leaf_digest(h) for h in record_hashes]
+        if not leaves:
+            raise ValueError("Un lote de Merkle necesita al menos un registro.")
+        self.levels = [leaves]
+        level = leaves
+        while len(level) > 1:
+            if len(level) % 2:
+                level = level + [level[-1]]
+            level = [_node(level[i], level[i + 1]) for i in range(0, len(level), 2)]
+            self.levels.append(level)
+
+    def __len__(self) -> int:
+        return len(self.levels[0])
+
+    @property
+    def root(self) -> str:
+        return self.levels[-1][0].hex()
+
+    def proof(self, index: int) -> Proof:
+        """Hermanos del camino desde la hoja `index` hasta la raíz."""
+        index = range(len(self))[index]
+        out = []
+        for level in self.levels[:-1]:
+            sib = index ^ 1
+            if sib >= len(level):
+                sib = index  # nodo duplicado en niveles impares
+            out.append(("L" if sib < index else "R", level[sib].hex()))
+            index //= 2
+        return out
+
+
+def verify_proof(record_hash_hex: str, proof: Proof, root_hex: str) -> bool:
+    """Recalcula la raíz desde la hoja con O(log n) hashes."""
+    acc = leaf_digest(record_hash_hex)
+    for side, sib_hex in proof:
+        sib = bytes.fromhex(sib_hex)
+        acc = _node(sib, acc) if side == "L" else _node(acc, sib)
+    return acc.hex() == root_hex
+
+
+def proof_to_str(proof: Proof) -> str:
+    return ",".join(f"{side}:{h}" for side, h in proof)
+
+
+def proof_from_str(text: str) -> Proof:
+    if not text:
+        return []
+    return [tuple(part.split(":", 1)) for part in text.split(",")]
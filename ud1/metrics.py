@@ -0,0 +1,319 @@
+"""Instrumentación opcional: spans de tiempo e histogramas en memoria.
+
+Desactivada por defecto; se activa con ``UD1_METRICS=1`` (o ``enable()``).
+Desactivada, ``span`` devuelve un contexto vacío y no mide nada::
+
+    from ud1 import metrics
+
+    with metrics.span("s1_hash"):
+        h = sha256_hex(texto)
+
+Cada observación se agrega en un histograma por (span, página) y, si el
+contexto lleva ``session``, también en el de esa sesión. Las etiquetas de
+contexto (página y sesión) las fija el lanzador en cada rerun con
+``set_context``; como viven en un ``ContextVar``, cada hilo de sesión de
+Streamlit ve las suyas. ``dump`` escribe el estado en JSONL o en el formato de
+texto de Prometheus.
+"""
+import contextvars
+import functools
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+# Límites superiores (s) de los buckets, como los de un histograma de Prometheus
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, float("inf"))
+MAX_SESSIONS = 256
+DUMP_PATH = os.path.join(".cache", "ud1", "metrics.jsonl")
+DUMP_EVERY = 30.0
+
+_enabled = os.environ.get("UD1_METRICS", "").strip().lower() not in ("", "0", "false", "no")
+_context = contextvars.ContextVar("ud1_metrics_context", default=None)
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def enable(on: bool = True) -> None:
+    global _enabled
+    _enabled = on
+
+
+class Histogram:
+    """Recuento por bucket, suma y máximo de las duraciones observadas."""
+
+    __slots__ = ("counts", "count", "sum", "max")
+
+    def __init__(self):
+        self.counts = [0] * len(BUCKETS)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        for i, le in enumerate(BUCKETS):
+            if seconds <= le:
+                self.counts[i] += 1
+                break
+        self.count += 1
+        self.sum += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def merge(self, other: "Histogram") -> None:
+        """Suma las observaciones de `other` (p. ej. de otro proceso)."""
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.count += other.count
+        self.sum += other.sum
+        self.max = max(self.max, other.max)
+
+    def copy(self) -> "Histogram":
+        h = Histogram()
+        h.counts, h.count, h.sum, h.max = list(self.counts), self.count, self.sum, self.max
+        return h
+
+    def quantile(self, q: float) -> float:
+        """Estimación por interpolación lineal dentro del bucket (como `histogram_quantile`)."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen, lower = 0, 0.0
+        for le, c in zip(BUCKETS, self.counts):
+            if c and seen + c >= rank:
+                upper = min(le, self.max)
+                return lower + (upper - lower) * max(rank - seen, 0) / c
+            seen += c
+            lower = le
+        return self.max
+
+    def summary(self) -> dict:
+        return {
+            "n": self.count,
+            "total_s": self.sum,
+            "media_s": self.sum / self.count if self.count else 0.0,
+            "p50_s": self.quantile(0.50),
+            "p95_s": self.quantile(0.95),
+            "p99_s": self.quantile(0.99),
+            "max_s": self.max,
+        }
+
+
+class Registry:
+    """Histogramas por (nombre del span, página), seguro entre hilos."""
+
+    def __init__(self):
+        self._hist = {}
+        self._lock = threading.Lock()
+
+    def observe(self, name: str, page: str, seconds: float) -> None:
+        with self._lock:
+            h = self._hist.get((name, page))
+            if h is None:
+                h = self._hist[(name, page)] = Histogram()
+            h.observe(seconds)
+
+    def items(self) -> list:
+        """[(span, página, copia del histograma)], ordenado."""
+        with self._lock:
+            return [(n, p, h.copy()) for (n, p), h in sorted(self._hist.items())]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._hist.clear()
+
+
+REGISTRY = Registry()
+_sessions = OrderedDict()           # session_id -> Registry (LRU acotado)
+_sessions_lock = threading.Lock()
+
+
+def session_registry(session: str, create: bool = False):
+    with _sessions_lock:
+        reg = _sessions.get(session)
+        if reg is not None:
+            _sessions.move_to_end(session)
+        elif create:
+            reg = _sessions[session] = Registry()
+            while len(_sessions) > MAX_SESSIONS:
+                _sessions.popitem(last=False)
+        return reg
+
+
+def sessions() -> list:
+    with _sessions_lock:
+        return list(_sessions)
+
+
+def reset() -> None:
+    REGISTRY.reset()
+    with _sessions_lock:
+        _sessions.clear()
+
+
+# ---------------------------
+# Contexto y spans
+# ---------------------------
+def set_context(page: str = "", session: str = ""):
+    """Fija la página y la sesión de las observaciones de este hilo; devuelve el token para `reset_context`."""
+    return _context.set((page, session))
+
+
+def reset_context(token) -> None:
+    _context.reset(token)
+
+
+def observe(name: str, seconds: float) -> None:
+    page, session = _context.get() or ("", "")
+    REGISTRY.observe(name, page, seconds)
+    if session:
+        session_registry(session, create=True).observe(name, page, seconds)
+
+
+class _Span:
+    __slots__ = ("name", "t0")
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        observe(self.name, time.perf_counter() - self.t0)
+        return False
+
+
+class _NoSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NO_SPAN = _NoSpan()
+
+
+def span(name: str):
+    """Contexto que mide su bloque (también si sale por excepción, p. ej. un ``st.rerun``)."""
+    return _Span(name) if _enabled else _NO_SPAN
+
+
+def timed(name: str):
+    """Decorador: `span(name)` alrededor de cada llamada."""
+    def deco(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            with _Span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return deco
+
+
+# ---------------------------
+# Exportación
+# ---------------------------
+def snapshot(session: str = None) -> list:
+    """Resumen por (span, página) del registro global o del de `session`."""
+    reg = REGISTRY if session is None else session_registry(session)
+    if reg is None:
+        return []
+    return [{"span": n, "pagina": p, **h.summary()} for n, p, h in reg.items()]
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def to_prometheus() -> str:
+    """Histograma ``ud1_span_seconds`` en formato de texto de Prometheus (sin etiqueta de sesión)."""
+    lines = [
+        "# HELP ud1_span_seconds Duración de los spans instrumentados de la app UD1.",
+        "# TYPE ud1_span_seconds histogram",
+    ]
+    for name, page, h in REGISTRY.items():
+        labels = f'span="{_label(name)}",pagina="{_label(page)}"'
+        acc = 0
+        for le, c in zip(BUCKETS, h.counts):
+            acc += c
+            le_s = "+Inf" if le == float("inf") else repr(le)
+            lines.append(f'ud1_span_seconds_bucket{{{labels},le="{le_s}"}} {acc}')
+        lines.append(f"ud1_span_seconds_sum{{{labels}}} {h.sum!r}")
+        lines.append(f"ud1_span_seconds_count{{{labels}}} {h.count}")
+    return "\n".join(lines) + "\n"
+
+
+def to_jsonl() -> str:
+    """Una línea JSON por (span, página), global y por sesión, con los buckets."""
+    ts = time.time()
+    out = []
+    for session, reg in [("", REGISTRY)] + [(s, session_registry(s)) for s in sessions()]:
+        if reg is None:
+            continue
+        for name, page, h in reg.items():
+            out.append(json.dumps({
+                "ts": ts, "sesion": session, "span": name, "pagina": page, **h.summary(),
+                "buckets": dict(zip(["+Inf" if le == float("inf") else le for le in BUCKETS], h.counts)),
+            }, ensure_ascii=False))
+    return "\n".join(out) + ("\n" if out else "")
+
+
+def dump_path() -> str:
+    """Destino de los volcados: ``UD1_METRICS_DUMP`` o, si no está, `DUMP_PATH`."""
+    return os.environ.get("UD1_METRICS_DUMP") or DUMP_PATH
+
+
+def dump(path: str = None, fmt: str = None) -> str:
+    """Escribe el estado en `path` (``.prom``/``.txt`` → Prometheus, si no JSONL) de forma atómica.
+
+    Sin `path`, en `dump_path()`. El temporal es único (``mkstemp`` en la misma carpeta),
+    así que dos volcados simultáneos no se pisan: gana el último ``os.replace``.
+    """
+    if path is None:
+        path = dump_path()
+    if fmt is None:
+        fmt = "prometheus" if path.endswith((".prom", ".txt")) else "jsonl"
+    text = to_prometheus() if fmt == "prometheus" else to_jsonl()
+    folder = os.path.dirname(path)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=folder or ".", prefix=".metrics-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp, path)
+    except BaseException:
+        os.remove(tmp)
+        raise
+    return path
+
+
+_last_dump = 0.0
+_dump_lock = threading.Lock()
+
+
+def autodump(every: float = DUMP_EVERY):
+    """Vuelca a ``UD1_METRICS_DUMP`` como mucho cada `every` segundos (sin abrir el panel).
+
+    La comprobación y la actualización de ``_last_dump`` van bajo cerrojo: de varios
+    reruns simultáneos sólo uno vuelca.
+    """
+    global _last_dump
+    path = os.environ.get("UD1_METRICS_DUMP")
+    if not _enabled or not path:
+        return None
+    with _dump_lock:
+        now = time.monotonic()
+        if now - _last_dump < every:
+            return None
+        _last_dump = now
+    return dump(path)
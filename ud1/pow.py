@@ -0,0 +1,123 @@
+"""Motor de minado Proof of Work: búsqueda de nonce por lotes en un pool de procesos.
+
+Cada tarea recorre un rango contiguo de nonces sobre una cabecera fija. El estado
+del hash de la cabecera se calcula una sola vez y se clona con ``copy()`` para cada
+nonce (si el proveedor lo admite), y la condición de dificultad se compara sobre
+los bytes del digest (sin hex). El algoritmo es configurable (`ud1.hashes`).
+"""
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from ud1.hashes import DEFAULT_ALGORITHM, get_provider
+
+NONCE_BYTES = 8
+DEFAULT_BATCH = 200_000
+MAX_DIFFICULTY = 64
+
+
+def target_for(difficulty: int, digest_size: int = 32) -> bytes:
+    """Umbral de `digest_size` bytes: un digest es válido si es menor que él (= `difficulty` ceros hex)."""
+    if not 1 <= difficulty <= MAX_DIFFICULTY - 1:
+        raise ValueError(f"La dificultad debe estar entre 1 y {MAX_DIFFICULTY - 1}.")
+    return (1 << (8 * digest_size - 4 * difficulty)).to_bytes(digest_size, "big")
+
+
+def block_digest(header: bytes, nonce: int, algorithm: str = DEFAULT_ALGORITHM) -> bytes:
+    return get_provider(algorithm).digest(header + nonce.to_bytes(NONCE_BYTES, "little"))
+
+
+def scan_range(header: bytes, start: int, count: int, target: bytes, algorithm: str = DEFAULT_ALGORITHM):
+    """Recorre [start, start+count). Devuelve (nonce ganador o None, hashes calculados)."""
+    provider = get_provider(algorithm)
+    if provider.copyable:
+        copy = provider.new(header).copy
+        for nonce in range(start, start + count):
+            h = copy()
+            h.update(nonce.to_bytes(NONCE_BYTES, "little"))
+            if h.digest() < target:
+                return nonce, nonce - start + 1
+    else:
+        new = provider.new
+        for nonce in range(start, start + count):
+            if new(header + nonce.to_bytes(NONCE_BYTES, "little")).digest() < target:
+                return nonce, nonce - start + 1
+    return None, count
+
+
+@dataclass
+class MiningResult:
+    nonce: Optional[int]
+    digest_hex: Optional[str]
+    hashes: int
+    seconds: float
+    workers: int
+    cancelled: bool = False
+
+    @property
+    def found(self) -> bool:
+        return self.nonce is not None
+
+    @property
+    def hashrate(self) -> float:
+        """Hashes por segundo medidos en esta ejecución."""
+        return self.hashes / self.seconds if self.seconds > 0 else 0.0
+
+
+def mine(
+    header: bytes,
+    difficulty: int,
+    workers: Optional[int] = None,
+    batch: int = DEFAULT_BATCH,
+    max_hashes: Optional[int] = None,
+    on_progress: Optional[Callable[[int, float], None]] = None,
+    should_stop: Optional[Callable[[], bool]] = None,
+    algorithm: str = DEFAULT_ALGORITHM,
+) -> MiningResult:
+    """Busca un nonce válido repartiendo rangos de `batch` nonces entre `workers` procesos.
+
+    `on_progress(hashes, segundos)` se invoca cada vez que termina un lote y
+    `should_stop()` permite cancelar entre lotes. Si el llamador se interrumpe
+    (p. ej. un rerun de Streamlit), el pool se cierra y se descartan los lotes pendientes.
+    """
+    target = target_for(difficulty, get_provider(algorithm).digest_size)
+    workers = max(1, workers or os.cpu_count() or 1)
+    next_start = 0
+    hashes = 0
+    t0 = time.perf_counter()
+    pool = ProcessPoolExecutor(max_workers=workers)
+    pending = set()
+
+    def submit():
+        nonlocal next_start
+        if max_hashes is not None and next_start >= max_hashes:
+            return
+        count = batch if max_hashes is None else min(batch, max_hashes - next_start)
+        pending.add(pool.submit(scan_range, header, next_start, count, target, algorithm))
+        next_start += count
+
+    try:
+        # Dos lotes en vuelo por proceso para que ningún núcleo quede ocioso entre entregas
+        for _ in range(2 * workers):
+            submit()
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                pending.discard(fut)
+                nonce, n = fut.result()
+                hashes += n
+                if nonce is not None:
+                    elapsed = time.perf_counter() - t0
+                    return MiningResult(nonce, block_digest(header, nonce, algorithm).hex(), hashes, elapsed, workers)
+            elapsed = time.perf_counter() - t0
+            if on_progress is not None:
+                on_progress(hashes, elapsed)
+            if should_stop is not None and should_stop():
+                return MiningResult(None, None, hashes, elapsed, workers, cancelled=True)
+            while len(pending) < 2 * workers and (max_hashes is None or next_start < max_hashes):
+                submit()
+        return MiningResult(None, None, hashes, time.perf_counter() - t0, workers)
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
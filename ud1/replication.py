@@ -0,0 +1,528 @@
+"""Simulación de un ledger replicado en N nodos con consenso por líder.
+
+Cada nodo es una corrutina que atiende su ``asyncio.Queue``; no hay un hilo
+por nodo. La red es una cola de prioridad de mensajes con latencia
+(``latencia + exponencial(jitter)``) y pérdida configurables. El tiempo es
+virtual: el planificador entrega los mensajes por orden de llegada, espera a
+que los nodos los procesen y salta al siguiente instante. Así cientos de nodos
+se simulan en segundos y, con la misma semilla, el resultado es reproducible.
+
+El consenso es un Raft simplificado:
+
+- si un seguidor deja de oír al líder durante su *timeout* de elección,
+  se presenta como candidato en un término nuevo. Gana con la mayoría de
+  votos, que sólo se conceden a candidatos con el log al menos tan al día;
+- el líder propone un bloque cada ``intervalo_bloque`` ms y lo envía a todos.
+  Ese envío sirve también de latido. El bloque queda confirmado cuando lo
+  tiene una mayoría;
+- un seguidor con huecos (mensajes perdidos) responde con su altura y el
+  líder le reenvía lo que le falta;
+- si cae el líder (``caida_cada``), los bloques que no llegaron a una mayoría
+  pueden quedar huérfanos: el nuevo líder los sobrescribe (bifurcación).
+
+    python -m ud1.replication --nodos 200 --duracion 20000 --perdida 0.02 --caida-cada 5000
+    python -m ud1.replication --escalado 5 25 100 250 500
+"""
+import argparse
+import asyncio
+import hashlib
+import heapq
+import json
+import random
+import time
+from dataclasses import dataclass, field
+
+import numpy as np
+
+FOLLOWER, CANDIDATE, LEADER = "seguidor", "candidato", "líder"
+
+
+class Block:
+    __slots__ = ("height", "term", "hash", "prev_hash", "leader", "txs", "proposed_at")
+
+    def __init__(self, height, term, prev_hash, leader, txs, proposed_at):
+        self.height = height
+        self.term = term
+        self.prev_hash = prev_hash
+        self.leader = leader
+        self.txs = txs
+        self.proposed_at = proposed_at
+        raw = f"{prev_hash}|{height}|{term}|{leader}|{txs}|{proposed_at!r}".encode("utf-8")
+        self.hash = hashlib.sha256(raw).hexdigest()
+
+
+@dataclass
+class ReplicationConfig:
+    nodos: int = 25
+    duracion: float = 10_000.0          # ms simulados
+    latencia: float = 20.0              # ms, mínimo de cada enlace
+    jitter: float = 10.0                # ms, media de la parte exponencial
+    perdida: float = 0.0                # probabilidad de perder cada mensaje
+    intervalo_bloque: float = 100.0     # ms entre propuestas del líder
+    tx_por_bloque: float = 50.0
+    timeout_eleccion: float = 0.0       # ms; 0 → automático según latencia e intervalo
+    caida_cada: float = 0.0             # ms entre caídas del líder (0 = nunca)
+    caida_duracion: float = 1_000.0     # ms que tarda en volver
+    lote_max: int = 64                  # bloques por mensaje al poner al día a un seguidor
+    resolucion: float = 0.5             # ms: eventos tan próximos se entregan en la misma ronda
+    semilla: int = 0
+
+
+@dataclass
+class ReplicationResult:
+    config: ReplicationConfig
+    bloques_propuestos: int
+    bloques_confirmados: int
+    tx_confirmadas: int
+    latencia_confirmacion: np.ndarray   # ms, propuesta → confirmación, por bloque
+    retraso_replicacion: np.ndarray     # ms, propuesta → llegada a cada seguidor
+    confirmaciones: np.ndarray          # instante (ms) de cada confirmación
+    alturas: np.ndarray                 # altura final del log de cada nodo
+    retraso_altura: int                 # bloques que le faltan al nodo vivo más atrasado
+    truncados: int                      # bloques borrados por seguidores al recibir otra rama
+    huerfanos: int                      # bloques propuestos que no están en la cadena confirmada
+    elecciones: int                     # líderes elegidos
+    candidaturas: int                   # rondas de votación iniciadas (las divididas no eligen a nadie)
+    mensajes: int
+    perdidos: int
+    eventos: int
+    segundos: float                     # tiempo real de la simulación
+    consistente: bool                   # todos los prefijos confirmados coinciden
+    lideres: list = field(default_factory=list)   # (instante, nodo, término)
+
+    @property
+    def bloques_por_s(self) -> float:
+        return self.bloques_confirmados / (self.config.duracion / 1000)
+
+    @property
+    def tx_por_s(self) -> float:
+        return self.tx_confirmadas / (self.config.duracion / 1000)
+
+    @property
+    def tasa_bifurcacion(self) -> float:
+        return self.huerfanos / self.bloques_propuestos if self.bloques_propuestos else 0.0
+
+    @property
+    def eventos_por_s(self) -> float:
+        return self.eventos / self.segundos if self.segundos else 0.0
+
+    def summary(self) -> dict:
+        def pct(a):
+            if not len(a):
+                return {"p50": 0.0, "p95": 0.0, "p99": 0.0}
+            p50, p95, p99 = np.percentile(a, [50, 95, 99])
+            return {"p50": round(float(p50), 2), "p95": round(float(p95), 2), "p99": round(float(p99), 2)}
+
+        return {
+            "nodos": self.config.nodos,
+            "bloques_propuestos": self.bloques_propuestos,
+            "bloques_confirmados": self.bloques_confirmados,
+            "bloques_por_s": round(self.bloques_por_s, 2),
+            "tx_por_s": round(self.tx_por_s, 1),
+            "latencia_confirmacion_ms": pct(self.latencia_confirmacion),
+            "retraso_replicacion_ms": pct(self.retraso_replicacion),
+            "retraso_altura_max": self.retraso_altura,
+            "truncados": self.truncados,
+            "huerfanos": self.huerfanos,
+            "tasa_bifurcacion": round(self.tasa_bifurcacion, 4),
+            "elecciones": self.elecciones,
+            "candidaturas": self.candidaturas,
+            "mensajes": self.mensajes,
+            "perdidos": self.perdidos,
+            "eventos": self.eventos,
+            "segundos": round(self.segundos, 3),
+            "eventos_por_s": round(self.eventos_por_s),
+            "consistente": self.consistente,
+        }
+
+
+class Node:
+    def __init__(self, sim: "Simulation", node_id: int):
+        self.sim = sim
+        self.id = node_id
+        self.inbox = asyncio.Queue()
+        self.alive = True
+        self.role = FOLLOWER
+        self.term = 0
+        self.voted_for = None
+        self.votes = 0
+        self.log = []                   # bloques; la altura h está en log[h - 1]
+        self.commit = 0
+        self._timer = 0                 # generación del timeout vigente (los antiguos se ignoran)
+        self._next = self._match = self._acked = None
+
+    def last_hash(self, height: int = None) -> str:
+        height = len(self.log) if height is None else height
+        return self.log[height - 1].hash if height else "0" * 64
+
+    # ---------------------------
+    # Temporizadores
+    # ---------------------------
+    def reset_election_timer(self) -> None:
+        self._timer += 1
+        base = self.sim.election_timeout
+        self.sim.schedule(self.id, self.sim.rng.uniform(base, 2 * base), ("timeout", self._timer))
+
+    def become_follower(self, term: int) -> None:
+        if term > self.term:
+            self.term = term
+            self.voted_for = None
+        self.role = FOLLOWER
+        self.reset_election_timer()
+
+    # ---------------------------
+    # Bucle del nodo
+    # ---------------------------
+    async def run(self) -> None:
+        sim = self.sim
+        while True:
+            msg = await self.inbox.get()
+            try:
+                self.handle(msg)
+            except Exception as e:
+                # Sin esto el planificador esperaría para siempre a un nodo muerto
+                sim.error = e
+                sim.idle.set()
+                return
+            sim.pending -= 1
+            if not sim.pending:
+                sim.idle.set()
+
+    def handle(self, msg) -> None:
+        kind = msg[0]
+        if kind == "append":
+            self.on_append(*msg[1:])
+        elif kind == "ack":
+            self.on_ack(*msg[1:])
+        elif kind == "tick":
+            if self.role == LEADER and msg[1] == self.term:
+                self.propose()
+        elif kind == "timeout":
+            if msg[1] == self._timer and self.role != LEADER:
+                self.start_election()
+        elif kind == "vote_req":
+            self.on_vote_request(*msg[1:])
+        elif kind == "vote":
+            self.on_vote(*msg[1:])
+
+    # ---------------------------
+    # Elección
+    # ---------------------------
+    def start_election(self) -> None:
+        self.sim.candidaturas += 1
+        self.term += 1
+        self.role = CANDIDATE
+        self.voted_for = self.id
+        self.votes = 1
+        last_term = self.log[-1].term if self.log else 0
+        for dst in range(self.sim.n):
+            if dst != self.id:
+                self.sim.send(dst, ("vote_req", self.term, self.id, len(self.log), last_term))
+        self.reset_election_timer()     # si no gana, vuelve a intentarlo en otro término
+        if self.votes >= self.sim.quorum:
+            self.become_leader()
+
+    def on_vote_request(self, term, candidate, last_height, last_term) -> None:
+        if term > self.term:
+            self.become_follower(term)
+        my_last_term = self.log[-1].term if self.log else 0
+        up_to_date = (last_term, last_height) >= (my_last_term, len(self.log))
+        granted = term == self.term and self.voted_for in (None, candidate) and up_to_date
+        if granted:
+            self.voted_for = candidate
+            self.reset_election_timer()
+        self.sim.send(candidate, ("vote", self.term, granted))
+
+    def on_vote(self, term, granted) -> None:
+        if term > self.term:
+            self.become_follower(term)
+            return
+        if self.role != CANDIDATE or term != self.term or not granted:
+            return
+        self.votes += 1
+        if self.votes >= self.sim.quorum:
+            self.become_leader()
+
+    def become_leader(self) -> None:
+        self.role = LEADER
+        self._timer += 1                # anula su timeout de elección
+        n, h = self.sim.n, len(self.log)
+        self._next = [h + 1] * n
+        self._match = [0] * n
+        self._acked = {}                # altura → nº de seguidores que la tienen (en este término)
+        self.sim.on_leader(self)
+        self.propose()
+
+    # ---------------------------
+    # Replicación
+    # ---------------------------
+    def propose(self) -> None:
+        sim = self.sim
+        mean = sim.cfg.tx_por_bloque
+        txs = max(0, int(round(sim.rng.gauss(mean, mean ** 0.5)))) if mean else 0
+        block = Block(len(self.log) + 1, self.term, self.last_hash(), self.id, txs, sim.now)
+        self.log.append(block)
+        sim.on_propose(block)
+        for dst in range(sim.n):
+            if dst != self.id:
+                self.send_append(dst)
+        self.advance_commit()           # con un único nodo, el bloque se confirma solo
+        sim.schedule(self.id, sim.cfg.intervalo_bloque, ("tick", self.term))
+
+    def send_append(self, dst: int) -> None:
+        nxt = self._next[dst]
+        prev = nxt - 1
+        entries = self.log[prev:prev + self.sim.cfg.lote_max]
+        # Envío en tubería: se supone que llegará y el siguiente envío continúa detrás
+        self._next[dst] = prev + len(entries) + 1
+        self.sim.send(dst, ("append", self.term, self.id, prev, self.last_hash(prev), entries, self.commit))
+
+    def on_append(self, term, leader, prev_h, prev_hash, entries, commit) -> None:
+        sim = self.sim
+        if term < self.term:
+            sim.send(leader, ("ack", self.term, self.id, False, len(self.log)))
+            return
+        if term > self.term or self.role != FOLLOWER:
+            self.become_follower(term)
+        else:
+            self.reset_election_timer()
+        if prev_h > len(self.log) or self.last_hash(prev_h) != prev_hash:
+            sim.send(leader, ("ack", self.term, self.id, False, min(len(self.log), prev_h - 1)))
+            return
+        log = self.log
+        for i, block in enumerate(entries):
+            h = prev_h + 1 + i
+            if h <= len(log):
+                if log[h - 1].hash == block.hash:
+                    continue
+                sim.truncados += len(log) - (h - 1)     # rama de un líder anterior
+                del log[h - 1:]
+            log.append(block)
+            sim.lags.append(sim.now - block.proposed_at)
+        last = prev_h + len(entries)
+        if commit > self.commit:
+            self.commit = min(commit, last)
+        sim.send(leader, ("ack", self.term, self.id, True, last))
+
+    def on_ack(self, term, node, ok, height) -> None:
+        if term > self.term:
+            self.become_follower(term)
+            return
+        if self.role != LEADER or term != self.term:
+            return
+        if not ok:
+            self._next[node] = height + 1
+            self.send_append(node)
+            return
+        old = self._match[node]
+        if height > old:
+            self._match[node] = height
+            acked = self._acked
+            for h in range(old + 1, height + 1):
+                acked[h] = acked.get(h, 0) + 1
+            self.advance_commit()
+
+    def advance_commit(self) -> None:
+        # Las cuentas por altura son no crecientes: se avanza mientras haya mayoría
+        h, acked, quorum = self.commit, self._acked, self.sim.quorum
+        while h < len(self.log) and acked.get(h + 1, 0) + 1 >= quorum:
+            h += 1
+        # Sólo se confirma directamente un bloque del término actual (los anteriores, con él)
+        if h > self.commit and self.log[h - 1].term == self.term:
+            for b in self.log[self.commit:h]:
+                self.sim.on_commit(b)
+            self.commit = h
+
+
+class Simulation:
+    def __init__(self, cfg: ReplicationConfig):
+        self.cfg = cfg
+        self.n = cfg.nodos
+        self.quorum = cfg.nodos // 2 + 1
+        self.rng = random.Random(cfg.semilla)
+        self.election_timeout = cfg.timeout_eleccion or max(
+            3 * cfg.intervalo_bloque, 10 * (cfg.latencia + cfg.jitter)
+        )
+        self.now = 0.0
+        self.heap = []
+        self._seq = 0
+        self.pending = 0
+        self.idle = None
+        self.error = None               # excepción de un nodo; el planificador la relanza
+        self.nodes = []
+        self.mensajes = self.perdidos = self.eventos = 0
+        self.truncados = self.candidaturas = 0
+        self.lags = []
+        self.proposed = {}              # hash → bloque
+        self.committed = {}             # hash → instante de confirmación
+        self.leaders = []
+
+    # ---------------------------
+    # Red y temporizadores
+    # ---------------------------
+    def _push(self, when: float, dst: int, msg) -> None:
+        self._seq += 1
+        heapq.heappush(self.heap, (when, self._seq, dst, msg))
+
+    def send(self, dst: int, msg) -> None:
+        self.mensajes += 1
+        if self.cfg.perdida and self.rng.random() < self.cfg.perdida:
+            self.perdidos += 1
+            return
+        delay = self.cfg.latencia + (self.rng.expovariate(1 / self.cfg.jitter) if self.cfg.jitter else 0.0)
+        self._push(self.now + delay, dst, msg)
+
+    def schedule(self, dst: int, delay: float, msg) -> None:
+        self._push(self.now + delay, dst, msg)
+
+    # ---------------------------
+    # Métricas
+    # ---------------------------
+    def on_leader(self, node: Node) -> None:
+        self.leaders.append((self.now, node.id, node.term))
+
+    def on_propose(self, block: Block) -> None:
+        self.proposed[block.hash] = block
+
+    def on_commit(self, block: Block) -> None:
+        self.committed.setdefault(block.hash, self.now)
+
+    # ---------------------------
+    # Fallos
+    # ---------------------------
+    def _control(self, msg) -> None:
+        if msg[0] == "crash":
+            leader = next((nd for nd in self.nodes if nd.alive and nd.role == LEADER), None)
+            if leader is not None:
+                leader.alive = False
+                leader.role = FOLLOWER
+                leader._timer += 1
+                self.schedule(-1, self.cfg.caida_duracion, ("recover", leader.id))
+            self.schedule(-1, self.cfg.caida_cada, ("crash",))
+        elif msg[0] == "recover":
+            node = self.nodes[msg[1]]
+            node.alive = True
+            node.reset_election_timer()
+
+    # ---------------------------
+    # Planificador de tiempo virtual
+    # ---------------------------
+    async def _run(self) -> None:
+        self.idle = asyncio.Event()
+        self.nodes = [Node(self, i) for i in range(self.n)]
+        tasks = [asyncio.create_task(nd.run()) for nd in self.nodes]
+        for nd in self.nodes:
+            nd.reset_election_timer()
+        if self.cfg.caida_cada:
+            self.schedule(-1, self.cfg.caida_cada, ("crash",))
+        heap, nodes, end, res = self.heap, self.nodes, self.cfg.duracion, self.cfg.resolucion
+        try:
+            while heap and heap[0][0] <= end:
+                self.now = heap[0][0]
+                limit = self.now + res
+                while heap and heap[0][0] <= limit:
+                    _, _, dst, msg = heapq.heappop(heap)
+                    self.eventos += 1
+                    if dst < 0:
+                        self._control(msg)
+                        continue
+                    node = nodes[dst]
+                    if not node.alive:
+                        continue                # un nodo caído no recibe nada
+                    node.inbox.put_nowait(msg)
+                    self.pending += 1
+                if self.pending:
+                    self.idle.clear()
+                    await self.idle.wait()
+                    if self.error is not None:
+                        raise self.error
+        finally:
+            for t in tasks:
+                t.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def run(self) -> ReplicationResult:
+        t0 = time.perf_counter()
+        asyncio.run(self._run())
+        segundos = time.perf_counter() - t0
+        cfg = self.cfg
+
+        # Cadena confirmada de referencia: el log más largo entre los prefijos confirmados
+        ref = max(self.nodes, key=lambda nd: nd.commit)
+        chain = ref.log[:ref.commit]
+        consistente = all(
+            [b.hash for b in nd.log[:nd.commit]] == [b.hash for b in chain[:nd.commit]] for nd in self.nodes
+        )
+        chain_hashes = {b.hash for b in chain}
+        confirmados = [b for b in chain if b.hash in self.committed]
+        lat = np.array([self.committed[b.hash] - b.proposed_at for b in confirmados], dtype=np.float64)
+        alturas = np.array([len(nd.log) for nd in self.nodes], dtype=np.int64)
+        vivos = [len(nd.log) for nd in self.nodes if nd.alive]
+        return ReplicationResult(
+            config=cfg,
+            bloques_propuestos=len(self.proposed),
+            bloques_confirmados=len(chain),
+            tx_confirmadas=sum(b.txs for b in chain),
+            latencia_confirmacion=lat,
+            retraso_replicacion=np.array(self.lags, dtype=np.float64),
+            confirmaciones=np.sort(np.array([self.committed[h] for h in chain_hashes if h in self.committed])),
+            alturas=alturas,
+            retraso_altura=int(max(vivos) - min(vivos)) if vivos else 0,
+            truncados=self.truncados,
+            huerfanos=sum(1 for h, b in self.proposed.items() if h not in chain_hashes and b.height <= ref.commit),
+            elecciones=len(self.leaders),
+            candidaturas=self.candidaturas,
+            mensajes=self.mensajes,
+            perdidos=self.perdidos,
+            eventos=self.eventos,
+            segundos=segundos,
+            consistente=consistente,
+            lideres=list(self.leaders),
+        )
+
+
+def simulate(**kwargs) -> ReplicationResult:
+    """Atajo: ``simulate(nodos=200, perdida=0.01)`` con el resto de `ReplicationConfig` por defecto."""
+    return Simulation(ReplicationConfig(**kwargs)).run()
+
+
+def scaling(nodes=(5, 25, 100, 250, 500), on_step=None, **kwargs) -> list:
+    """Resumen de una simulación por cada tamaño de red, con el resto de parámetros iguales."""
+    rows = []
+    for n in nodes:
+        res = simulate(nodos=n, **kwargs)
+        rows.append(res.summary())
+        if on_step:
+            on_step(rows[-1])
+    return rows
+
+
+def main(argv=None) -> None:
+    d = ReplicationConfig()
+    parser = argparse.ArgumentParser(prog="python -m ud1.replication",
+                                     description="Ledger replicado simulado: réplica y consenso por líder")
+    parser.add_argument("--nodos", type=int, default=d.nodos)
+    parser.add_argument("--duracion", type=float, default=d.duracion, help="ms simulados")
+    parser.add_argument("--latencia", type=float, default=d.latencia)
+    parser.add_argument("--jitter", type=float, default=d.jitter)
+    parser.add_argument("--perdida", type=float, default=d.perdida)
+    parser.add_argument("--intervalo-bloque", type=float, default=d.intervalo_bloque)
+    parser.add_argument("--caida-cada", type=float, default=d.caida_cada, help="ms entre caídas del líder (0 = nunca)")
+    parser.add_argument("--caida-duracion", type=float, default=d.caida_duracion)
+    parser.add_argument("--semilla", type=int, default=d.semilla)
+    parser.add_argument("--escalado", type=int, nargs="+", help="repite la simulación para cada nº de nodos")
+    args = parser.parse_args(argv)
+
+    kwargs = {
+        "duracion": args.duracion, "latencia": args.latencia, "jitter": args.jitter, "perdida": args.perdida,
+        "intervalo_bloque": args.intervalo_bloque, "caida_cada": args.caida_cada,
+        "caida_duracion": args.caida_duracion, "semilla": args.semilla,
+    }
+    if args.escalado:
+        scaling(args.escalado, on_step=lambda row: print(json.dumps(row, ensure_ascii=False), flush=True), **kwargs)
+    else:
+        print(json.dumps(simulate(nodos=args.nodos, **kwargs).summary(), ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
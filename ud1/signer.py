@@ -0,0 +1,73 @@
+"""Pseudo-firma HMAC-SHA256 con la clave precomputada.
+
+`hmac.new(clave, ...)` recalcula los bloques ipad/opad de la clave en cada
+llamada. `HmacSigner` los calcula una vez y clona el estado con ``copy()`` por
+mensaje. El mensaje firmado es ``"hash|timestamp"``, igual que `pseudo_signature`.
+"""
+import hmac
+from functools import lru_cache
+from itertools import islice
+
+DEFAULT_KEY = "DEMO_SECRET"
+DEFAULT_CHUNK = 20_000
+
+
+def _chunks(iterable, size: int):
+    it = iter(iterable)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class HmacSigner:
+    def __init__(self, key: str = DEFAULT_KEY):
+        self._base = hmac.new(key.encode("utf-8"), digestmod="sha256")
+
+    def sign(self, hash_value: str, timestamp_iso: str) -> str:
+        h = self._base.copy()
+        h.update(f"{hash_value}|{timestamp_iso}".encode("utf-8"))
+        return h.hexdigest()
+
+    def verify(self, hash_value: str, timestamp_iso: str, firma: str) -> bool:
+        return hmac.compare_digest(self.sign(hash_value, timestamp_iso), firma)
+
+    def _sign_chunk(self, pairs) -> list:
+        copy = self._base.copy
+        out = []
+        for hash_value, ts in pairs:
+            h = copy()
+            h.update(f"{hash_value}|{ts}".encode("utf-8"))
+            out.append(h.hexdigest())
+        return out
+
+    def _verify_chunk(self, triples) -> list:
+        copy, eq = self._base.copy, hmac.compare_digest
+        out = []
+        for hash_value, ts, firma in triples:
+            h = copy()
+            h.update(f"{hash_value}|{ts}".encode("utf-8"))
+            out.append(eq(h.hexdigest(), firma))
+        return out
+
+    def _map(self, fn, iterable, workers: int, chunk_size: int) -> list:
+        if workers <= 1:
+            return [r for chunk in _chunks(iterable, chunk_size) for r in fn(chunk)]
+        from concurrent.futures import ThreadPoolExecutor  # diferido: la CLI no lo necesita
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return [r for part in pool.map(fn, _chunks(iterable, chunk_size)) for r in part]
+
+    def sign_many(self, pairs, workers: int = 0, chunk_size: int = DEFAULT_CHUNK) -> list:
+        """Firma un iterable de ``(hash, timestamp)``. Con `workers` > 1 reparte por bloques en hilos."""
+        return self._map(self._sign_chunk, pairs, workers, chunk_size)
+
+    def verify_many(self, triples, workers: int = 0, chunk_size: int = DEFAULT_CHUNK) -> list:
+        """Verifica un iterable de ``(hash, timestamp, firma)``. Devuelve un bool por elemento."""
+        return self._map(self._verify_chunk, triples, workers, chunk_size)
+
+
+@lru_cache(maxsize=32)
+def get_signer(key: str = DEFAULT_KEY) -> HmacSigner:
+    """Firmador compartido por clave (la clave se precomputa una sola vez por proceso)."""
+    return HmacSigner(key)
@@ -0,0 +1,78 @@
+"""Hash (SHA-256 por defecto) en streaming de ficheros de cualquier tamaño.
+
+Se lee en bloques fijos sobre un único buffer reutilizado (``readinto`` +
+``memoryview``) o, para rutas en disco, sobre un ``mmap``; nunca se
+materializa el documento completo como ``bytes`` ni como ``str``.
+"""
+import mmap
+import os
+import time
+from dataclasses import dataclass
+
+from ud1.hashes import DEFAULT_ALGORITHM, get_provider
+
+DEFAULT_CHUNK = 1024 * 1024
+
+
+@dataclass
+class StreamHashResult:
+    hexdigest: str
+    bytes: int
+    seconds: float
+
+    @property
+    def mb_s(self) -> float:
+        return self.bytes / 1e6 / self.seconds if self.seconds > 0 else 0.0
+
+
+def hash_stream(fileobj, chunk_size: int = DEFAULT_CHUNK, total: int = None, on_progress=None, algorithm: str = DEFAULT_ALGORITHM) -> StreamHashResult:
+    """Hashea un fichero binario abierto desde su posición actual.
+
+    `on_progress(bytes_leidos, total)` se llama tras cada bloque (`total` puede ser None).
+    """
+    h = get_provider(algorithm).new()
+    buf = bytearray(chunk_size)
+    view = memoryview(buf)
+    readinto = getattr(fileobj, "readinto", None)
+    done = 0
+    t0 = time.perf_counter()
+    while True:
+        if readinto is not None:
+            n = readinto(buf)
+            if not n:
+                break
+            h.update(view[:n])
+        else:
+            chunk = fileobj.read(chunk_size)
+            if not chunk:
+                break
+            n = len(chunk)
+            h.update(chunk)
+        done += n
+        if on_progress:
+            on_progress(done, total)
+    return StreamHashResult(h.hexdigest(), done, time.perf_counter() - t0)
+
+
+def hash_file(path: str, chunk_size: int = DEFAULT_CHUNK, on_progress=None, algorithm: str = DEFAULT_ALGORITHM) -> StreamHashResult:
+    """Hashea un fichero en disco mediante ``mmap`` (con lectura por bloques si no se puede mapear)."""
+    size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        if size == 0:
+            return hash_stream(f, chunk_size, 0, on_progress, algorithm)
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return hash_stream(f, chunk_size, size, on_progress, algorithm)
+        with mm:
+            h = get_provider(algorithm).new()
+            view = memoryview(mm)
+            t0 = time.perf_counter()
+            try:
+                for off in range(0, size, chunk_size):
+                    h.update(view[off:off + chunk_size])
+                    if on_progress:
+                        on_progress(min(off + chunk_size, size), size)
+            finally:
+                view.release()
+            return StreamHashResult(h.hexdigest(), size, time.perf_counter() - t0)
@@ -0,0 +1,240 @@
+"""Autoridad de sellado de tiempo (TSA) local: servicio asyncio en localhost.
+
+Los clientes envían hashes (JSON por líneas sobre TCP). El servicio los encola y,
+en cada tick, agrupa todo lo pendiente en un árbol de Merkle, sella y firma sólo
+la raíz y devuelve a cada cliente su token con la prueba de inclusión.
+
+    python -m ud1.tsa serve --port 8765
+    python -m ud1.tsa bench --clients 50 --requests 200
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import socket
+import time
+from collections import deque
+from datetime import datetime, timezone
+
+from ud1.merkle import MerkleTree, proof_to_str
+from ud1.signer import DEFAULT_KEY, get_signer
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+
+def _percentile(sorted_values, q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    k = min(len(sorted_values) - 1, max(0, round(q / 100 * (len(sorted_values) - 1))))
+    return sorted_values[k]
+
+
+def latency_summary(latencies) -> dict:
+    vals = sorted(latencies)
+    return {
+        "p50_ms": 1000 * _percentile(vals, 50),
+        "p99_ms": 1000 * _percentile(vals, 99),
+        "max_ms": 1000 * vals[-1] if vals else 0.0,
+    }
+
+
+def _is_sha256_hex(value) -> bool:
+    if not isinstance(value, str) or len(value) != 64:
+        return False
+    try:
+        bytes.fromhex(value)
+    except ValueError:
+        return False
+    return True
+
+
+class TimestampAuthority:
+    def __init__(self, key: str = DEFAULT_KEY, tick: float = 0.02, max_batch: int = 50_000):
+        self.signer = get_signer(key)
+        self.tick = tick
+        self.max_batch = max_batch
+        self._queue = None
+        self._latencies = deque(maxlen=100_000)
+        self._started = time.perf_counter()
+        self.tokens = 0
+        self.batches = 0
+
+    async def submit(self, hash_hex: str) -> dict:
+        fut = asyncio.get_running_loop().create_future()
+        await self._queue.put((hash_hex, fut, time.perf_counter()))
+        return await fut
+
+    def _seal(self, items) -> None:
+        tree = MerkleTree([h for h, _, _ in items])
+        ts = datetime.now(timezone.utc).isoformat(timespec="milliseconds")
+        root = tree.root
+        firma = self.signer.sign(root, ts)
+        self.batches += 1
+        now = time.perf_counter()
+        for i, (h, fut, t_in) in enumerate(items):
+            if fut.done():  # el cliente se desconectó
+                continue
+            fut.set_result({
+                "hash": h,
+                "timestamp": ts,
+                "lote": self.batches,
+                "raiz_merkle": root,
+                "prueba_merkle": proof_to_str(tree.proof(i)),
+                "pseudo_firma": firma,
+            })
+            self._latencies.append(now - t_in)
+        self.tokens += len(items)
+
+    async def _ticker(self) -> None:
+        while True:
+            await asyncio.sleep(self.tick)
+            items = []
+            while not self._queue.empty() and len(items) < self.max_batch:
+                items.append(self._queue.get_nowait())
+            if items:
+                self._seal(items)
+
+    def stats(self) -> dict:
+        uptime = time.perf_counter() - self._started
+        return {
+            "tokens": self.tokens,
+            "lotes": self.batches,
+            "tamano_medio_lote": self.tokens / self.batches if self.batches else 0.0,
+            "pendientes": self._queue.qsize() if self._queue else 0,
+            "tokens_por_s": self.tokens / uptime if uptime else 0.0,
+            **latency_summary(self._latencies),
+        }
+
+    async def _handle(self, reader, writer) -> None:
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    req = json.loads(line)
+                    if not isinstance(req, dict):
+                        resp = {"error": "La petición debe ser un objeto JSON."}
+                    elif req.get("op", "stamp") == "stats":
+                        resp = self.stats()
+                    elif _is_sha256_hex(req.get("hash")):
+                        resp = await self.submit(req["hash"].lower())
+                    else:
+                        resp = {"error": "Se esperaba 'hash' SHA-256 en hexadecimal (64 caracteres)."}
+                except ValueError:
+                    resp = {"error": "Petición JSON no válida."}
+                writer.write(json.dumps(resp).encode("utf-8") + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT):
+        """Arranca el servidor y el ticker en el bucle actual. Devuelve el `asyncio.Server`."""
+        self._queue = asyncio.Queue()
+        self._started = time.perf_counter()
+        self._ticker_task = asyncio.get_running_loop().create_task(self._ticker())
+        return await asyncio.start_server(self._handle, host, port)
+
+
+class TSAClient:
+    """Cliente síncrono (bloqueante) para la pestaña S2 y scripts."""
+
+    def __init__(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, timeout: float = 5.0):
+        self.host, self.port, self.timeout = host, port, timeout
+
+    def _call(self, payload: dict) -> dict:
+        with socket.create_connection((self.host, self.port), timeout=self.timeout) as sock:
+            sock.sendall(json.dumps(payload).encode("utf-8") + b"\n")
+            with sock.makefile("rb") as f:
+                resp = json.loads(f.readline())  # respuesta vacía → ValueError
+        if not isinstance(resp, dict):
+            raise ValueError("Respuesta de la TSA no válida.")
+        if "error" in resp:
+            raise ValueError(resp["error"])
+        return resp
+
+    def stamp(self, hash_hex: str) -> dict:
+        return self._call({"op": "stamp", "hash": hash_hex})
+
+    def stats(self) -> dict:
+        return self._call({"op": "stats"})
+
+
+async def _client_worker(host, port, n_requests, latencies, client_id) -> None:
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for i in range(n_requests):
+            h = hashlib.sha256(f"{client_id}:{i}".encode("utf-8")).hexdigest()
+            t0 = time.perf_counter()
+            writer.write(json.dumps({"hash": h}).encode("utf-8") + b"\n")
+            await writer.drain()
+            await reader.readline()
+            latencies.append(time.perf_counter() - t0)
+    finally:
+        writer.close()
+
+
+async def run_load(clients: int = 50, requests: int = 200, host: str = None, port: int = None, tick: float = 0.02) -> dict:
+    """Carga con `clients` conexiones concurrentes. Sin host, levanta una TSA en proceso."""
+    server = tsa = None
+    if host is None:
+        tsa = TimestampAuthority(tick=tick)
+        server = await tsa.start(DEFAULT_HOST, 0)
+        host, port = DEFAULT_HOST, server.sockets[0].getsockname()[1]
+    latencies = []
+    t0 = time.perf_counter()
+    await asyncio.gather(*(_client_worker(host, port, requests, latencies, c) for c in range(clients)))
+    elapsed = time.perf_counter() - t0
+    report = {
+        "clientes": clients,
+        "peticiones": len(latencies),
+        "segundos": elapsed,
+        "tokens_por_s": len(latencies) / elapsed if elapsed else 0.0,
+        **latency_summary(latencies),
+    }
+    if tsa is not None:
+        report["lotes"] = tsa.batches
+        report["tamano_medio_lote"] = tsa.tokens / tsa.batches if tsa.batches else 0.0
+        server.close()
+        await server.wait_closed()
+    return report
+
+
+async def _serve_forever(host: str, port: int, tick: float) -> None:
+    tsa = TimestampAuthority(tick=tick)
+    server = await tsa.start(host, port)
+    print(f"TSA local escuchando en {host}:{port} (tick {tick*1000:.0f} ms)")
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m ud1.tsa", description="TSA local de la UD1")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p_serve = sub.add_parser("serve", help="arranca el servicio")
+    p_serve.add_argument("--host", default=DEFAULT_HOST)
+    p_serve.add_argument("--port", type=int, default=DEFAULT_PORT)
+    p_serve.add_argument("--tick", type=float, default=0.02, help="segundos entre lotes")
+    p_bench = sub.add_parser("bench", help="prueba de carga")
+    p_bench.add_argument("--clients", type=int, default=50)
+    p_bench.add_argument("--requests", type=int, default=200)
+    p_bench.add_argument("--host", default=None, help="TSA externa (por defecto, una en proceso)")
+    p_bench.add_argument("--port", type=int, default=DEFAULT_PORT)
+    p_bench.add_argument("--tick", type=float, default=0.02)
+    args = parser.parse_args(argv)
+
+    if args.cmd == "serve":
+        try:
+            asyncio.run(_serve_forever(args.host, args.port, args.tick))
+        except KeyboardInterrupt:
+            pass
+    else:
+        report = asyncio.run(run_load(args.clients, args.requests, args.host, args.port, args.tick))
+        print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""Exportación ZIP cacheada e incremental de una carpeta o de un `BlobStore`.
+
+El ZIP vive en disco (``.cache/ud1/``) junto a un manifiesto con la huella del
+origen: nombre, mtime y tamaño de cada fichero de una carpeta, o nombre, sha256
+y tamaño de cada entrada del índice de un `BlobStore`. Si la huella no cambia se
+reutiliza tal cual; si sólo se han añadido ficheros se abren en modo ``"a"`` y se
+comprimen únicamente los nuevos, en sitio (sólo se reescribe el directorio
+central); si alguno se modificó o borró se reconstruye entero en un temporal que
+sustituye al ZIP con ``os.replace``. El manifiesto se borra antes de tocar el ZIP:
+una caída a mitad deja un ZIP sin manifiesto y la siguiente llamada lo reconstruye
+(nunca entradas duplicadas). Nunca se genera en memoria.
+
+Las actualizaciones y las lecturas se serializan también entre procesos (``flock``
+sobre un ``.lock`` junto al ZIP), por si varias réplicas del servidor comparten
+``.cache/``: nadie lee un ZIP mientras otro le añade entradas.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import zipfile
+from contextlib import contextmanager
+
+from ud1 import metrics
+
+try:
+    import fcntl
+except ImportError:  # Windows: sólo el cerrojo entre hilos
+    fcntl = None
+
+CACHE_DIR = os.path.join(".cache", "ud1")
+
+
+def scan(folder: str, suffix: str = ".md") -> dict:
+    """{ruta relativa: [mtime_ns, tamaño]} de los ficheros de `folder` con ese sufijo."""
+    out = {}
+    for root, _, files in os.walk(folder):
+        for name in files:
+            if name.endswith(suffix):
+                full = os.path.join(root, name)
+                try:
+                    st = os.stat(full)
+                except FileNotFoundError:
+                    continue  # borrado entre el listado y el stat
+                out[os.path.relpath(full, folder)] = [st.st_mtime_ns, st.st_size]
+    return out
+
+
+def fingerprint(entries: dict) -> str:
+    raw = json.dumps(sorted(entries.items()), separators=(",", ":")).encode("utf-8")
+    return hashlib.sha256(raw).hexdigest()
+
+
+class ZipExporter:
+    def __init__(self, source, suffix: str = ".md", cache_dir: str = CACHE_DIR):
+        """`source`: ruta de una carpeta u objeto con ``zip_entries()`` y ``path_for(nombre)``."""
+        self.source = source
+        self.suffix = suffix
+        folder = source if isinstance(source, (str, os.PathLike)) else source.root
+        name = hashlib.sha256(os.path.abspath(folder).encode("utf-8")).hexdigest()[:16]
+        os.makedirs(cache_dir, exist_ok=True)
+        self.zip_path = os.path.join(cache_dir, f"zip_{name}.zip")
+        self._manifest_path = os.path.join(cache_dir, f"zip_{name}.json")
+        self._lock_path = os.path.join(cache_dir, f"zip_{name}.lock")
+        self._lock = threading.RLock()
+        self.last_added = 0       # ficheros comprimidos en la última actualización
+        self.last_rebuilt = False
+
+    @contextmanager
+    def _process_lock(self):
+        if fcntl is None:
+            yield
+            return
+        with open(self._lock_path, "a") as f:
+            with metrics.span("zip_lock_wait"):
+                fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _load_manifest(self) -> dict:
+        try:
+            with open(self._manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        # Un ZIP a medio escribir (caída durante una actualización) obliga a reconstruir
+        return manifest if zipfile.is_zipfile(self.zip_path) else {}
+
+    def _save_manifest(self, entries: dict) -> None:
+        tmp = self._manifest_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"fingerprint": fingerprint(entries), "entries": entries}, f)
+        os.replace(tmp, self._manifest_path)
+
+    def _drop_manifest(self) -> None:
+        try:
+            os.remove(self._manifest_path)
+        except FileNotFoundError:
+            pass
+
+    def _entries(self) -> dict:
+        if isinstance(self.source, (str, os.PathLike)):
+            return scan(self.source, self.suffix)
+        return self.source.zip_entries()
+
+    def _path(self, rel: str) -> str:
+        if isinstance(self.source, (str, os.PathLike)):
+            return os.path.join(self.source, rel)
+        return self.source.path_for(rel)
+
+    def _write(self, zf: zipfile.ZipFile, names) -> int:
+        n = 0
+        for rel in names:
+            try:
+                zf.write(self._path(rel), arcname=rel)
+                n += 1
+            except FileNotFoundError:
+                pass
+        return n
+
+    def _update(self) -> str:
+        # Requiere los dos cerrojos
+        entries = self._entries()
+        manifest = self._load_manifest()
+        if manifest.get("fingerprint") == fingerprint(entries):
+            self.last_added, self.last_rebuilt = 0, False
+            return self.zip_path
+        old = manifest.get("entries")
+        only_added = old is not None and all(entries.get(k) == v for k, v in old.items())
+        # Sin manifiesto mientras se modifica el ZIP: si el proceso cae a mitad,
+        # la siguiente llamada reconstruye en lugar de volver a añadir altas
+        self._drop_manifest()
+        if only_added:
+            # Sólo altas: se comprimen los ficheros nuevos y se reescribe el directorio central
+            with zipfile.ZipFile(self.zip_path, "a", compression=zipfile.ZIP_DEFLATED) as zf:
+                self.last_added = self._write(zf, sorted(set(entries) - set(old)))
+        else:
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(self.zip_path), suffix=".zip.tmp")
+            try:
+                with os.fdopen(fd, "wb") as out, zipfile.ZipFile(out, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+                    self.last_added = self._write(zf, sorted(entries))
+                os.replace(tmp, self.zip_path)
+            except BaseException:
+                os.remove(tmp)
+                raise
+        self.last_rebuilt = not only_added
+        self._save_manifest(entries)
+        return self.zip_path
+
+    def update(self) -> str:
+        """Pone el ZIP al día con la carpeta y devuelve su ruta."""
+        with self._lock, self._process_lock(), metrics.span("zip_update"):
+            return self._update()
+
+    def read(self) -> bytes:
+        """Contenido del ZIP actualizado (para `st.download_button(data=exp.read)`).
+
+        Se lee bajo los mismos cerrojos que la actualización, porque las altas
+        modifican el fichero en sitio, y el descriptor se cierra antes de devolver.
+        """
+        with self._lock, self._process_lock():
+            with metrics.span("zip_update"):
+                path = self._update()
+            with open(path, "rb") as f:
+                return f.read()
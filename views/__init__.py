@@ -0,0 +1 @@
+"""Páginas de la UD1 para el lanzador multipágina (``streamlit run app.py``)."""
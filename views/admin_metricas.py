@@ -0,0 +1,54 @@
+"""Panel oculto de métricas (sólo con ``UD1_METRICS=1``): tiempos por span, página y sesión."""
+import pandas as pd
+import streamlit as st
+
+from ud1 import metrics
+from views.common import session_id
+
+st.title("Métricas de rerun (admin)")
+if not metrics.enabled():
+    st.info("La instrumentación está desactivada. Arranca la app con `UD1_METRICS=1`.")
+    st.stop()
+
+propia = session_id()
+sesiones = metrics.sessions()
+st.caption(f"{len(sesiones)} sesión(es) con métricas · esta sesión: `{propia[:8]}`")
+
+ambito = st.selectbox(
+    "Ámbito", ["Todas las sesiones"] + sesiones,
+    format_func=lambda s: s if s == "Todas las sesiones" else f"Sesión {s[:8]}" + (" (esta)" if s == propia else ""),
+    key="admin_scope",
+)
+filas = metrics.snapshot(None if ambito == "Todas las sesiones" else ambito)
+if not filas:
+    st.caption("Aún no hay observaciones.")
+    st.stop()
+
+df = pd.DataFrame(filas).sort_values("total_s", ascending=False)
+for col in ("total_s", "media_s", "p50_s", "p95_s", "p99_s", "max_s"):
+    df[col.replace("_s", "_ms")] = df.pop(col) * 1e3
+st.dataframe(df, width="stretch", hide_index=True)
+
+spans = sorted({(f["span"], f["pagina"]) for f in filas})
+sel = st.selectbox("Histograma", spans, format_func=lambda t: f"{t[0]} · {t[1]}", key="admin_hist")
+reg = metrics.REGISTRY if ambito == "Todas las sesiones" else metrics.session_registry(ambito)
+hist = next((h for n, p, h in reg.items() if (n, p) == sel), None) if reg else None
+if hist is not None:
+    etiquetas = [f"≤{le * 1e3:g} ms" if le != float("inf") else "más" for le in metrics.BUCKETS]
+    st.bar_chart(pd.DataFrame({"observaciones": hist.counts}, index=pd.Index(etiquetas, name="bucket")))
+
+st.markdown("#### Volcado")
+c1, c2, c3 = st.columns([2, 1, 1])
+destino = metrics.dump_path()
+c1.markdown(f"Destino: `{destino}`", help="Se fija al arrancar con `UD1_METRICS_DUMP` (por defecto "
+            f"`{metrics.DUMP_PATH}`). `.prom`/`.txt` → formato de texto de Prometheus; cualquier otra extensión → JSONL.")
+if c2.button("💾 Volcar", key="admin_dump"):
+    try:
+        st.success(f"Métricas escritas en {metrics.dump()}")
+    except OSError as e:
+        st.error(f"No se pudo escribir {destino}: {e}")
+c3.download_button("⬇️ Prometheus", data=metrics.to_prometheus, file_name="ud1_metrics.prom",
+                   mime="text/plain", key="admin_prom")
+if st.button("🧹 Reiniciar métricas", key="admin_reset"):
+    metrics.reset()
+    st.rerun()
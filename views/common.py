@@ -0,0 +1,148 @@
+"""Recursos compartidos por las páginas de la UD1.
+
+Sólo importa lo que necesitan todas las páginas; pandas y los motores pesados se
+cargan dentro de las funciones o en la página que los usa.
+"""
+import functools
+import os
+from datetime import datetime
+
+import streamlit as st
+
+from ud1 import metrics
+from ud1.blob_store import BlobStore
+from ud1.hashes import DEFAULT_ALGORITHM
+from ud1.stream_hash import hash_stream
+from ud1.zip_export import ZipExporter
+
+PRIMARY = "#0f766e"
+DOCS_PAGE_SIZE = 50
+FILES_PAGE_SIZE = 20
+
+# Claves que deben sobrevivir al cambio de página: Streamlit descarta el estado de
+# los widgets que no se dibujan en un rerun, y sólo se dibuja la página activa.
+PERSISTENT_KEYS = (
+    "s1_pick", "s1_text", "s1_doc_query", "s1_entrega_text",
+    "s2_text", "s2_use_tsa", "s6_s1_extra",
+)
+
+# ---------------------------
+# Utilidades
+# ---------------------------
+def keep_state(keys=PERSISTENT_KEYS) -> None:
+    """Reasigna las claves para que no se pierdan al pasar por otra página."""
+    for k in keys:
+        if k in st.session_state:
+            st.session_state[k] = st.session_state[k]
+
+def session_id() -> str:
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+    ctx = get_script_run_ctx()
+    return ctx.session_id if ctx else ""
+
+def header() -> None:
+    st.title("UD1 — La confianza en el Derecho y la tecnología")
+    st.caption("Asignatura: *Blockchain: fundamentos técnicos y problemática jurídica*")
+
+    c1, c2, c3, c4 = st.columns(4)
+    c1.metric("S1", "Hash & Integridad", delta="Registro vs Cadena")
+    c2.metric("S2", "Sellado de tiempo", delta="Pseudo-firma (HMAC)")
+    c3.metric("Lecturas", "Nakamoto & Lessig", delta="Preguntas guía")
+    c4.metric("Entrega", "S1 + S2", delta="Exportación incluida")
+    st.divider()
+
+def hash_upload(uploaded, algorithm: str = DEFAULT_ALGORITHM):
+    """Hash por bloques de un fichero subido, cacheado por sesión y algoritmo (no se rehashea en cada rerun)."""
+    cache = st.session_state.setdefault("upload_hashes", {})
+    key = uploaded.file_id if algorithm == DEFAULT_ALGORITHM else (uploaded.file_id, algorithm)
+    if key not in cache:
+        barra = st.progress(0.0, text=f"Hasheando {uploaded.name}...")
+        uploaded.seek(0)
+        with metrics.span("upload_hash"):
+            cache[key] = hash_stream(
+                uploaded, chunk_size=4 * 1024 * 1024, total=uploaded.size, algorithm=algorithm,
+                on_progress=lambda n, total: barra.progress(min(n / total, 1.0) if total else 1.0, text=f"{n / 1e6:,.1f} MB"),
+            )
+        barra.empty()
+    return cache[key]
+
+def saved_files_browser(folder: str, key: str, empty_msg: str) -> int:
+    """Listado paginado y filtrable de los .md de `folder`; el contenido se lee sólo al descargar."""
+    index = get_artifact_store(folder)
+    if not len(index):
+        st.caption(empty_msg)
+        return 0
+    fc1, fc2 = st.columns([3, 1])
+    query = fc1.text_input("Filtrar por nombre", key=f"{key}_query")
+    total = index.count(query)
+    n_pages = max(1, (total + FILES_PAGE_SIZE - 1) // FILES_PAGE_SIZE)
+    if st.session_state.get(f"{key}_page", 1) > n_pages:
+        st.session_state[f"{key}_page"] = n_pages  # el filtro ha reducido el nº de páginas
+    number = fc2.number_input(f"Página (de {n_pages})", 1, n_pages, 1, key=f"{key}_page") if n_pages > 1 else 1
+    entries, total = index.page(int(number), FILES_PAGE_SIZE, query)
+    st.caption(f"{total:,} de {len(index):,} archivo(s)")
+    for e in entries:
+        st.download_button(
+            label=f"⬇️ Descargar {e.name}",
+            data=functools.partial(index.read, e.name),
+            file_name=e.name,
+            mime="text/markdown",
+            key=f"{key}_{e.name}",
+            help=f"{e.size:,} B · {datetime.fromtimestamp(e.mtime_ns / 1e9):%Y-%m-%d %H:%M} · sha256 {e.sha256[:16]}…",
+        )
+    return len(index)
+
+# ---------------------------
+# Recursos compartidos entre sesiones
+# ---------------------------
+@st.cache_resource
+def get_docs_index():
+    """Índice SQLite de data/docs_demo.csv (en .cache/), compartido entre sesiones."""
+    from ud1.docs_index import DocsIndex
+    if os.path.exists("data/docs_demo.csv"):
+        return DocsIndex.for_csv("data/docs_demo.csv")
+    st.warning("No se encontró data/docs_demo.csv. Cargando ejemplos por defecto.")
+    return DocsIndex.from_rows([
+        (1, "Nacimiento de Juan Pérez, 15/03/1995, Madrid. Registro Civil Sección 3ª, Tomo 122, Folio 45."),
+        (2, "Matrimonio de Ana López y Luis García, 20/06/2010, Sevilla. Acta nº 6789."),
+        (3, "Defunción de María Díaz, 02/11/1980, Valencia. Certificado emitido por el Encargado del Registro."),
+    ])
+
+@st.cache_data
+def load_modelos_confianza():
+    import pandas as pd
+    try:
+        df = pd.read_csv("data/modelos_confianza.csv")
+        return df
+    except Exception:
+        st.warning("No se encontró data/modelos_confianza.csv. Cargando tabla por defecto.")
+        return pd.DataFrame({
+            "modelo": ["TTP", "Blockchain"],
+            "rol": ["Notarías/Registro", "Nodos/Validadores"],
+            "garantia": ["Fe pública", "Inmutabilidad probabilística"],
+            "mecanismos": ["Identidad verificada", "Criptografía+Consenso"],
+            "riesgos": ["Error humano", "Errores de clave/gobernanza"],
+            "ejemplos": ["Registro Civil", "Bitcoin/Ethereum"]
+        })
+
+@st.cache_resource
+def get_artifact_store(folder: str) -> BlobStore:
+    """Almacén por contenido de la carpeta (blobs + índice de nombres), compartido entre sesiones."""
+    return BlobStore(folder)
+
+@st.cache_resource
+def get_zip_exporter(folder: str) -> ZipExporter:
+    """ZIP en disco de la carpeta, actualizado sólo cuando cambia su contenido."""
+    return ZipExporter(get_artifact_store(folder))
+
+@st.cache_resource
+def get_ledger():
+    """Ledger S2 persistente (``./ledger`` o ``UD1_LEDGER_DIR``), compartido por todas las sesiones del servidor."""
+    from ud1.ledger_store import LedgerStore
+    return LedgerStore(os.environ.get("UD1_LEDGER_DIR", "ledger"), checkpoint_every=64)
+
+@st.cache_resource
+def get_ledger_view():
+    """Buffer columnar de las últimas filas del ledger, compartido entre sesiones."""
+    from ud1.ledger_view import LedgerView
+    return LedgerView(get_ledger())
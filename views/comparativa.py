@@ -0,0 +1,130 @@
+"""4) Comparativa Registro Civil vs Ledger distribuido."""
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+
+from ud1.replication import scaling, simulate
+
+st.header("Registro Civil (folio/libro) vs Ledger distribuido (bloques)")
+comp = pd.DataFrame([
+    {
+        "Función jurídica": "Identificación / Autenticidad",
+        "Derecho (Registro Civil)": "Autoridad del Encargado; verificación de identidad; formalidades; fe pública.",
+        "Tecnología (Ledger)": "Firmas criptográficas; claves públicas; control de acceso y/o permisos."
+    },
+    {
+        "Función jurídica": "Integridad",
+        "Derecho (Registro Civil)": "Cadena de asientos; controles; sellos; copias auténticas.",
+        "Tecnología (Ledger)": "Hash y encadenamiento; detección inmediata de cambios."
+    },
+    {
+        "Función jurídica": "Trazabilidad / Historial",
+        "Derecho (Registro Civil)": "Asientos cronológicos; certificaciones; anotaciones marginales.",
+        "Tecnología (Ledger)": "Historial replicado; timestamps; exploradores de bloques."
+    },
+    {
+        "Función jurídica": "Publicidad / Oponibilidad",
+        "Derecho (Registro Civil)": "Publicidad formal bajo la ley; efectos frente a terceros.",
+        "Tecnología (Ledger)": "Replicación y lectura compartida; depende del diseño (público/permisionado)."
+    },
+    {
+        "Función jurídica": "Gobernanza",
+        "Derecho (Registro Civil)": "Normas, jerarquía, recursos, control judicial.",
+        "Tecnología (Ledger)": "Reglas de consenso y upgrades; gobernanza on/off-chain."
+    },
+])
+st.dataframe(comp, width="stretch")
+st.info("La tecnología replica muy bien integridad y trazabilidad; autenticidad y oponibilidad suelen requerir capa jurídica adicional.")
+
+st.divider()
+st.subheader("Simulación: réplica y consenso")
+st.caption("N nodos replican el ledger: un líder elegido por mayoría propone un bloque cada intervalo y lo confirma "
+           "cuando lo tiene más de la mitad. La red tiene latencia y pérdida; si el líder cae, se elige otro y los "
+           "bloques que no llegaron a una mayoría pueden quedar huérfanos (bifurcación). El tiempo es simulado.")
+c1, c2, c3 = st.columns(3)
+nodos = c1.slider("Nodos", 3, 500, 25, key="s4_nodos")
+latencia = c2.slider("Latencia de red (ms)", 1, 300, 20, key="s4_latencia")
+jitter = c3.slider("Variación (jitter, ms)", 0, 200, 10, key="s4_jitter")
+c4, c5, c6 = st.columns(3)
+perdida = c4.slider("Pérdida de mensajes (%)", 0, 40, 0, key="s4_perdida") / 100
+intervalo = c5.slider("Intervalo de bloque (ms)", 20, 2000, 100, step=10, key="s4_intervalo")
+duracion = c6.slider("Duración simulada (s)", 1, 60, 10, key="s4_duracion") * 1000
+c7, c8, c9 = st.columns(3)
+caida = c7.slider("Caída del líder cada (s, 0 = nunca)", 0, 30, 0, key="s4_caida") * 1000
+semilla = c8.number_input("Semilla", min_value=0, value=0, key="s4_semilla")
+
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def _replica(**kwargs):
+    return simulate(**kwargs)
+
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def _escalado(nodes, **kwargs):
+    return scaling(nodes, **kwargs)
+
+
+params = {"latencia": float(latencia), "jitter": float(jitter), "perdida": perdida, "intervalo_bloque": float(intervalo),
+          "duracion": float(duracion), "caida_cada": float(caida), "semilla": int(semilla)}
+if c9.button("▶️ Simular", key="s4_simular"):
+    with st.spinner("Simulando la red…"):
+        st.session_state.s4_resultado = _replica(nodos=nodos, **params)
+res = st.session_state.get("s4_resultado")
+if res is not None:
+    r = res.summary()
+    st.caption(f"{res.config.nodos} nodos · {res.eventos:,} eventos en {res.segundos:.2f} s reales "
+               f"({res.eventos_por_s:,.0f} eventos/s)")
+    m1, m2, m3, m4 = st.columns(4)
+    m1.metric("Bloques confirmados/s", f"{res.bloques_por_s:.2f}", help=f"{res.tx_por_s:,.0f} tx/s")
+    m2.metric("Latencia de confirmación p95", f"{r['latencia_confirmacion_ms']['p95']:.0f} ms",
+              help=f"p50 {r['latencia_confirmacion_ms']['p50']:.0f} ms")
+    m3.metric("Retraso de réplica p95", f"{r['retraso_replicacion_ms']['p95']:.0f} ms",
+              help=f"p50 {r['retraso_replicacion_ms']['p50']:.0f} ms · nodo más atrasado: {res.retraso_altura} bloques")
+    m4.metric("Tasa de bifurcación", f"{res.tasa_bifurcacion:.1%}",
+              help=f"{res.huerfanos} bloques huérfanos · {res.truncados} borrados en seguidores")
+    m5, m6, m7, m8 = st.columns(4)
+    m5.metric("Líderes elegidos", res.elecciones, help=f"{res.candidaturas} rondas de votación")
+    m6.metric("Mensajes", f"{res.mensajes:,}", help=f"{res.perdidos:,} perdidos")
+    m7.metric("Bloques propuestos", res.bloques_propuestos)
+    m8.metric("Réplicas coherentes", "sí" if res.consistente else "NO")
+
+    fig_c = go.Figure()
+    fig_c.add_scatter(x=res.confirmaciones / 1000, y=list(range(1, len(res.confirmaciones) + 1)),
+                      mode="lines", line_shape="hv", name="confirmados")
+    for t, nodo, term in res.lideres:
+        fig_c.add_vline(x=t / 1000, line_dash="dot", annotation_text=f"líder {nodo} (t{term})")
+    fig_c.update_layout(title="Bloques confirmados", xaxis_title="s simulados", yaxis_title="altura",
+                        template="plotly_dark")
+    st.plotly_chart(fig_c, width="stretch")
+
+    fig_l = go.Figure()
+    fig_l.add_histogram(x=res.retraso_replicacion, nbinsx=60)
+    fig_l.update_layout(title="Retraso de réplica (propuesta → llegada a cada seguidor)", xaxis_title="ms",
+                        yaxis_title="réplicas", template="plotly_dark")
+    st.plotly_chart(fig_l, width="stretch")
+
+st.markdown("##### Escalado con el número de nodos")
+tamaños = st.multiselect("Nodos", [3, 5, 25, 50, 100, 250, 500], [5, 25, 100, 250, 500], key="s4_tamaños")
+if st.button("📈 Medir escalado", key="s4_escalar", disabled=not tamaños):
+    with st.spinner("Simulando cada tamaño de red…"):
+        st.session_state.s4_escalado = _escalado(tuple(sorted(tamaños)), **params)
+filas = st.session_state.get("s4_escalado")
+if filas:
+    df = pd.DataFrame([{
+        "nodos": f["nodos"], "bloques/s": f["bloques_por_s"],
+        "confirmación p95 (ms)": f["latencia_confirmacion_ms"]["p95"],
+        "réplica p95 (ms)": f["retraso_replicacion_ms"]["p95"],
+        "bifurcación": f["tasa_bifurcacion"], "candidaturas": f["candidaturas"],
+        "mensajes": f["mensajes"], "eventos/s": f["eventos_por_s"], "s reales": f["segundos"],
+    } for f in filas])
+    st.dataframe(df, width="stretch", hide_index=True)
+    fig_s = go.Figure()
+    fig_s.add_scatter(x=df["nodos"], y=df["bloques/s"], mode="lines+markers", name="bloques/s")
+    fig_s.add_scatter(x=df["nodos"], y=df["réplica p95 (ms)"], mode="lines+markers", name="réplica p95 (ms)",
+                      yaxis="y2")
+    fig_s.update_layout(title="Throughput y retraso frente a N", xaxis_title="nodos", xaxis_type="log",
+                        yaxis_title="bloques/s", yaxis2={"title": "ms", "overlaying": "y", "side": "right"},
+                        template="plotly_dark")
+    st.plotly_chart(fig_s, width="stretch")
+    st.caption("Con muchos nodos, varios agotan su timeout a la vez y las votaciones se dividen: "
+               "hacen falta más rondas para elegir líder y el ledger no avanza mientras tanto.")
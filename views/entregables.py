@@ -0,0 +1,81 @@
+"""6) Entregables y rúbrica: descargas, ZIP y borrado de entregas."""
+import io
+
+import pandas as pd
+import streamlit as st
+
+from views.common import get_artifact_store, get_zip_exporter, saved_files_browser
+
+def download_csv_button(df: pd.DataFrame, label: str, filename: str):
+    buf = io.StringIO()
+    df.to_csv(buf, index=False)
+    st.download_button(label, buf.getvalue(), file_name=filename, mime="text/csv")
+
+
+st.header("Entregables (Semana 1) y rúbrica")
+
+st.info(
+    "ℹ️ **Dónde se guardan y cómo bajarlas**\n\n"
+    "Cuando pulsas **Guardar entrega**, el archivo se crea en el **servidor** dentro de `./entregas`. "
+    "Desde **esta última página** puedes **descargar cada entrega** o **todas en ZIP** al ordenador. "
+    "Si trabajas en un entorno efímero, te recomiendo **descargar** tras guardar."
+)
+
+st.subheader("Entrega S1 — 5 líneas (hash y cadena de custodia)")
+s1_extra = st.text_area("(Opcional) Pegar explicación S1 aquí:", height=120, key="s6_s1_extra")
+
+st.subheader("Entrega S2 — Cuadro comparativo: confianza humana vs algorítmica")
+cols = ["Aspecto", "Confianza humana (TTP)", "Confianza algorítmica (Blockchain)"]
+s2_base = pd.DataFrame([
+    ["Garantía de veracidad", "Fe pública / autoridad / procedimiento", "Criptografía / consenso / réplica"],
+    ["Integridad", "Sellos, controles, copias auténticas", "Hash encadenado, detección de cambios"],
+    ["Trazabilidad", "Asientos cronológicos y certificaciones", "Historial inmutable con timestamp"],
+    ["Identidad", "Verificación presencial/administrativa", "Claves públicas; capas de identidad externa"],
+    ["Oponibilidad", "Efectos legales frente a terceros", "Depende del reconocimiento normativo/gobernanza"],
+], columns=cols)
+s2_edit = st.data_editor(s2_base, num_rows="dynamic", width="stretch")
+
+cL, cR = st.columns([1, 1])
+with cL:
+    if st.button("⬇️ Exportar comparativo S2 (CSV)"):
+        download_csv_button(s2_edit, "Descargar CSV", "S2_comparativo.csv")
+with cR:
+    st.caption("Rúbrica: precisión (40%), claridad (30%), aplicación (30%).")
+
+st.markdown("---")
+
+# Entregas guardadas
+st.markdown("#### Entregas guardadas (en el servidor)")
+md_files = saved_files_browser("entregas", "dl_file", "No hay entregas guardadas aún.")
+
+# ZIP masivo de entregas
+st.markdown("#### Exportación masiva")
+if md_files:
+    # El ZIP se prepara al pulsar (no en cada rerun) y sólo comprime lo nuevo
+    st.download_button(
+        "⬇️ Descargar TODO (ZIP)",
+        data=get_zip_exporter("entregas").read,
+        file_name="entregas_ud1.zip",
+        mime="application/zip",
+        key="zip_entregas_ud1"
+    )
+else:
+    st.caption("No hay entregas .md para comprimir aún.")
+
+# Borrado tras descarga (con confirmación)
+st.markdown("#### Borrado tras descarga")
+confirm = st.checkbox("He descargado mis entregas y quiero borrarlas del servidor")
+if st.button("🧹 Borrar todas las entregas (.md)", disabled=not confirm):
+    removed = get_artifact_store("entregas").clear()
+    if removed > 0:
+        st.success(f"Se borraron {removed} archivo(s) .md de la carpeta 'entregas'.")
+    else:
+        st.warning("No había archivos .md que borrar.")
+
+st.markdown(
+    """
+**Resultado de aprendizaje (UD1):** identificar funciones del Derecho que replica la tecnología (**RA1**),
+evaluar herramientas básicas de privacidad/ciberseguridad (**RA2**), y aplicar nociones de sistemas de información (**RA3**).
+"""
+)
+st.caption("Aviso: la pseudo-firma HMAC es docente; no equivale a firma electrónica cualificada.")
@@ -0,0 +1,82 @@
+"""5) Lecturas guiadas: guía de estudio, materiales guardados y ZIP."""
+from datetime import datetime
+
+import streamlit as st
+
+from views.common import get_artifact_store, get_zip_exporter, saved_files_browser
+
+st.header("Lecturas y guía de estudio")
+st.markdown(
+    """
+**Nakamoto (2008), introducción**  
+- Problema: pagos P2P sin TTP.  
+- Claves: transacciones encadenadas, PoW, timestamp, nodos honestos.  
+- Preguntas: (1) Sustituto del TTP; (2) Timestamp y doble gasto; (3) Réplica/propagación.
+
+**Lessig (1999), Cap. 1 — “Code is Law”**  
+- Tesis: el código regula la conducta como la ley/mercado/normas.  
+- Preguntas: arquitectura y posibilidad jurídica; auditabilidad/gobernanza; controles en pública vs permisionada.
+
+**Actividad de integración (UD1):**  
+- 3 funciones replicadas por tecnología: integridad, trazabilidad, disponibilidad.  
+- 2 funciones que dependen de la norma: identidad fuerte, oponibilidad frente a terceros.
+"""
+)
+
+# Generar/guardar guía y ofrecer descarga inmediata
+if st.button("📄 Generar y guardar guía de lectura (MD)"):
+    ts = datetime.now().strftime("%Y%m%d_%H%M%S")
+    content = """# Guía de lectura — UD1
+
+## Nakamoto (2008), introducción
+- Problema: pagos P2P sin TTP.
+- Claves: cadena de transacciones, PoW, timestamp, nodos honestos.
+- Preguntas: (1) Sustituto del TTP; (2) Timestamp y doble gasto; (3) Réplica/propagación.
+
+## Lessig (1999), Cap. 1
+- Tesis: el código regula (como la ley/mercado/normas).
+- Preguntas: arquitectura y posibilidad jurídica; auditabilidad/gobernanza; controles en pública vs permisionada.
+
+## Integración
+- 3 funciones replicadas: integridad, trazabilidad, disponibilidad.
+- 2 dependientes: identidad fuerte, oponibilidad/efectos frente a terceros.
+"""
+    # La guía es siempre la misma: si ya está guardada se reutiliza en lugar de duplicarla
+    art = get_artifact_store("materiales").put(f"UD1_lecturas_{ts}.md", content, reuse=True)
+    if art.name == f"UD1_lecturas_{ts}.md":
+        st.success(f"Guía guardada como {art.name}")
+    else:
+        st.info(f"Esta guía ya estaba guardada como {art.name}")
+
+    # Descarga inmediata
+    st.download_button(
+        "⬇️ Descargar ahora (Guía UD1)",
+        data=content,
+        file_name=art.name,
+        mime="text/markdown",
+        key=f"dl_lect_{ts}"
+    )
+
+st.markdown("---")
+st.info(
+    "ℹ️ **Dónde está la guía:** se guarda en el **servidor** dentro de `./materiales`. "
+    "Aquí abajo puedes **descargar cualquier guía** ya generada o **todas en ZIP**."
+)
+
+# Materiales guardados (descarga por archivo)
+st.markdown("#### Materiales guardados (en el servidor)")
+mats = saved_files_browser("materiales", "dl_mat", "No hay materiales .md generados aún.")
+
+# ZIP masivo de materiales
+st.markdown("#### Exportación masiva")
+if mats:
+    # El ZIP se prepara al pulsar (no en cada rerun) y sólo comprime lo nuevo
+    st.download_button(
+        "⬇️ Descargar TODO (ZIP)",
+        data=get_zip_exporter("materiales").read,
+        file_name="materiales_ud1.zip",
+        mime="application/zip",
+        key="zip_materiales_ud1"
+    )
+else:
+    st.caption("No hay materiales .md para comprimir aún.")
@@ -0,0 +1,201 @@
+"""2) S1 — Hash & Cadena de custodia."""
+from datetime import datetime
+
+import pandas as pd
+import streamlit as st
+
+from ud1 import metrics
+from ud1.avalanche import alter_one_char
+from ud1.chain import HashChain, benchmark_chain, first_divergence, locate_tamper
+from ud1.core import sha256_hex
+from ud1.hashes import available
+from views.common import DOCS_PAGE_SIZE, get_artifact_store, get_docs_index, hash_upload
+
+docs_index = get_docs_index()
+
+# ---------------------------
+# Estado para S1 (selector + texto)
+# ---------------------------
+if "s1_pick" not in st.session_state:
+    st.session_state.s1_pick = docs_index.first_id()
+
+def _load_selected_text_from_pick():
+    """Callback: al cambiar el ID seleccionado, actualiza el texto base y el 'alterado'."""
+    pick = st.session_state["s1_pick"]
+    base_text = docs_index.get(pick) or ""
+    st.session_state["s1_text"] = base_text
+    st.session_state["s1_altered"] = base_text
+
+if "s1_text" not in st.session_state:
+    _load_selected_text_from_pick()
+
+st.header("S1 — Registro centralizado vs cadena con hash")
+st.write("**Objetivo:** ver cómo un cambio mínimo rompe la integridad y cómo una **cadena** dificulta la alteración invisible.")
+
+colA, colB = st.columns([1, 1])
+with colA:
+    st.markdown("#### 2.1 Carga un texto de ejemplo")
+    # Sólo se cargan las filas de la página (o de la búsqueda) visibles, nunca el dataset entero
+    s1_query = st.text_input("Buscar por ID o texto", key="s1_doc_query", placeholder="p. ej. 42 o matrimonio")
+    if s1_query.strip():
+        s1_rows = docs_index.search(s1_query)
+        if not s1_rows:
+            st.caption("Sin resultados.")
+    else:
+        n_doc_pages = docs_index.n_pages(DOCS_PAGE_SIZE)
+        doc_page = 1
+        if n_doc_pages > 1:
+            pos = docs_index.position(st.session_state.s1_pick) or 0
+            doc_page = st.number_input(
+                f"Página (de {n_doc_pages:,}; {len(docs_index):,} registros)",
+                min_value=1, max_value=n_doc_pages, value=pos // DOCS_PAGE_SIZE + 1, key="s1_doc_page",
+            )
+        s1_rows = docs_index.page(int(doc_page), DOCS_PAGE_SIZE)
+        if docs_index.skipped:
+            st.caption(f"⚠️ {docs_index.skipped:,} filas del CSV omitidas (id no entero o repetido).")
+    s1_previews = {doc_id: texto for doc_id, texto in s1_rows}
+    if st.session_state.s1_pick is None:
+        # Corpus vacío: no hay registro demo que elegir, pero el texto se puede escribir a mano
+        st.info("No hay documentos en el corpus; escribe un texto abajo.")
+    else:
+        if st.session_state.s1_pick not in s1_previews:
+            s1_previews = {st.session_state.s1_pick: docs_index.get(st.session_state.s1_pick) or "", **s1_previews}
+        id_list = list(s1_previews)
+        st.selectbox(
+            "Selecciona un registro demo (puedes editarlo luego):",
+            options=id_list,
+            index=id_list.index(st.session_state.s1_pick),
+            format_func=lambda x: f"ID {x} — {s1_previews[x][:60]}",
+            key="s1_pick",
+            on_change=_load_selected_text_from_pick,
+        )
+    st.text_area("Documento (editable):", key="s1_text", height=120)
+
+    s1_file = st.file_uploader("…o sube un documento (PDF, escritura escaneada…) para hashearlo por bloques", key="s1_upload")
+    if s1_file is not None:
+        res_up = hash_upload(s1_file)
+        st.code(res_up.hexdigest)
+        st.caption(f"{s1_file.name}: {res_up.bytes / 1e6:,.1f} MB en {res_up.seconds:.2f} s · {res_up.mb_s:,.0f} MB/s")
+
+    if st.button("🔁 Alterar 1 carácter", key="alter_btn"):
+        st.session_state.s1_altered = alter_one_char(st.session_state.s1_text)
+
+    s1_altered = st.session_state.get("s1_altered", st.session_state.s1_text)
+
+with colB:
+    st.markdown("#### 2.2 Hash original vs alterado")
+    with metrics.span("s1_hash"):
+        h_original = sha256_hex(st.session_state.s1_text)
+        h_alterado = sha256_hex(s1_altered)
+
+    c1_, c2_ = st.columns(2)
+    with c1_:
+        st.caption("Hash original")
+        st.code(h_original)
+    with c2_:
+        st.caption("Hash alterado")
+        st.code(h_alterado)
+
+    if h_original == h_alterado:
+        st.success("Integridad OK: el contenido no ha cambiado.")
+    else:
+        st.error("⚠️ Integridad rota: el hash no coincide. Cadena de custodia comprometida.")
+
+st.markdown("#### 2.3 Cadena simulada de asientos")
+st.write("Cada asiento referencia el hash del anterior (prev_hash). Si alteras el primero, **rompes la cadena**.")
+# La cadena vive en la sesión: editar el texto sólo rehashea desde el asiento 1 hacia delante
+if "s1_chain" not in st.session_state:
+    st.session_state.s1_chain = HashChain([
+        st.session_state.s1_text,
+        "Asiento 2: actualización de domicilio.",
+        "Asiento 3: rectificación ortográfica.",
+    ], checkpoint_every=64)
+chain = st.session_state.s1_chain
+with metrics.span("s1_chain_edit"):
+    chain.set(0, st.session_state.s1_text)
+
+n_extra = st.number_input(
+    "Asientos adicionales (registro simulado)", 0, 500_000, 0, step=1_000, key="s1_chain_extra",
+    help="Amplía la cadena para simular un registro de gran tamaño."
+)
+n_total = 3 + int(n_extra)
+with metrics.span("s1_chain_resize"):
+    if len(chain) < n_total:
+        chain.extend(f"Asiento {i}: anotación marginal." for i in range(len(chain) + 1, n_total + 1))
+    elif len(chain) > n_total:
+        chain.truncate(n_total)
+
+desde = st.number_input("Ver desde el asiento", 1, len(chain), 1, step=50, key="s1_chain_from") if len(chain) > 50 else 1
+with metrics.span("s1_chain_df"):
+    chain_df = pd.DataFrame(chain.rows(int(desde) - 1, int(desde) + 49))
+st.dataframe(chain_df, width="stretch")
+st.caption(f"{len(chain):,} asientos · hash de cabeza `{chain.head[:16]}…`")
+
+with st.expander("🔎 Localizar una manipulación (checkpoints firmados)"):
+    st.caption(
+        f"La cadena firma un checkpoint cada {chain.checkpoint_every} asientos "
+        f"({len(chain.checkpoints):,} checkpoints). Se altera un asiento en una **copia** "
+        "y se localiza por búsqueda binaria: cada comprobación recalcula sólo el tramo desde el último "
+        "checkpoint válido."
+    )
+    pos_tamper = st.number_input("Asiento a manipular en la copia", 1, len(chain), min(len(chain), 2), key="s1_tamper_pos")
+    if st.button("🕵️ Manipular copia y localizar", key="s1_tamper_btn"):
+        copia = chain.copy()
+        copia.set(int(pos_tamper) - 1, "Asiento manipulado.")
+        rep = locate_tamper(copia, chain.checkpoints)
+        if rep.intact:
+            st.warning(
+                f"Los checkpoints cuadran ({rep.probes} comprobaciones): la manipulación está después "
+                f"del último checkpoint (asiento {rep.unchecked_from + 1} en adelante)."
+            )
+            lo, hi = rep.unchecked_from, None
+        else:
+            st.error(f"Checkpoint roto: tramo sospechoso asientos {rep.start + 1}–{rep.end + 1} "
+                     f"({rep.probes} comprobaciones, ≤ {rep.hashed:,} hashes recalculados).")
+            lo, hi = rep.start, rep.end
+        # Con la cadena original como referencia se afina hasta el asiento exacto
+        idx, probes = first_divergence(chain, copia, lo, hi)
+        if idx is not None:
+            st.success(
+                f"Primer asiento alterado: **{idx + 1}** · {rep.probes + probes} comprobaciones "
+                f"(≤ {rep.hashed:,} hashes recalculados) frente a {len(chain):,} de un reescaneo lineal."
+            )
+
+with st.expander("⏱️ Benchmark de la cadena (append, edición, verificación)"):
+    n_bench = st.select_slider("Asientos", options=[10_000, 100_000, 500_000], value=100_000, key="s1_chain_bench_n")
+    alg_bench = st.selectbox("Algoritmo", available(), key="s1_chain_bench_alg")
+    if st.button("Ejecutar benchmark", key="s1_chain_bench"):
+        st.json(benchmark_chain(n_bench, algorithm=alg_bench))
+
+st.markdown("#### 2.4 Entrega S1 — Explica en 5 líneas")
+s1_entrega = st.text_area(
+    "En 5 líneas: ¿por qué el hash soporta la cadena de custodia y qué aporta encadenar hashes?",
+    height=120, key="s1_entrega_text"
+)
+
+colS1a, colS1b = st.columns([1, 1])
+with colS1a:
+    if st.button("💾 Guardar entrega S1 (MD)"):
+        ts = datetime.now().strftime("%Y%m%d_%H%M%S")
+        content = (
+            "# Entrega S1 — Hash & Cadena de custodia\n\n"
+            f"**Fecha:** {ts}\n\n"
+            "## Texto base\n\n"
+            + st.session_state.s1_text + "\n\n"
+            f"**Hash base:** `{h_original}`\n\n"
+            "## Explicación (máx. 5 líneas)\n\n"
+            + (s1_entrega or "").strip() + "\n"
+        )
+        # Dos guardados en el mismo segundo reciben nombres distintos; el contenido se guarda una vez
+        art = get_artifact_store("entregas").put(f"S1_explicacion_{ts}.md", content)
+        st.success(f"Entrega guardada como {art.name} (sha256 {art.sha256[:12]}…)")
+
+        st.download_button(
+            "⬇️ Descargar ahora (S1)",
+            data=content,
+            file_name=art.name,
+            mime="text/markdown",
+            key=f"dl_now_{ts}"
+        )
+with colS1b:
+    st.caption("Criterios: precisión técnica (40%), claridad (30%), conexión con custodia (30%).")
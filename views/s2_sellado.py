@@ -0,0 +1,215 @@
+"""3) S2 — Sellado de tiempo simulado, lotes de Merkle y ledger persistente."""
+import io
+
+import pandas as pd
+import streamlit as st
+
+from ud1 import metrics
+from ud1.chain import locate_tamper
+from ud1.core import now_iso, pseudo_signature, sha256_hex
+from ud1.ledger_verify import verify_csv
+from ud1.merkle import MerkleTree, proof_from_str, proof_to_str, verify_proof
+from ud1.signer import get_signer
+from ud1.tsa import TSAClient
+from views.common import get_ledger, get_ledger_view, hash_upload, load_modelos_confianza
+
+ledger = get_ledger()
+ledger_view = get_ledger_view()
+if "pending_batch" not in st.session_state:
+    st.session_state.pending_batch = []  # [{"texto","hash"}] pendientes de sellar en lote
+
+st.header("S2 — Sellado de tiempo y pseudo-firma")
+st.write("**Objetivo:** registrar (hash, fecha ISO, pseudo-firma) y comparar TTP vs blockchain.")
+
+colL, colR = st.columns([1, 1])
+with colL:
+    s2_text = st.text_area("Texto a registrar (puedes pegar del S1 o nuevo):", height=130, key="s2_text")
+    s2_file = st.file_uploader("…o sella un fichero (se hashea por bloques, sin cargarlo como texto)", key="s2_upload")
+
+    use_tsa = st.checkbox(
+        "Sellar con la TSA local (localhost:8765)", key="s2_use_tsa",
+        help="Arráncala con `python -m ud1.tsa serve`: agrupa las peticiones de todas las sesiones en lotes firmados."
+    )
+
+    if st.button("🕒 Generar hash + timestamp + pseudo-firma"):
+        if s2_file is not None:
+            _hash = hash_upload(s2_file).hexdigest
+            base = {"texto": "", "fichero": s2_file.name}
+        else:
+            _hash = sha256_hex(s2_text)
+            base = {"texto": s2_text}
+        record = None
+        if use_tsa:
+            try:
+                token = TSAClient().stamp(_hash)
+                record = {**base, **token}
+            except (OSError, ValueError) as e:
+                # Sin conexión o con una respuesta de error/vacía: se sella en local igualmente
+                st.error(f"TSA local no disponible ({e}); se sella en esta sesión.")
+        if record is None:
+            _iso = now_iso()
+            _psig = pseudo_signature(_hash, _iso, key="DEMO_SECRET")
+            record = {**base, "hash": _hash, "timestamp": _iso, "pseudo_firma": _psig}
+
+        st.session_state.last_record = record
+        st.success("Registro preparado. Revisa la derecha y pulsa 'Registrar en ledger' si estás conforme.")
+
+    if use_tsa:
+        with st.expander("📈 Estado de la TSA local"):
+            try:
+                st.json(TSAClient(timeout=1.0).stats())
+            except (OSError, ValueError):
+                st.caption("Sin conexión con la TSA local.")
+
+with colR:
+    st.markdown("#### Previsualización del registro")
+    last = st.session_state.get("last_record")
+    if last:
+        st.json(last, expanded=False)
+        if st.button("📌 Registrar en ledger"):
+            seq = ledger.append(last)
+            st.success(f"Añadido al ledger persistente como asiento nº {seq + 1}.")
+    else:
+        st.info("Genera un registro a la izquierda para previsualizarlo aquí.")
+
+st.markdown("#### Sellado por lotes (árbol de Merkle)")
+st.write(
+    "Los registros pendientes se agrupan en un árbol de Merkle: sólo se sella y firma la **raíz**, "
+    "y cada registro recibe una **prueba de inclusión** verificable con O(log n) hashes."
+)
+pending = st.session_state.pending_batch
+colM1, colM2, colM3 = st.columns(3)
+with colM1:
+    if st.button("➕ Añadir texto al lote pendiente", key="s2_batch_add"):
+        pending.append({"texto": s2_text, "hash": sha256_hex(s2_text)})
+with colM2:
+    if st.button("➕ Añadir 1.000 registros de prueba", key="s2_batch_demo"):
+        base = len(pending)
+        pending.extend(
+            {"texto": t, "hash": sha256_hex(t)}
+            for t in (f"Registro de prueba {base + i}" for i in range(1000))
+        )
+with colM3:
+    if st.button("🔏 Sellar lote (raíz + timestamp + pseudo-firma)", key="s2_batch_seal", disabled=not pending):
+        tree = MerkleTree([r["hash"] for r in pending])
+        _iso = now_iso()
+        # El número de lote lo asigna el ledger (compartido entre sesiones) bajo su cerrojo
+        lote = ledger.append_batch({
+            "raiz_merkle": tree.root,
+            "timestamp": _iso,
+            "pseudo_firma": pseudo_signature(tree.root, _iso, key="DEMO_SECRET"),
+            "registros": len(tree),
+        })
+        for i, r in enumerate(pending):
+            ledger.append({**r, "timestamp": _iso, "lote": lote, "prueba_merkle": proof_to_str(tree.proof(i))})
+        ledger.sync()
+        pending.clear()
+        st.success(f"Lote {lote} sellado: {len(tree):,} registros, 1 firma.")
+st.caption(f"Registros pendientes en el lote: {len(pending):,}")
+
+lotes = ledger.batches()
+if lotes:
+    st.dataframe(pd.DataFrame(lotes), width="stretch")
+if len(ledger):
+    pos_proof = st.number_input("Verificar la prueba del asiento nº", 1, len(ledger), len(ledger), key="s2_proof_pos")
+    rec = ledger[int(pos_proof) - 1]
+    if "prueba_merkle" not in rec:
+        st.info("Ese asiento se selló individualmente (sin prueba de Merkle).")
+    elif rec.get("raiz_merkle"):
+        ok_incl = verify_proof(rec["hash"], proof_from_str(rec["prueba_merkle"]), rec["raiz_merkle"])
+        ok_firma = get_signer("DEMO_SECRET").verify(rec["raiz_merkle"], rec["timestamp"], rec["pseudo_firma"])
+        if ok_incl and ok_firma:
+            st.success(f"Token de la TSA local válido (lote {rec['lote']} del servicio).")
+        else:
+            st.error("La prueba de inclusión o la firma de la TSA no cuadran.")
+    elif (lote_rec := next((b for b in lotes if b.get("lote") == rec["lote"]), None)) is None:
+        st.error(f"El lote {rec['lote']} no figura en `lotes.jsonl`.")
+    else:
+        prueba = proof_from_str(rec["prueba_merkle"])
+        ok_incl = verify_proof(rec["hash"], prueba, lote_rec["raiz_merkle"])
+        ok_firma = get_signer("DEMO_SECRET").verify(lote_rec["raiz_merkle"], lote_rec["timestamp"], lote_rec["pseudo_firma"])
+        if ok_incl and ok_firma:
+            st.success(f"Incluido en el lote {rec['lote']} ({len(prueba)} hashes) y raíz firmada correctamente.")
+        else:
+            st.error("La prueba de inclusión o la firma de la raíz no cuadran.")
+
+st.markdown("#### Mini-ledger (persistente, en `./ledger`)")
+if len(ledger):
+    # La vista sólo ingiere los asientos nuevos; las páginas antiguas se leen del disco bajo demanda
+    with metrics.span("ledger_sync"):
+        ledger_view.sync()
+    por_pagina = 50
+    n_paginas = ledger_view.n_pages(por_pagina)
+    pagina = st.number_input(f"Página (de {n_paginas:,})", 1, n_paginas, n_paginas, key="s2_ledger_page")
+    with metrics.span("ledger_df"):
+        ledger_df = pd.DataFrame(ledger_view.page(int(pagina), por_pagina))
+    st.dataframe(ledger_df, width="stretch", height=240)
+    st.caption(f"{len(ledger):,} asientos · hash de cabeza `{ledger.head[:16]}…`")
+    # Descarga diferida: el CSV se genera por bloques sólo al pulsar
+    st.download_button(
+        "⬇️ Exportar ledger CSV", data=ledger_view.export_csv,
+        file_name="ledger_ud1.csv", mime="text/csv", key="s2_export_csv"
+    )
+    if st.button("✅ Re-verificar todas las pseudo-firmas", key="s2_verify_all"):
+        # Registros firmados uno a uno: HMAC(hash|timestamp); los de lote se validan por su raíz
+        oks = get_signer("DEMO_SECRET").verify_many(
+            (r["hash"], r["timestamp"], r["pseudo_firma"]) for r in ledger if "prueba_merkle" not in r
+        )
+        malas = len(oks) - sum(oks)
+        if malas:
+            st.error(f"{malas} de {len(oks)} firmas individuales no cuadran.")
+        else:
+            st.success(f"{len(oks)} firmas individuales verificadas.")
+    checkpoints = ledger.checkpoints
+    with st.expander(f"🔏 Checkpoints firmados ({len(checkpoints)})"):
+        if checkpoints:
+            st.dataframe(pd.DataFrame([cp.__dict__ for cp in checkpoints[-20:]]), width="stretch")
+        # Recalcula tramos del ledger (lee los asientos): sólo a petición, no en cada rerun
+        if st.button("🔏 Localizar manipulaciones con los checkpoints", key="s2_locate_tamper", disabled=not checkpoints):
+            with metrics.span("ledger_checkpoints"):
+                rep = locate_tamper(ledger, checkpoints)
+            if rep.intact:
+                st.success(f"La cadena se recalcula hasta el último checkpoint firmado (asiento {rep.unchecked_from:,}; "
+                           f"{rep.probes} comprobaciones, ≤ {rep.hashed:,} hashes).")
+            else:
+                st.error(f"Asiento o hash de cadena alterado entre los asientos {rep.start + 1} y {rep.end + 1}.")
+            if rep.unchecked_from < len(ledger):
+                st.caption(f"Los asientos desde el {rep.unchecked_from + 1:,} aún no tienen checkpoint: "
+                           "sólo los cubre la auditoría completa.")
+        if st.button("🔎 Recalcular la cadena completa", key="s2_verify_chain"):
+            with st.spinner("Recalculando hash_cadena de todos los asientos…"):
+                roto = ledger.verify_chain()
+            if roto is None:
+                st.success(f"Cadena íntegra: los {len(ledger):,} asientos se recalculan sin diferencias.")
+            else:
+                st.error(f"La cadena se rompe en el asiento {roto + 1}: su contenido no corresponde a su hash_cadena.")
+else:
+    st.caption("Aún no hay entradas registradas.")
+
+st.markdown("#### Auditar un ledger CSV exportado")
+csv_up = st.file_uploader("Sube un `ledger_ud1.csv` para recalcular hashes, timestamps y pseudo-firmas", type="csv", key="s2_audit_csv")
+st.caption("Los registros de ficheros sellados no llevan su contenido: aquí cuentan como «no verificables». "
+           "Para recalcularlos: `python -m ud1.ledger_verify ledger_ud1.csv --ficheros <carpeta>`.")
+if csv_up is not None and st.button("🔍 Verificar ledger", key="s2_audit_btn"):
+    barra = st.progress(0.0, text="Verificando...")
+    total = max(csv_up.size, 1)
+    texto_csv = io.TextIOWrapper(csv_up, encoding="utf-8", newline="")
+    try:
+        rep = verify_csv(
+            texto_csv,
+            on_progress=lambda n, seg: barra.progress(min(csv_up.tell() / total, 1.0), text=f"{n:,} filas · {seg:.1f} s"),
+        )
+    except ValueError as e:
+        st.error(str(e))
+    else:
+        barra.progress(1.0, text=f"{rep.filas:,} filas en {rep.segundos:.2f} s ({rep.filas_por_s:,.0f} filas/s)")
+        if rep.errores:
+            st.error(f"{rep.errores:,} fila(s) con incidencias de {rep.filas:,}.")
+            st.dataframe(pd.DataFrame(rep.incidencias), width="stretch")
+        else:
+            st.success(f"Las {rep.filas:,} filas verifican correctamente.")
+    finally:
+        texto_csv.detach()  # no cerrar el fichero subido al liberar el wrapper
+
+st.markdown("#### Cuadro comparativo: confianza humana vs algorítmica")
+st.dataframe(load_modelos_confianza(), width="stretch")
@@ -0,0 +1,27 @@
+"""1) Teoría: confianza institucional vs verificación criptográfica."""
+import streamlit as st
+
+from ud1.core import sha256_hex
+
+st.subheader("Confianza: del Derecho a la verificación criptográfica")
+st.markdown(
+    """
+**Fe pública (Derecho):** garantía institucional de veracidad y autenticidad.  
+**Registro:** sistema formal de asientos con reglas de identificación, publicidad, prioridad y oponibilidad.  
+**Validación:** procedimientos que confirman requisitos de forma/fondo.  
+**Trazabilidad:** reconstrucción íntegra y cronológica del historial.
+
+**En blockchain (tecnología):**
+- **Hash (SHA-256)**: huella digital; mínimo cambio → hash totalmente distinto.
+- **Cadena de bloques**: cada bloque referencia el hash del anterior.
+- **Sellado de tiempo**: fija el momento (timestamp) de un estado.
+- **Consenso**: reglas algorítmicas para acordar la versión válida sin un tercero único.
+- **Trazabilidad**: historial replicado e (probablemente) inmutable.
+
+> **Idea clave:** el **Derecho** asegura confianza por **autoridad y procedimiento**; la **blockchain**, por **matemática distribuida**.
+"""
+)
+st.markdown("### Mini-demo: calcula el hash de un texto")
+demo_text = st.text_area("Texto", "Acta: Nacimiento de Juan Pérez, 15/03/1995, Madrid.", height=90)
+st.code(sha256_hex(demo_text), language="bash")
+st.info("Si cambias una sola letra, el hash cambia por completo (efecto avalancha).")